@@ -0,0 +1,217 @@
+"""
+Benchmark headless do dashboard: cold start, rerun quente e pico de memória.
+
+Roda o script pelo `AppTest` do Streamlit sobre os dados de `dados/` (escala 1)
+e sobre dados sintéticos de `saneamento.sintetico`, com os mesmos esquemas,
+multiplicados pelas escalas pedidas (a saúde entra como AIHs brutas).
+
+Além dos totais, guarda o tempo de cada seção registrada pelo `Medidor` do
+dashboard (carga dos dados, derivação do DADOS_DF, cada seção da página) e o
+tempo inclusivo de cada função cacheada (ex.: cada `construir_fig_*`), lidos do
+log JSON Lines (`SANEAMENTO_LOG_DESEMPENHO`). Exemplo:
+
+    python benchmarks/bench_rerun.py --escalas 1 10 1000 100000 --saida bench.json
+    python benchmarks/bench_rerun.py --comparar bench.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from saneamento.sintetico import gerar_dados, linhas_por_escala  # noqa: E402
+
+SCRIPT = os.path.join(RAIZ, 'dashboard-saneamento.py')
+DADOS_ORIGINAIS = os.path.join(RAIZ, 'dados')
+
+ESCALAS_PADRAO = [1, 10, 1000, 100000]
+
+# Aumento relativo acima do qual uma métrica é considerada regressão
+TOLERANCIA_REGRESSAO = 0.20
+
+# Folga absoluta (ms) para seções e funções: nas de poucos ms, o ruído passa da tolerância relativa
+FOLGA_DETALHE_MS = 10.0
+
+# Seções mostradas no resumo de cada escala
+SECOES_EXIBIDAS = 5
+
+
+def _limpar_caches():
+    import streamlit as st
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def _executar(app, memoria=False):
+    """Executa um run do app e retorna segundos ou, com `memoria=True`, o pico alocado em MB"""
+    if memoria:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    app.run()
+    segundos = time.perf_counter() - inicio
+    if memoria:
+        pico = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    if app.exception:
+        raise RuntimeError(f'O dashboard falhou: {app.exception[0].message}')
+    return pico if memoria else segundos
+
+
+def _registro_rerun(log, inicio):
+    """Tempo (ms) por seção e por função cacheada do rerun gravado no log a partir do byte `inicio`"""
+    with open(log, encoding='utf-8') as arquivo:
+        arquivo.seek(inicio)
+        linhas = [linha for linha in arquivo.read().splitlines() if linha.strip()]
+    if not linhas:
+        return {}, {}
+    # Um run completo grava uma linha (as seções dos fragmentos são marcos do mesmo Medidor)
+    registro = json.loads(linhas[-1])
+    secoes, funcoes = {}, {}
+    for secao in registro['secoes']:
+        secoes[secao['secao']] = secao['tempo_ms']
+        for chamada in secao['cache']:
+            funcoes[chamada['funcao']] = round(funcoes.get(chamada['funcao'], 0) + chamada['tempo_ms'], 3)
+    return secoes, funcoes
+
+
+def _executar_detalhado(app):
+    """Executa um run e retorna os segundos, o tempo por seção e o tempo por função cacheada"""
+    from saneamento import desempenho
+
+    log = desempenho.ARQUIVO_LOG
+    inicio = os.path.getsize(log) if log and os.path.exists(log) else 0
+    segundos = _executar(app)
+    secoes, funcoes = _registro_rerun(log, inicio) if log and os.path.exists(log) else ({}, {})
+    return segundos, secoes, funcoes
+
+
+def _mediana(registros):
+    """Mediana, chave a chave, de vários dicionários de tempos"""
+    chaves = dict.fromkeys(chave for registro in registros for chave in registro)
+    return {chave: float(np.median([registro.get(chave, 0.0) for registro in registros])) for chave in chaves}
+
+
+def _app_frio(snapshot):
+    """AppTest novo, sem caches do Streamlit e, opcionalmente, sem snapshots em disco"""
+    from streamlit.testing.v1 import AppTest
+
+    if not snapshot:
+        shutil.rmtree(os.path.join(os.environ['SANEAMENTO_DADOS'], '.snapshots'), ignore_errors=True)
+    _limpar_caches()
+    return AppTest.from_file(SCRIPT, default_timeout=600)
+
+
+def medir(pasta_dados, reruns=5):
+    """
+    Mede cold start sem snapshot, cold start com snapshot, reruns quentes e picos de memória.
+
+    Os tempos são medidos sem tracemalloc (que distorce o relógio); a memória é
+    medida em execuções separadas. Importações de bibliotecas ficam fora da medida.
+    `secoes_ms` e `funcoes_ms` trazem, para cada medida de tempo, o detalhamento
+    do `Medidor` (vazios se o log de desempenho não estiver configurado).
+    """
+    os.environ['SANEAMENTO_DADOS'] = pasta_dados
+
+    resultado = {}
+    secoes, funcoes = {}, {}
+    resultado['frio_sem_snapshot_s'], secoes['frio_sem_snapshot'], funcoes['frio_sem_snapshot'] = \
+        _executar_detalhado(_app_frio(snapshot=False))
+    resultado['frio_com_snapshot_s'], secoes['frio_com_snapshot'], funcoes['frio_com_snapshot'] = \
+        _executar_detalhado(_app_frio(snapshot=True))
+    resultado['pico_frio_mb'] = _executar(_app_frio(snapshot=True), memoria=True)
+
+    app = _app_frio(snapshot=True)
+    _executar(app)
+    quentes = [_executar_detalhado(app) for _ in range(reruns)]
+    resultado['rerun_quente_s'] = float(np.median([segundos for segundos, _, _ in quentes]))
+    secoes['rerun_quente'] = _mediana([secoes_rerun for _, secoes_rerun, _ in quentes])
+    funcoes['rerun_quente'] = _mediana([funcoes_rerun for _, _, funcoes_rerun in quentes])
+    resultado['pico_quente_mb'] = _executar(app, memoria=True)
+    resultado['secoes_ms'] = secoes
+    resultado['funcoes_ms'] = funcoes
+    return resultado
+
+
+def _achatar(metricas, prefixo=''):
+    """Pares (nome, valor) das métricas, com os detalhes aninhados como 'secoes_ms / frio_sem_snapshot / Saúde'"""
+    for nome, valor in metricas.items():
+        if isinstance(valor, dict):
+            yield from _achatar(valor, f'{prefixo}{nome} / ')
+        else:
+            yield f'{prefixo}{nome}', valor
+
+
+def comparar(atual, anterior):
+    """Lista as métricas que pioraram mais que a tolerância em relação a uma execução anterior"""
+    regressoes = []
+    for escala, metricas in atual.items():
+        bases = dict(_achatar(anterior.get(escala, {})))
+        for nome, valor in _achatar(metricas):
+            base = bases.get(nome)
+            folga = FOLGA_DETALHE_MS if ' / ' in nome else 0
+            if base and valor > max(base * (1 + TOLERANCIA_REGRESSAO), base + folga):
+                regressoes.append(f'escala {escala} / {nome}: {base:.3f} -> {valor:.3f}')
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--escalas', type=int, nargs='+', default=ESCALAS_PADRAO)
+    parser.add_argument('--reruns', type=int, default=5)
+    parser.add_argument('--saida', help='grava os resultados em JSON')
+    parser.add_argument('--comparar', help='JSON de uma execução anterior para detectar regressões')
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    # O Medidor lê o caminho do log ao ser importado: definido antes do primeiro run do dashboard
+    pasta_log = tempfile.mkdtemp(prefix='bench_saneamento_log_')
+    os.environ['SANEAMENTO_LOG_DESEMPENHO'] = os.path.join(pasta_log, 'desempenho.jsonl')
+    # Pré-importa as bibliotecas para que o cold start meça só o dashboard
+    import plotly.graph_objects  # noqa: F401
+    import streamlit.testing.v1  # noqa: F401
+
+    resultados = {}
+    for escala in args.escalas:
+        with tempfile.TemporaryDirectory(prefix=f'bench_saneamento_{escala}_') as pasta:
+            if escala == 1:
+                shutil.copytree(DADOS_ORIGINAIS, pasta, dirs_exist_ok=True,
+                                ignore=shutil.ignore_patterns('.snapshots'))
+            else:
+                gerar_dados(pasta, linhas_por_escala(escala))
+            resultados[str(escala)] = medir(pasta, args.reruns)
+
+        linha = resultados[str(escala)]
+        print(f"escala {escala:>7}: frio {linha['frio_sem_snapshot_s']:.3f}s | "
+              f"frio c/ snapshot {linha['frio_com_snapshot_s']:.3f}s | "
+              f"rerun {linha['rerun_quente_s']:.3f}s | pico {linha['pico_frio_mb']:.1f} MB")
+        for medida in ('frio_sem_snapshot', 'rerun_quente'):
+            maiores = sorted(linha['secoes_ms'][medida].items(), key=lambda item: item[1], reverse=True)
+            texto = ', '.join(f'{secao} {ms:.1f}ms' for secao, ms in maiores[:SECOES_EXIBIDAS])
+            print(f"{'':>16}seções ({medida.replace('_', ' ')}): {texto}")
+    shutil.rmtree(pasta_log, ignore_errors=True)
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultados, arquivo, indent=2)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            regressoes = comparar(resultados, json.load(arquivo))
+        for regressao in regressoes:
+            print(f'REGRESSÃO: {regressao}')
+        return 1 if regressoes else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,9 +1,28 @@
 import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
 import pandas as pd
 import numpy as np
+import contextlib
+import functools
+import hashlib
+import operator
 import os
+import re
+
+from saneamento.consulta import MotorConsulta
+from saneamento.desempenho import Medidor, cache_medido, fragmento_medido, tabela_secoes
+from saneamento.esquema import VERSAO_ESQUEMA, validar as validar_esquema
+from saneamento.formatacao import SEPARADORES_PLOTLY, decimal, inteiro, moeda, percentual
+from saneamento.indicadores import GrafoDerivados, RegistroIndicadores
+from saneamento.memoria import compactar, relatorio_memoria
+from saneamento.radar import METODOS, faixa_radial, normalizar
+from saneamento.recarga import MonitorRecarga
+from saneamento.series import reduzir_serie, usar_webgl
+from saneamento.snapshot import carregar_com_snapshot, hash_arquivo, preparar_snapshot
+
+# Módulos só usados com um arquivo bruto, uma fonte opcional ou no cache frio de uma seção
+# (sih, pnad, preagregar, enem, geo, montecarlo) são importados onde são usados; o perfil
+# das importações de inicialização e das adiadas está em saneamento/inicializacao.py
 
 # ============================================
 # CONFIGURAÇÃO DA PÁGINA
@@ -15,69 +34,310 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# Instrumentação de desempenho; o painel fica oculto e abre com ?debug=desempenho. As
+# alocações só são medidas com SANEAMENTO_MEDIR_ALOCACOES=1 no servidor (tracemalloc é global)
+MODO_DEBUG = st.query_params.get('debug') == 'desempenho'
+MEDIDOR = Medidor(alocacoes=MODO_DEBUG)
+
+# Modo lazy: abas inativas e seções abaixo da dobra só são construídas quando abertas
+# (ativado com SANEAMENTO_LAZY=1 ou ?lazy=1; ?lazy=0 desativa)
+MODO_LAZY = st.query_params.get('lazy', os.environ.get('SANEAMENTO_LAZY', '0')) == '1'
+
 # ============================================
 # IMPORTAÇÃO DOS DADOS DOS ARQUIVOS CSV
 # ============================================
 
-# Caminho base dos dados
-DADOS_PATH = os.path.join(os.path.dirname(__file__), 'dados')
+# Caminho base dos dados (SANEAMENTO_DADOS permite apontar para outra pasta, ex.: benchmarks)
+DADOS_PATH = os.environ.get('SANEAMENTO_DADOS', os.path.join(os.path.dirname(__file__), 'dados'))
 
-# Carregando os bancos de dados
-@st.cache_data
-def carregar_dados():
-    """Carrega todos os dados dos arquivos CSV"""
-    
-    # Dados de Saúde - DATASUS 2023
-    df_saude = pd.read_csv(os.path.join(DADOS_PATH, 'saude_datasus_2023.csv'))
-    
-    # Dados de Renda - IBGE 2023
-    df_renda = pd.read_csv(os.path.join(DADOS_PATH, 'renda_ibge_2023.csv'))
-    
-    # Dados de Educação - IBGE/INEP 2023
-    df_educacao = pd.read_csv(os.path.join(DADOS_PATH, 'educacao_ibge_inep_2023.csv'))
-    
-    # Dados de Cobertura - SINISA 2023
-    df_cobertura = pd.read_csv(os.path.join(DADOS_PATH, 'cobertura_sinisa_2023.csv'))
-    
-    return df_saude, df_renda, df_educacao, df_cobertura
+# Arquivos de cada fonte, particionados por ano
+FONTES = {
+    'saude': 'saude_datasus_{ano}.csv',         # DATASUS
+    'renda': 'renda_ibge_{ano}.csv',            # IBGE
+    'educacao': 'educacao_ibge_inep_{ano}.csv', # IBGE/INEP
+    'cobertura': 'cobertura_sinisa_{ano}.csv',  # SINISA
+}
+
+# Fontes opcionais: indicadores por Região Administrativa (RA) e curvas de escolaridade por idade
+FONTES_OPCIONAIS = {
+    'regioes': 'regioes_ra_{ano}.csv',
+    'escolaridade_idade': 'escolaridade_idade_pnad_{ano}.csv',  # python -m saneamento.preagregar --pnad
+    'notas_enem': 'notas_enem_inep_{ano}.csv',                  # python -m saneamento.preagregar --enem
+}
+
+# Microdados brutos de internações (SIH/SUS - RD), opcionais
+SIH_BRUTO = 'sih_aih_{ano}.csv'
+
+# Microdados brutos da PNAD Contínua (visita anual, em CSV), opcionais; os nacionais são filtrados pela UF
+PNAD_BRUTO = 'pnad_{ano}.csv'
+UF_PAINEL = 'DF'
+
+# Microdados brutos do ENEM (INEP), opcionais; agregados em paralelo por trechos do arquivo
+ENEM_BRUTO = 'MICRODADOS_ENEM_{ano}.csv'
+
+# Limites das RAs (GeoJSON com a propriedade 'ra'), pré-simplificados por `python -m saneamento.geo`
+GEOJSON_RAS_PATH = os.path.join(DADOS_PATH, 'geo', 'regioes_administrativas.geojson')
+
+def caminho_fonte(fonte, ano):
+    """Caminho da partição de uma fonte para um ano"""
+    return os.path.join(DADOS_PATH, (FONTES | FONTES_OPCIONAIS)[fonte].format(ano=ano))
+
+def anos_disponiveis():
+    """Anos com todas as fontes presentes na pasta de dados, em ordem crescente"""
+    padrao = re.compile(FONTES['saude'].replace('{ano}', r'(\d{4})').replace('.', r'\.') + '$')
+    anos = sorted(int(m.group(1)) for m in map(padrao.match, os.listdir(DADOS_PATH)) if m)
+    return [ano for ano in anos if all(os.path.exists(caminho_fonte(f, ano)) for f in FONTES)]
+
+def arquivo_fonte(fonte, ano):
+    """
+    Arquivo lido para a partição (fonte, ano) e as opções do leitor.
+
+    Os módulos de agregação dos arquivos brutos só são importados quando o arquivo
+    existe; a versão da agregação de cada um entra na variante do snapshot.
+    """
+    # Se houver o arquivo bruto de AIHs do SIH/SUS, agrega a saúde por mês a partir dele
+    sih_bruto = os.path.join(DADOS_PATH, SIH_BRUTO.format(ano=ano))
+    if fonte == 'saude' and os.path.exists(sih_bruto):
+        from saneamento.sih import VERSAO_AGREGACAO, agregar_sih
+        return sih_bruto, dict(leitor=agregar_sih, variante=f'sih-v{VERSAO_AGREGACAO}')
+    # Idem para as curvas de escolaridade, lidas em blocos dos microdados da PNAD
+    pnad_bruto = os.path.join(DADOS_PATH, PNAD_BRUTO.format(ano=ano))
+    if fonte == 'escolaridade_idade' and os.path.exists(pnad_bruto):
+        from saneamento.pnad import VERSAO_AGREGACAO, agregar_escolaridade_idade
+        leitor = functools.partial(agregar_escolaridade_idade, uf=UF_PAINEL)
+        return pnad_bruto, dict(leitor=leitor, variante=f'idades-{UF_PAINEL}-v{VERSAO_AGREGACAO}')
+    enem_bruto = os.path.join(DADOS_PATH, ENEM_BRUTO.format(ano=ano))
+    if fonte == 'notas_enem' and os.path.exists(enem_bruto):
+        from saneamento.enem import VERSAO_AGREGACAO
+        from saneamento.preagregar import agregar_notas_enem
+        leitor = functools.partial(agregar_notas_enem, uf=UF_PAINEL)
+        return enem_bruto, dict(leitor=leitor, variante=f'notas-{UF_PAINEL}-v{VERSAO_AGREGACAO}')
+    return caminho_fonte(fonte, ano), {}
+
+def opcoes_snapshot(fonte, ano):
+    """Arquivo da partição (fonte, ano) e as opções do snapshot, com a validação pelo esquema"""
+    caminho, opcoes = arquivo_fonte(fonte, ano)
+    # O esquema da fonte é verificado uma vez por snapshot (a versão do esquema entra na chave)
+    validar = functools.partial(validar_esquema, fonte=fonte, origem=os.path.basename(caminho))
+    return caminho, dict(validar=validar, versao_validacao=VERSAO_ESQUEMA, **opcoes)
+
+def ler_fonte(fonte, ano):
+    """Lê a partição (fonte, ano) via snapshot colunar quando disponível"""
+    caminho, opcoes = opcoes_snapshot(fonte, ano)
+    return carregar_com_snapshot(caminho, **opcoes)
+
+def preparar_fonte(fonte, ano):
+    """Gera (ou reaproveita) o snapshot validado do conteúdo atual da partição; é o que o monitor publica"""
+    caminho, opcoes = opcoes_snapshot(fonte, ano)
+    return preparar_snapshot(caminho, **opcoes)
+
+def ler_versao(fonte, ano, versao):
+    """Lê a versão publicada: o snapshot que o monitor validou, não o arquivo em disco (que pode ter mudado)"""
+    _, snapshot = versao
+    if snapshot is not None and os.path.exists(snapshot):
+        return pd.read_parquet(snapshot)
+    # Sem snapshot (sem pyarrow ou pasta somente leitura): só resta o arquivo atual
+    return ler_fonte(fonte, ano)
+
+@st.cache_resource
+def obter_monitor():
+    """Monitor dos arquivos de dados, compartilhado entre as sessões"""
+    return MonitorRecarga()
+
+def versao_fonte(fonte, ano):
+    """
+    Versão publicada da partição (fonte, ano).
+
+    Quando o arquivo muda, o monitor prepara o novo snapshot em segundo plano e só
+    então publica a nova versão; até lá todas as sessões seguem com a anterior.
+    A versão é `(assinatura, snapshot)`: uma carga fria lê o snapshot publicado.
+    """
+    caminho, _ = arquivo_fonte(fonte, ano)
+    return obter_monitor().versao((fonte, ano), caminho, functools.partial(preparar_fonte, fonte, ano))
+
+# Colunas de texto livre (ex.: 'descricao') exibidas por alguma visão, por fonte;
+# as demais são descartadas na carga pela compactação de tipos
+TEXTO_LIVRE_EXIBIDO = {}
+
+ANOS = anos_disponiveis()
+
+# Cabem todas as partições de todos os anos, duas versões de cada (a publicada e a que o
+# monitor acabou de trocar): navegar entre anos não relê Parquet
+ENTRADAS_PARTICOES = 2 * (len(FONTES) + len(FONTES_OPCIONAIS)) * max(1, len(ANOS))
+
+# Idem para o que é montado sobre as versões de um ano (figuras, estatísticas, simulações):
+# as entradas de versões trocadas pelo monitor saem do cache em vez de ficar para sempre
+ENTRADAS_VERSOES = 2 * max(1, len(ANOS))
+
+# Carregando os bancos de dados (versões antigas saem do cache conforme novas chegam).
+# O DataFrame compacto é compartilhado entre as sessões, sem cópia por acesso: é somente
+# leitura (quem precisar alterar trabalha numa cópia; o copy-on-write do pandas protege as derivações)
+@cache_medido(st.cache_resource, max_entries=ENTRADAS_PARTICOES)
+def carregar_particao(fonte, ano, versao):
+    """Carrega uma versão publicada da partição (fonte, ano) com tipos compactos"""
+    return compactar(ler_versao(fonte, ano, versao), manter=TEXTO_LIVRE_EXIBIDO.get(fonte, ()))
+
+def carregar_fonte(fonte, ano):
+    """Carrega a versão publicada da partição (fonte, ano)"""
+    return carregar_particao(fonte, ano, versao_fonte(fonte, ano))
+
+def carregar_dados(ano):
+    """Carrega todos os dados de um ano; só as partições desse ano são lidas"""
+    return tuple(carregar_fonte(fonte, ano) for fonte in FONTES)
+
+# Ano exibido: escolhido no seletor do cabeçalho (chave 'ano'), padrão o mais recente
+ANO = st.session_state.get('ano', ANOS[-1])
+if ANO not in ANOS:
+    ANO = ANOS[-1]
+ANO_ANTERIOR = ANO - 1 if ANO - 1 in ANOS else None
 
 # Carregar dados
-df_saude, df_renda, df_educacao, df_cobertura = carregar_dados()
+MEDIDOR.marco('Carga de dados')
+df_saude, df_renda, df_educacao, df_cobertura = carregar_dados(ANO)
 
 # ============================================
 # PROCESSAMENTO DOS DADOS IMPORTADOS
 # ============================================
 
-# Extraindo valores dos DataFrames para o dicionário DADOS_DF
-DADOS_DF = {
-    # Saúde (DATASUS 2023) - agregados do CSV
-    'internacoes_total': df_saude['internacoes'].sum(),
-    'custo_internacoes': df_saude['custo_total'].sum(),
-    'obitos': df_saude['obitos'].sum(),
-    'populacao': df_cobertura[df_cobertura['indicador'] == 'populacao_total']['valor'].values[0],
+# Campos lidos diretamente das tabelas de indicadores: (fonte, chave, coluna)
+CAMPOS_DADOS_DF = {
+    'populacao': ('cobertura', 'populacao_total', 'valor'),
     
-    # Renda (IBGE 2023) - do CSV
-    'renda_com_saneamento': df_renda[df_renda['categoria'] == 'com_saneamento']['renda_media_mensal'].values[0],
-    'renda_sem_saneamento': df_renda[df_renda['categoria'] == 'sem_saneamento']['renda_media_mensal'].values[0],
+    # Renda (IBGE) - do CSV
+    'renda_com_saneamento': ('renda', 'com_saneamento', 'renda_media_mensal'),
+    'renda_sem_saneamento': ('renda', 'sem_saneamento', 'renda_media_mensal'),
     
-    # Educação (IBGE/INEP 2023) - do CSV
-    'escolaridade_com': df_educacao[df_educacao['indicador'] == 'escolaridade']['com_saneamento'].values[0],
-    'escolaridade_sem': df_educacao[df_educacao['indicador'] == 'escolaridade']['sem_saneamento'].values[0],
-    'enem_com_banheiro': df_educacao[df_educacao['indicador'] == 'nota_enem']['com_saneamento'].values[0],
-    'enem_sem_banheiro': df_educacao[df_educacao['indicador'] == 'nota_enem']['sem_saneamento'].values[0],
+    # Educação (IBGE/INEP) - do CSV
+    'escolaridade_com': ('educacao', 'escolaridade', 'com_saneamento'),
+    'escolaridade_sem': ('educacao', 'escolaridade', 'sem_saneamento'),
+    'enem_com_banheiro': ('educacao', 'nota_enem', 'com_saneamento'),
+    'enem_sem_banheiro': ('educacao', 'nota_enem', 'sem_saneamento'),
     
-    # Cobertura (SINISA 2023) - do CSV
-    'pop_sem_agua': df_cobertura[df_cobertura['indicador'] == 'sem_agua_tratada']['valor'].values[0],
-    'pop_sem_esgoto': df_cobertura[df_cobertura['indicador'] == 'sem_coleta_esgoto']['valor'].values[0],
-    'perc_sem_agua': df_cobertura[df_cobertura['indicador'] == 'sem_agua_tratada']['percentual'].values[0],
-    'perc_sem_esgoto': df_cobertura[df_cobertura['indicador'] == 'sem_coleta_esgoto']['percentual'].values[0],
+    # Cobertura (SINISA) - do CSV
+    'pop_sem_agua': ('cobertura', 'sem_agua_tratada', 'valor'),
+    'pop_sem_esgoto': ('cobertura', 'sem_coleta_esgoto', 'valor'),
+    'perc_sem_agua': ('cobertura', 'sem_agua_tratada', 'percentual'),
+    'perc_sem_esgoto': ('cobertura', 'sem_coleta_esgoto', 'percentual'),
+}
+
+# Saúde (DATASUS) - agregados do CSV no motor de consulta: (fonte, coluna somada)
+TOTAIS_DADOS_DF = {
+    'internacoes_total': ('saude', 'internacoes'),
+    'custo_internacoes': ('saude', 'custo_total'),
+    'obitos': ('saude', 'obitos'),
+}
+
+# Cálculos derivados: (função, dependências...)
+CAMPOS_DERIVADOS = {
+    'custo_medio_internacao': (operator.truediv, 'custo_internacoes', 'internacoes_total'),
+    'diferenca_renda': (operator.sub, 'renda_com_saneamento', 'renda_sem_saneamento'),
+    'diferenca_escolaridade': (operator.sub, 'escolaridade_com', 'escolaridade_sem'),
+    'diferenca_enem': (operator.sub, 'enem_com_banheiro', 'enem_sem_banheiro'),
+}
+
+# Coluna de chave de cada fonte (None: série sem chave, usada só em agregações)
+CHAVES_FONTES = {
+    'saude': None,
+    'renda': 'categoria',
+    'educacao': 'indicador',
+    'cobertura': 'indicador',
 }
 
-# Cálculos derivados
-DADOS_DF['custo_medio_internacao'] = DADOS_DF['custo_internacoes'] / DADOS_DF['internacoes_total']
-DADOS_DF['diferenca_renda'] = DADOS_DF['renda_com_saneamento'] - DADOS_DF['renda_sem_saneamento']
-DADOS_DF['diferenca_escolaridade'] = DADOS_DF['escolaridade_com'] - DADOS_DF['escolaridade_sem']
-DADOS_DF['diferenca_enem'] = DADOS_DF['enem_com_banheiro'] - DADOS_DF['enem_sem_banheiro']
+@cache_medido(st.cache_resource, max_entries=ENTRADAS_PARTICOES)
+def obter_registro_fonte(fonte, ano, versao):
+    """Monta o índice de indicadores (chave -> linha) de uma fonte, uma vez por versão dela"""
+    return RegistroIndicadores({fonte: (carregar_particao(fonte, ano, versao), CHAVES_FONTES[fonte])})
+
+def obter_registro(ano):
+    """Registro com as fontes com chave do ano; só a fonte com versão nova é reindexada"""
+    return RegistroIndicadores.unir(obter_registro_fonte(fonte, ano, versao_fonte(fonte, ano))
+                                    for fonte in FONTES if CHAVES_FONTES[fonte] is not None)
+
+# Totais e agregações filtradas feitos no motor de consulta embutido (DuckDB ou SQLite, no próprio processo);
+# só o resultado agregado sai do motor, não a partição inteira
+@cache_medido(st.cache_resource, max_entries=ENTRADAS_PARTICOES, on_release=MotorConsulta.fechar)
+def obter_motor_fonte(fonte, ano, versao):
+    """Motor de consulta com a partição (fonte, ano) registrada, uma vez por versão dela"""
+    motor = MotorConsulta()
+    chave = CHAVES_FONTES.get(fonte)
+    motor.registrar(fonte, carregar_particao(fonte, ano, versao), indices=[chave] if chave else [])
+    return motor
+
+@cache_medido(st.cache_data, max_entries=256)
+def agregar_particao(fonte, ano, versao, medidas, por, filtros):
+    """Resultado de uma agregação sobre uma versão da partição; a versão só compõe a chave do cache"""
+    return obter_motor_fonte(fonte, ano, versao).agregar(fonte, medidas, por, filtros)
+
+def agregar_fonte(fonte, ano, medidas, por=(), filtros=None):
+    """
+    Agregação filtrada da versão publicada de (fonte, ano), ex.:
+    `agregar_fonte('saude', 2023, {'internacoes': ('soma', 'internacoes')}, filtros={'mes': ['Janeiro']})`
+    """
+    return agregar_particao(fonte, ano, versao_fonte(fonte, ano), medidas, tuple(por), filtros)
+
+def totais_fontes(ano, totais):
+    """Campos somados `campo: (fonte, coluna)`, numa única consulta ao motor por fonte"""
+    medidas = {}
+    for campo, (fonte, coluna) in totais.items():
+        medidas.setdefault(fonte, {})[campo] = ('soma', coluna)
+    dados = {}
+    for fonte, medidas_fonte in medidas.items():
+        resultado = agregar_fonte(fonte, ano, medidas_fonte)
+        dados.update({campo: resultado[campo].iloc[0] for campo in medidas_fonte})
+    return dados
+
+@cache_medido(st.cache_resource)
+def obter_grafo_derivados():
+    """Grafo dos campos derivados, compartilhado entre as sessões"""
+    return GrafoDerivados(CAMPOS_DERIVADOS)
+
+# Distribuição das notas do ENEM (microdados ou resumo pré-agregado), opcional; quando existe,
+# as médias por grupo vêm dela em vez da linha 'nota_enem' da educação
+NOTAS_ENEM_DISPONIVEIS = os.path.exists(arquivo_fonte('notas_enem', ANO)[0])
+FONTES_EDUCACAO = ('educacao', 'notas_enem') if NOTAS_ENEM_DISPONIVEIS else ('educacao',)
+
+@cache_medido(st.cache_resource, max_entries=ENTRADAS_VERSOES)
+def obter_estatisticas_enem(ano, versao):
+    """Participantes, média, quantis e histograma das notas por grupo, uma vez por versão da distribuição"""
+    from saneamento.enem import estatisticas_notas
+    return estatisticas_notas(carregar_particao('notas_enem', ano, versao))
+
+# Extraindo valores dos DataFrames para o dicionário DADOS_DF
+MEDIDOR.marco('Derivação DADOS_DF')
+DADOS_DF = obter_registro(ANO).extrair(CAMPOS_DADOS_DF)
+DADOS_DF.update(totais_fontes(ANO, TOTAIS_DADOS_DF))
+ESTATISTICAS_ENEM = obter_estatisticas_enem(ANO, versao_fonte('notas_enem', ANO)) if NOTAS_ENEM_DISPONIVEIS else None
+if ESTATISTICAS_ENEM is not None:
+    # Grupo sem participantes na distribuição: fica a média da tabela de educação
+    for grupo, campo in (('com_saneamento', 'enem_com_banheiro'), ('sem_saneamento', 'enem_sem_banheiro')):
+        if ESTATISTICAS_ENEM[grupo]['participantes']:
+            DADOS_DF[campo] = ESTATISTICAS_ENEM[grupo]['media']
+DADOS_DF.update(obter_grafo_derivados().calcular(DADOS_DF))
+
+@cache_medido(st.cache_resource, max_entries=ENTRADAS_PARTICOES)
+def obter_impressao_versao(fonte, ano, versao):
+    """Impressão digital do conteúdo de uma versão da partição (inclui o ano, que aparece nos títulos)"""
+    df = carregar_particao(fonte, ano, versao)
+    h = hashlib.blake2b(f'{fonte}|{ano}|'.encode(), digest_size=16)
+    h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.hexdigest()
+
+def obter_impressao_fonte(fonte, ano):
+    """Impressão digital da versão publicada de uma partição"""
+    return obter_impressao_versao(fonte, ano, versao_fonte(fonte, ano))
+
+def obter_impressao_dados(ano, fontes=tuple(FONTES)):
+    """Impressão digital combinada de várias fontes de um ano"""
+    partes = [str(ano)] + [obter_impressao_fonte(fonte, ano) for fonte in fontes]
+    return hashlib.blake2b('|'.join(partes).encode(), digest_size=16).hexdigest()
+
+# As funções construir_fig_* recebem como chave a impressão digital só das fontes
+# de que dependem: cada figura é montada uma vez por versão desses dados, é
+# compartilhada entre sessões e reruns, e a troca de um arquivo refaz só as
+# figuras que o usam
+IMPRESSOES = {fonte: obter_impressao_fonte(fonte, ANO) for fonte in FONTES}
+if NOTAS_ENEM_DISPONIVEIS:
+    IMPRESSOES['educacao'] = obter_impressao_dados(ANO, FONTES_EDUCACAO)
 
 # ============================================
 # CORES DO TEMA ESCURO (Estilo Dashboard)
@@ -105,262 +365,21 @@ CORES = {
 # ============================================
 # CSS CUSTOMIZADO - TEMA ÁGUA
 # ============================================
-st.markdown("""
-<style>
-    /* Esconder elementos padrão do Streamlit */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    
-    /* Tema principal - Gradiente água */
-    .stApp {
-        background: linear-gradient(135deg, #caf0f8 0%, #90e0ef 25%, #00b4d8 50%, #0077b6 75%, #023e8a 100%);
-        background-attachment: fixed;
-    }
-    
-    /* Container principal */
-    .main .block-container {
-        padding-top: 2rem;
-        padding-bottom: 2rem;
-        max-width: 1400px;
-    }
-    
-    /* Título principal com gradiente */
-    .titulo-principal {
-        background: linear-gradient(90deg, #023e8a, #0077b6, #00b4d8);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        font-size: 3rem;
-        font-weight: 800;
-        text-align: center;
-        margin-bottom: 0.5rem;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.1);
-    }
-    
-    /* Subtítulo */
-    .subtitulo {
-        color: #023e8a;
-        font-size: 1.3rem;
-        text-align: center;
-        margin-bottom: 2rem;
-        font-weight: 500;
-    }
-    
-    /* Cards de impacto no banner */
-    .banner-impacto {
-        background: linear-gradient(135deg, #023e8a 0%, #0077b6 100%);
-        border-radius: 20px;
-        padding: 2rem;
-        margin: 1.5rem 0;
-        box-shadow: 0 10px 40px rgba(0,0,0,0.3);
-    }
-    
-    .banner-numero {
-        color: #ffd60a;
-        font-size: 2.5rem;
-        font-weight: 800;
-        text-align: center;
-    }
-    
-    .banner-texto {
-        color: #caf0f8;
-        font-size: 1rem;
-        text-align: center;
-    }
-    
-    /* Seções */
-    .secao-titulo {
-        color: #023e8a;
-        font-size: 2rem;
-        font-weight: 700;
-        margin: 2rem 0 1rem 0;
-        padding-bottom: 0.5rem;
-        border-bottom: 3px solid #0077b6;
-    }
-    
-    /* Cards de métricas coloridos */
-    .card-metrica {
-        background: white;
-        border-radius: 15px;
-        padding: 1.5rem;
-        text-align: center;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-        transition: transform 0.3s ease;
-    }
-    
-    .card-metrica:hover {
-        transform: translateY(-5px);
-    }
-    
-    .card-saude {
-        background: linear-gradient(135deg, #ff6b6b 0%, #ee5a24 100%);
-        color: white;
-    }
-    
-    .card-renda {
-        background: linear-gradient(135deg, #f9ca24 0%, #f0932b 100%);
-        color: #1a1a2e;
-    }
-    
-    .card-educacao {
-        background: linear-gradient(135deg, #6c5ce7 0%, #a29bfe 100%);
-        color: white;
-    }
-    
-    .card-numero {
-        font-size: 2rem;
-        font-weight: 800;
-        margin: 0.5rem 0;
-    }
-    
-    .card-label {
-        font-size: 0.9rem;
-        opacity: 0.9;
-    }
-    
-    /* Box informativo - CORRIGIDO para texto legível */
-    .box-info {
-        background: rgba(255, 255, 255, 0.95);
-        border-left: 5px solid #0077b6;
-        border-radius: 10px;
-        padding: 1.5rem;
-        margin: 1rem 0;
-        color: #1a1a2e;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-    }
-    
-    .box-info strong, .box-info b {
-        color: #023e8a;
-    }
-    
-    .box-info ul, .box-info ol {
-        color: #333;
-    }
-    
-    .box-alerta {
-        background: linear-gradient(135deg, #ffe066 0%, #ffd60a 100%);
-        border-left: 5px solid #f0932b;
-        border-radius: 10px;
-        padding: 1.5rem;
-        margin: 1rem 0;
-        color: #1a1a2e;
-    }
-    
-    /* Ciclos */
-    .ciclo-vicioso {
-        background: linear-gradient(135deg, #ff6b6b 0%, #c0392b 100%);
-        border-radius: 15px;
-        padding: 1.5rem;
-        color: white;
-    }
-    
-    .ciclo-virtuoso {
-        background: linear-gradient(135deg, #00b4d8 0%, #0077b6 100%);
-        border-radius: 15px;
-        padding: 1.5rem;
-        color: white;
-    }
-    
-    .ciclo-item {
-        padding: 0.5rem 0;
-        border-bottom: 1px solid rgba(255,255,255,0.2);
-        font-size: 0.95rem;
-    }
-    
-    /* Conclusões - CORRIGIDO para texto legível */
-    .card-conclusao {
-        background: white;
-        border-radius: 15px;
-        padding: 1.5rem;
-        margin: 0.5rem 0;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-        color: #1a1a2e;
-    }
-    
-    .card-conclusao h4 {
-        color: #023e8a;
-        margin-bottom: 0.5rem;
-    }
-    
-    .card-conclusao p {
-        color: #333;
-    }
-    
-    .borda-saude { border-left: 5px solid #ff6b6b; }
-    .borda-renda { border-left: 5px solid #f9ca24; }
-    .borda-educacao { border-left: 5px solid #6c5ce7; }
-    
-    /* Rodapé - CORRIGIDO para texto legível */
-    .rodape {
-        background: white;
-        border-radius: 15px;
-        padding: 2rem;
-        margin-top: 2rem;
-        text-align: center;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-        color: #1a1a2e;
-    }
-    
-    .rodape h4 {
-        color: #023e8a;
-    }
-    
-    .rodape p {
-        color: #333;
-    }
-    
-    .rodape a {
-        color: #0077b6;
-        text-decoration: none;
-        font-weight: bold;
-    }
-    
-    .rodape a:hover {
-        color: #023e8a;
-        text-decoration: underline;
-    }
-    
-    .creditos {
-        background: linear-gradient(135deg, #023e8a 0%, #0077b6 100%);
-        color: white;
-        padding: 1rem;
-        border-radius: 10px;
-        margin-top: 1rem;
-    }
-    
-    /* Métricas do Streamlit */
-    [data-testid="stMetricValue"] {
-        font-size: 1.8rem;
-        color: #023e8a;
-    }
-    
-    /* Tabs customizadas */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 8px;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        background-color: #caf0f8;
-        border-radius: 10px;
-        padding: 10px 20px;
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background-color: #0077b6;
-        color: white;
-    }
-    
-    /* Texto explicativo - CORRIGIDO */
-    .texto-explicativo {
-        background: rgba(255, 255, 255, 0.9);
-        padding: 1rem;
-        border-radius: 10px;
-        color: #333;
-        margin: 1rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
+MEDIDOR.marco('Tema e cabeçalho')
+# O tema fica em static/tema.css, servido pelo Streamlit em app/static/ (ver
+# .streamlit/config.toml); cada rerun envia só o <link>, e a impressão do conteúdo
+# na URL permite ao navegador (ou a um proxy/CDN) manter o arquivo em cache por
+# tempo indeterminado, já que qualquer alteração gera outra URL
+TEMA_CSS_PATH = os.path.join(os.path.dirname(__file__), 'static', 'tema.css')
+
+@cache_medido(st.cache_resource, max_entries=2)
+def obter_url_tema(assinatura):
+    """URL do tema com a impressão do conteúdo (a assinatura do arquivo invalida o cache)"""
+    return f'app/static/tema.css?v={hash_arquivo(TEMA_CSS_PATH)[:12]}'
+
+stat_tema = os.stat(TEMA_CSS_PATH)
+url_tema = obter_url_tema((stat_tema.st_mtime_ns, stat_tema.st_size))
+st.markdown(f'<link rel="stylesheet" href="{url_tema}">', unsafe_allow_html=True)
 
 # ============================================
 # FUNÇÃO PARA CRIAR LAYOUT DE GRÁFICO ESTILO ESCURO
@@ -377,6 +396,8 @@ def get_dark_layout(title="", height=450, showlegend=True):
         paper_bgcolor=CORES['bg_escuro'],
         plot_bgcolor=CORES['bg_escuro'],
         font=dict(color=CORES['texto'], family='Arial'),
+        # Números formatados pelo Plotly (hover, eixos) no padrão pt-BR
+        separators=SEPARADORES_PLOTLY,
         height=height,
         showlegend=showlegend,
         legend=dict(
@@ -408,747 +429,1160 @@ def get_dark_layout(title="", height=450, showlegend=True):
         )
     )
 
+# ============================================
+# CONSTRUÇÃO SOB DEMANDA (MODO LAZY)
+# ============================================
+def conteudo_sob_demanda(rotulo, chave):
+    """
+    Container do conteúdo de uma seção abaixo da dobra.
+
+    No modo lazy é um expander que reroda só o fragmento ao ser aberto, e retorna
+    None enquanto fechado (a seção não constrói nada). Fora dele, é a própria página.
+    """
+    if not MODO_LAZY:
+        return contextlib.nullcontext()
+    expansor = st.expander(rotulo, key=chave, on_change='rerun')
+    return expansor if expansor.open else None
+
+def aba_visivel(aba):
+    """Se o conteúdo da aba deve ser construído (sem rastreamento de estado, `.open` é None)"""
+    return aba.open is not False
+
 # ============================================
 # 1. HEADER E INTRODUÇÃO
 # ============================================
 st.markdown('<h1 class="titulo-principal">💧 A Disparidade Silenciosa</h1>', unsafe_allow_html=True)
 st.markdown('<p class="subtitulo">Como o Saneamento Básico Modela a Saúde, Renda e Educação no Distrito Federal</p>', unsafe_allow_html=True)
 
+# Seletor de ano (aparece quando há mais de um ano de dados)
+if len(ANOS) > 1:
+    col_ano, _ = st.columns([1, 5])
+    with col_ano:
+        st.selectbox("🗓️ Ano de referência", ANOS, index=ANOS.index(ANO), key='ano')
+
 # Banner de impacto
 st.markdown(f"""
 <div class="banner-impacto">
     <div style="display: flex; justify-content: space-around; flex-wrap: wrap;">
         <div style="text-align: center; padding: 1rem;">
-            <div class="banner-numero">{DADOS_DF['pop_sem_esgoto']:,}</div>
+            <div class="banner-numero">{inteiro(DADOS_DF['pop_sem_esgoto'])}</div>
             <div class="banner-texto">pessoas sem coleta de esgoto</div>
         </div>
         <div style="text-align: center; padding: 1rem;">
-            <div class="banner-numero">{DADOS_DF['pop_sem_agua']:,}</div>
+            <div class="banner-numero">{inteiro(DADOS_DF['pop_sem_agua'])}</div>
             <div class="banner-texto">pessoas sem água tratada</div>
         </div>
     </div>
 </div>
-""".replace(",", "."), unsafe_allow_html=True)
+""", unsafe_allow_html=True)
 
 # ============================================
 # 2. PANORAMA GERAL
 # ============================================
-st.markdown("---")
-st.markdown('<h2 class="secao-titulo">📊 Panorama Geral do Distrito Federal</h2>', unsafe_allow_html=True)
+@fragmento_medido(st.fragment, 'Panorama')
+def secao_panorama():
+    """Panorama geral: métricas principais e mapa das RAs"""
+    st.markdown("---")
+    st.markdown('<h2 class="secao-titulo">📊 Panorama Geral do Distrito Federal</h2>', unsafe_allow_html=True)
+
+    # Com a geometria das RAs e os dados regionais, o mapa fica ao lado das métricas
+    MAPA_DISPONIVEL = os.path.exists(GEOJSON_RAS_PATH) and os.path.exists(caminho_fonte('regioes', ANO))
+
+    if MAPA_DISPONIVEL:
+        col_metricas, col_mapa = st.columns([1, 1])
+        with col_metricas:
+            col1, col2 = st.columns(2)
+            col3, col4 = st.columns(2)
+    else:
+        col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric(
+            label="👥 População Total",
+            value=inteiro(DADOS_DF['populacao'])
+        )
 
-col1, col2, col3, col4 = st.columns(4)
+    with col2:
+        st.metric(
+            label="🚰 Sem Água Tratada",
+            value=inteiro(DADOS_DF['pop_sem_agua']),
+            delta=f"-{decimal(DADOS_DF['perc_sem_agua'], 1)}%",
+            delta_color="inverse"
+        )
 
-with col1:
-    st.metric(
-        label="👥 População Total",
-        value=f"{DADOS_DF['populacao']:,}".replace(",", ".")
-    )
+    with col3:
+        st.metric(
+            label="🚽 Sem Coleta de Esgoto",
+            value=inteiro(DADOS_DF['pop_sem_esgoto']),
+            delta=f"-{decimal(DADOS_DF['perc_sem_esgoto'], 1)}%",
+            delta_color="inverse"
+        )
 
-with col2:
-    st.metric(
-        label="🚰 Sem Água Tratada",
-        value=f"{DADOS_DF['pop_sem_agua']:,}".replace(",", "."),
-        delta=f"-{DADOS_DF['perc_sem_agua']}%",
-        delta_color="inverse"
-    )
+    with col4:
+        # Variação em relação ao ano anterior, quando a partição existe
+        delta_internacoes = None
+        if ANO_ANTERIOR is not None:
+            internacoes_anterior = agregar_fonte(
+                'saude', ANO_ANTERIOR, {'internacoes': ('soma', 'internacoes')}
+            )['internacoes'].iloc[0]
+            delta_internacoes = f"{percentual(DADOS_DF['internacoes_total'] / internacoes_anterior - 1, sinal=True)} vs {ANO_ANTERIOR}"
+        st.metric(
+            label="🏥 Internações por Doenças Hídricas",
+            value=inteiro(DADOS_DF['internacoes_total']),
+            delta=delta_internacoes,
+            delta_color="inverse"
+        )
 
-with col3:
-    st.metric(
-        label="🚽 Sem Coleta de Esgoto",
-        value=f"{DADOS_DF['pop_sem_esgoto']:,}".replace(",", "."),
-        delta=f"-{DADOS_DF['perc_sem_esgoto']}%",
-        delta_color="inverse"
-    )
+    # Indicadores do mapa: rótulo -> (coluna calculada, escala de cores)
+    INDICADORES_MAPA = {
+        '🚽 Sem esgoto (%)': ('perc_sem_esgoto', 'Reds'),
+        '🚰 Sem água (%)': ('perc_sem_agua', 'Oranges'),
+        '🏥 Internações / 10 mil hab.': ('internacoes_10mil', 'Purples'),
+        '💰 Renda média (R$)': ('renda_media_mensal', 'Greens'),
+    }
 
-with col4:
-    st.metric(
-        label="🏥 Internações por Doenças Hídricas",
-        value=f"{DADOS_DF['internacoes_total']:,}".replace(",", ".")
-    )
+    # O módulo de geometria só é importado quando há mapa
+    if MAPA_DISPONIVEL:
+        from saneamento.geo import RESOLUCAO_PADRAO, RESOLUCOES, arquivo_resolucao, carregar_geojson
+    N_RESOLUCOES = len(RESOLUCOES) if MAPA_DISPONIVEL else 1
+
+    @cache_medido(st.cache_resource, show_spinner=False, max_entries=2 * N_RESOLUCOES)
+    def obter_geojson_ras(resolucao, assinatura):
+        """GeoJSON pré-simplificado das RAs, lido uma vez por resolução e versão do arquivo"""
+        return carregar_geojson(GEOJSON_RAS_PATH, resolucao)
+
+    @cache_medido(st.cache_resource, show_spinner=False,
+                  max_entries=ENTRADAS_VERSOES * len(INDICADORES_MAPA) * N_RESOLUCOES)
+    def construir_fig_mapa(impressao, indicador, resolucao, assinatura_geo):
+        """Mapa coroplético das RAs para um indicador"""
+        df_regioes = carregar_fonte('regioes', ANO)
+        coluna, escala = INDICADORES_MAPA[indicador]
+        valores = {
+            'perc_sem_esgoto': df_regioes['sem_coleta_esgoto'] / df_regioes['populacao'] * 100,
+            'perc_sem_agua': df_regioes['sem_agua_tratada'] / df_regioes['populacao'] * 100,
+            'internacoes_10mil': df_regioes['internacoes'] / df_regioes['populacao'] * 10_000,
+            'renda_media_mensal': df_regioes['renda_media_mensal'],
+        }[coluna]
+    
+        fig_mapa = go.Figure(go.Choropleth(
+            geojson=obter_geojson_ras(resolucao, assinatura_geo),
+            featureidkey='properties.ra',
+            locations=df_regioes['ra'],
+            z=valores.round(2),
+            text=df_regioes['nome'],
+            colorscale=escala,
+            marker=dict(line=dict(color=CORES['bg_escuro'], width=0.5)),
+            colorbar=dict(tickfont=dict(color=CORES['texto']), thickness=12),
+            hovertemplate='<b>%{text}</b><br>' + indicador + ': %{z:,.1f}<extra></extra>'
+        ))
+    
+        fig_mapa.update_geos(fitbounds='locations', visible=False, bgcolor=CORES['bg_escuro'])
+        fig_mapa.update_layout(**get_dark_layout(
+            title=f'🗺️ Regiões Administrativas - {ANO}',
+            height=420,
+            showlegend=False
+        ))
+        fig_mapa.update_layout(margin=dict(t=60, b=10, l=10, r=10))
+    
+        return fig_mapa
+
+    if MAPA_DISPONIVEL:
+        with col_mapa:
+            indicador_mapa = st.radio("Indicador do mapa", list(INDICADORES_MAPA), horizontal=True, label_visibility="collapsed")
+            # Resolução da geometria: ?mapa=baixa|media|alta (padrão média)
+            resolucao_mapa = st.query_params.get('mapa', RESOLUCAO_PADRAO)
+            if resolucao_mapa not in RESOLUCOES:
+                resolucao_mapa = RESOLUCAO_PADRAO
+            stat_geo = os.stat(arquivo_resolucao(GEOJSON_RAS_PATH, resolucao_mapa))
+            fig_mapa = construir_fig_mapa(
+                obter_impressao_fonte('regioes', ANO), indicador_mapa, resolucao_mapa,
+                (stat_geo.st_mtime_ns, stat_geo.st_size)
+            )
+            st.plotly_chart(fig_mapa, width='stretch')
+
+secao_panorama()
 
 # ============================================
 # 3. SEÇÃO SAÚDE
 # ============================================
-st.markdown("---")
-st.markdown('<h2 class="secao-titulo">🏥 Impacto na Saúde: O Custo das Doenças Evitáveis</h2>', unsafe_allow_html=True)
-
-st.markdown("""
-<div class="texto-explicativo">
-A falta de saneamento básico está diretamente ligada ao aumento de doenças de veiculação hídrica, 
-como diarreias, hepatite A, cólera e outras infecções gastrointestinais. Em 2023, o Distrito Federal 
-registrou milhares de internações que poderiam ter sido evitadas com investimentos adequados em 
-infraestrutura de água e esgoto.
-</div>
-""", unsafe_allow_html=True)
+@fragmento_medido(st.fragment, 'Saúde')
+def secao_saude():
+    """Impacto na saúde: métricas, internações e custos"""
+    st.markdown("---")
+    st.markdown('<h2 class="secao-titulo">🏥 Impacto na Saúde: O Custo das Doenças Evitáveis</h2>', unsafe_allow_html=True)
 
-col1, col2, col3 = st.columns(3)
-
-with col1:
     st.markdown(f"""
-    <div class="card-metrica card-saude">
-        <div class="card-label">💰 Custo Total das Internações</div>
-        <div class="card-numero">R$ {DADOS_DF['custo_internacoes']:,.2f}</div>
-        <div class="card-label">gastos pelo SUS em 2023</div>
+    <div class="texto-explicativo">
+    A falta de saneamento básico está diretamente ligada ao aumento de doenças de veiculação hídrica, 
+    como diarreias, hepatite A, cólera e outras infecções gastrointestinais. Em {ANO}, o Distrito Federal 
+    registrou milhares de internações que poderiam ter sido evitadas com investimentos adequados em 
+    infraestrutura de água e esgoto.
     </div>
-    """.replace(",", "X").replace(".", ",").replace("X", "."), unsafe_allow_html=True)
+    """, unsafe_allow_html=True)
 
-with col2:
-    st.markdown(f"""
-    <div class="card-metrica card-saude">
-        <div class="card-label">📋 Custo Médio por Internação</div>
-        <div class="card-numero">R$ {DADOS_DF['custo_medio_internacao']:,.2f}</div>
-        <div class="card-label">por paciente</div>
-    </div>
-    """.replace(",", "X").replace(".", ",").replace("X", "."), unsafe_allow_html=True)
+    col1, col2, col3 = st.columns(3)
 
-with col3:
-    st.markdown(f"""
-    <div class="card-metrica card-saude">
-        <div class="card-label">⚠️ Óbitos Registrados</div>
-        <div class="card-numero">{DADOS_DF['obitos']}</div>
-        <div class="card-label">mortes evitáveis</div>
-    </div>
-    """, unsafe_allow_html=True)
+    with col1:
+        st.markdown(f"""
+        <div class="card-metrica card-saude">
+            <div class="card-label">💰 Custo Total das Internações</div>
+            <div class="card-numero">{moeda(DADOS_DF['custo_internacoes'])}</div>
+            <div class="card-label">gastos pelo SUS em {ANO}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col2:
+        st.markdown(f"""
+        <div class="card-metrica card-saude">
+            <div class="card-label">📋 Custo Médio por Internação</div>
+            <div class="card-numero">{moeda(DADOS_DF['custo_medio_internacao'])}</div>
+            <div class="card-label">por paciente</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col3:
+        st.markdown(f"""
+        <div class="card-metrica card-saude">
+            <div class="card-label">⚠️ Óbitos Registrados</div>
+            <div class="card-numero">{inteiro(DADOS_DF['obitos'])}</div>
+            <div class="card-label">mortes evitáveis</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    # Gráfico de Área - Internações ao longo do ano (Dados do CSV)
+    meses = [mes[:3] for mes in df_saude['mes']]
+
+    @cache_medido(st.cache_resource, show_spinner=False, max_entries=ENTRADAS_VERSOES)
+    def construir_fig_saude(impressao):
+        """Gráfico de área das internações mensais"""
+        # Dados reais importados do CSV de saúde
+        internacoes = df_saude['internacoes'].to_numpy()
+        media_movel = df_saude['internacoes'].rolling(window=3, min_periods=1).mean().to_numpy()
+
+        # Pico calculado sobre a série completa, antes de qualquer redução
+        pico_idx = int(np.argmax(internacoes))
+
+        # Séries longas (diárias/semanais) são reduzidas no servidor e desenhadas com WebGL
+        indices = reduzir_serie(internacoes, preservar=[pico_idx])
+        rotulos = np.asarray(meses, dtype=object)[indices].tolist()
+        internacoes_mensais = internacoes[indices].tolist()
+        media_movel = media_movel[indices].tolist()
+        Traco = go.Scattergl if usar_webgl(len(indices)) else go.Scatter
+
+        fig_saude = go.Figure()
+
+        # Área preenchida para internações
+        fig_saude.add_trace(Traco(
+            x=rotulos,
+            y=internacoes_mensais,
+            fill='tozeroy',
+            fillcolor='rgba(77, 171, 247, 0.3)',
+            line=dict(color=CORES['azul'], width=1),
+            mode='lines',
+            name='Internações Mensais',
+            hovertemplate='<b>%{x}</b><br>Internações: %{y}<extra></extra>'
+        ))
 
-# Gráfico de Área - Internações ao longo do ano (Dados do CSV)
-meses = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-# Dados reais importados do CSV de saúde
-internacoes_mensais = df_saude['internacoes'].tolist()
-media_movel = pd.Series(internacoes_mensais).rolling(window=3, min_periods=1).mean().tolist()
-
-fig_saude = go.Figure()
-
-# Área preenchida para internações
-fig_saude.add_trace(go.Scatter(
-    x=meses,
-    y=internacoes_mensais,
-    fill='tozeroy',
-    fillcolor='rgba(77, 171, 247, 0.3)',
-    line=dict(color=CORES['azul'], width=1),
-    mode='lines',
-    name='Internações Mensais',
-    hovertemplate='<b>%{x}</b><br>Internações: %{y}<extra></extra>'
-))
-
-# Linha de média móvel
-fig_saude.add_trace(go.Scatter(
-    x=meses,
-    y=media_movel,
-    line=dict(color=CORES['laranja'], width=3),
-    mode='lines',
-    name='Média Móvel (3 meses)',
-    hovertemplate='<b>%{x}</b><br>Média: %{y:.0f}<extra></extra>'
-))
-
-# Marcador de pico
-pico_idx = internacoes_mensais.index(max(internacoes_mensais))
-fig_saude.add_trace(go.Scatter(
-    x=[meses[pico_idx]],
-    y=[max(internacoes_mensais)],
-    mode='markers+text',
-    marker=dict(size=15, color=CORES['amarelo'], symbol='circle', line=dict(color='white', width=2)),
-    text=['Pico'],
-    textposition='top center',
-    textfont=dict(color=CORES['amarelo'], size=12),
-    name='Pico de Internações',
-    showlegend=False
-))
-
-fig_saude.update_layout(**get_dark_layout(
-    title='📈 Internações por Doenças Hídricas ao Longo de 2023',
-    height=400
-))
-fig_saude.update_yaxes(title_text='Número de Internações')
-fig_saude.update_xaxes(title_text='Mês')
-
-st.plotly_chart(fig_saude, use_container_width=True)
-
-# Gráfico de Barras com área - Custos (Dados do CSV)
-fig_custos = go.Figure()
-
-custos_mensais = df_saude['custo_total'].tolist()
-
-fig_custos.add_trace(go.Bar(
-    x=meses,
-    y=custos_mensais,
-    marker=dict(
-        color=custos_mensais,
-        colorscale=[[0, CORES['azul']], [0.5, CORES['rosa']], [1, CORES['vermelho']]],
-        line=dict(color=CORES['rosa'], width=1)
-    ),
-    name='Custo Mensal',
-    hovertemplate='<b>%{x}</b><br>Custo: R$ %{y:,.2f}<extra></extra>'
-))
-
-# Linha de referência
-fig_custos.add_hline(
-    y=DADOS_DF['custo_internacoes']/12,
-    line_dash="dash",
-    line_color=CORES['amarelo'],
-    annotation_text=f"Média Mensal: R$ {DADOS_DF['custo_internacoes']/12:,.0f}".replace(",", "."),
-    annotation_position="right",
-    annotation_font=dict(color=CORES['amarelo'], size=12)
-)
+        # Linha de média móvel
+        fig_saude.add_trace(Traco(
+            x=rotulos,
+            y=media_movel,
+            line=dict(color=CORES['laranja'], width=3),
+            mode='lines',
+            name='Média Móvel (3 meses)',
+            hovertemplate='<b>%{x}</b><br>Média: %{y:.0f}<extra></extra>'
+        ))
+
+        # Marcador de pico
+        fig_saude.add_trace(go.Scatter(
+            x=[meses[pico_idx]],
+            y=[internacoes[pico_idx].item()],
+            mode='markers+text',
+            marker=dict(size=15, color=CORES['amarelo'], symbol='circle', line=dict(color='white', width=2)),
+            text=['Pico'],
+            textposition='top center',
+            textfont=dict(color=CORES['amarelo'], size=12),
+            name='Pico de Internações',
+            showlegend=False
+        ))
 
-fig_custos.update_layout(**get_dark_layout(
-    title='💰 Custo Mensal das Internações (R$)',
-    height=400,
-    showlegend=False
-))
-fig_custos.update_yaxes(title_text='Custo (R$)', tickprefix='R$ ')
+        fig_saude.update_layout(**get_dark_layout(
+            title=f'📈 Internações por Doenças Hídricas ao Longo de {ANO}',
+            height=400
+        ))
+        fig_saude.update_yaxes(title_text='Número de Internações')
+        fig_saude.update_xaxes(title_text='Mês')
+    
+        return fig_saude
+
+    fig_saude = construir_fig_saude(IMPRESSOES['saude'])
+
+    st.plotly_chart(fig_saude, width='stretch')
+
+    # Gráfico de Barras com área - Custos (Dados do CSV)
+    @cache_medido(st.cache_resource, show_spinner=False, max_entries=ENTRADAS_VERSOES)
+    def construir_fig_custos(impressao):
+        """Gráfico de barras dos custos mensais das internações"""
+        fig_custos = go.Figure()
+
+        custos_mensais = df_saude['custo_total'].tolist()
+
+        fig_custos.add_trace(go.Bar(
+            x=meses,
+            y=custos_mensais,
+            marker=dict(
+                color=custos_mensais,
+                colorscale=[[0, CORES['azul']], [0.5, CORES['rosa']], [1, CORES['vermelho']]],
+                line=dict(color=CORES['rosa'], width=1)
+            ),
+            name='Custo Mensal',
+            hovertemplate='<b>%{x}</b><br>Custo: R$ %{y:,.2f}<extra></extra>'
+        ))
 
-st.plotly_chart(fig_custos, use_container_width=True)
+        # Linha de referência
+        fig_custos.add_hline(
+            y=DADOS_DF['custo_internacoes']/len(meses),
+            line_dash="dash",
+            line_color=CORES['amarelo'],
+            annotation_text=f"Média Mensal: {moeda(DADOS_DF['custo_internacoes'] / len(meses), casas=0)}",
+            annotation_position="right",
+            annotation_font=dict(color=CORES['amarelo'], size=12)
+        )
 
-st.markdown("""
-<div class="box-info">
-    <strong>💡 Custos Indiretos:</strong> Além dos custos diretos com internações, a falta de saneamento gera 
-    custos indiretos significativos: perda de produtividade, faltas ao trabalho e escola, gastos com medicamentos 
-    e tratamentos ambulatoriais, e impacto psicológico nas famílias afetadas.
-</div>
-""", unsafe_allow_html=True)
+        fig_custos.update_layout(**get_dark_layout(
+            title='💰 Custo Mensal das Internações (R$)',
+            height=400,
+            showlegend=False
+        ))
+        fig_custos.update_yaxes(title_text='Custo (R$)', tickprefix='R$ ')
+    
+        return fig_custos
 
-# ============================================
-# 4. SEÇÃO RENDA
-# ============================================
-st.markdown("---")
-st.markdown('<h2 class="secao-titulo">💰 Impacto na Renda: A Desigualdade Econômica</h2>', unsafe_allow_html=True)
+    fig_custos = construir_fig_custos(IMPRESSOES['saude'])
 
-st.markdown(f"""
-<div class="texto-explicativo">
-A diferença de renda entre domicílios com e sem saneamento adequado é de 
-<b>R$ {DADOS_DF['diferenca_renda']:,.2f}</b> por mês. Isso representa muito mais do que um número — 
-é a materialização de um ciclo de desigualdade que se perpetua por gerações.
-</div>
-""".replace(",", "X").replace(".", ",").replace("X", "."), unsafe_allow_html=True)
-
-# Gráfico de Área - Evolução da Renda Acumulada
-anos = list(range(0, 21))
-renda_com_acum = [DADOS_DF['renda_com_saneamento'] * 12 * ano for ano in anos]
-renda_sem_acum = [DADOS_DF['renda_sem_saneamento'] * 12 * ano for ano in anos]
-diferenca_acum = [c - s for c, s in zip(renda_com_acum, renda_sem_acum)]
-
-fig_renda = go.Figure()
-
-# Área para renda com saneamento
-fig_renda.add_trace(go.Scatter(
-    x=anos,
-    y=renda_com_acum,
-    fill='tozeroy',
-    fillcolor='rgba(81, 207, 102, 0.3)',
-    line=dict(color=CORES['verde'], width=3),
-    mode='lines',
-    name='Com Saneamento',
-    hovertemplate='<b>Ano %{x}</b><br>Renda Acumulada: R$ %{y:,.0f}<extra></extra>'
-))
-
-# Área para renda sem saneamento
-fig_renda.add_trace(go.Scatter(
-    x=anos,
-    y=renda_sem_acum,
-    fill='tozeroy',
-    fillcolor='rgba(255, 107, 53, 0.3)',
-    line=dict(color=CORES['laranja'], width=3),
-    mode='lines',
-    name='Sem Saneamento',
-    hovertemplate='<b>Ano %{x}</b><br>Renda Acumulada: R$ %{y:,.0f}<extra></extra>'
-))
-
-# Linha vertical marcando 10 anos
-fig_renda.add_vline(
-    x=10,
-    line_dash="dash",
-    line_color=CORES['amarelo'],
-    annotation_text="10 Anos",
-    annotation_position="top",
-    annotation_font=dict(color=CORES['amarelo'], size=12)
-)
+    st.plotly_chart(fig_custos, width='stretch')
 
-# Anotação da diferença em 20 anos
-fig_renda.add_annotation(
-    x=20, y=diferenca_acum[-1]/2 + renda_sem_acum[-1],
-    text=f"<b>Diferença em 20 anos:<br>R$ {diferenca_acum[-1]:,.0f}</b>".replace(",", "."),
-    showarrow=True,
-    arrowhead=2,
-    arrowcolor=CORES['amarelo'],
-    font=dict(size=14, color=CORES['amarelo']),
-    bgcolor=CORES['bg_card'],
-    bordercolor=CORES['amarelo'],
-    borderwidth=2,
-    borderpad=8,
-    ax=-80,
-    ay=-40
-)
+    # Comparação ano a ano: carrega apenas a partição de saúde do ano anterior
+    if ANO_ANTERIOR is not None:
+        @cache_medido(st.cache_resource, show_spinner=False, max_entries=ENTRADAS_VERSOES)
+        def construir_fig_saude_anual(impressao, impressao_anterior):
+            """Gráfico de barras das internações mensais do ano selecionado contra o ano anterior"""
+            df_anterior = carregar_fonte('saude', ANO_ANTERIOR)
+        
+            fig_saude_anual = go.Figure()
+        
+            fig_saude_anual.add_trace(go.Bar(
+                x=[mes[:3] for mes in df_anterior['mes']],
+                y=df_anterior['internacoes'].tolist(),
+                name=str(ANO_ANTERIOR),
+                marker=dict(color=CORES['azul_claro'], opacity=0.6),
+                hovertemplate=f'<b>%{{x}} {ANO_ANTERIOR}</b><br>Internações: %{{y}}<extra></extra>'
+            ))
+        
+            fig_saude_anual.add_trace(go.Bar(
+                x=meses,
+                y=df_saude['internacoes'].tolist(),
+                name=str(ANO),
+                marker=dict(color=CORES['laranja']),
+                hovertemplate=f'<b>%{{x}} {ANO}</b><br>Internações: %{{y}}<extra></extra>'
+            ))
+        
+            fig_saude_anual.update_layout(**get_dark_layout(
+                title=f'📊 Internações Mensais: {ANO} vs {ANO_ANTERIOR}',
+                height=400
+            ))
+            fig_saude_anual.update_layout(barmode='group')
+            fig_saude_anual.update_yaxes(title_text='Número de Internações')
+        
+            return fig_saude_anual
+    
+        fig_saude_anual = construir_fig_saude_anual(IMPRESSOES['saude'], obter_impressao_fonte('saude', ANO_ANTERIOR))
+    
+        st.plotly_chart(fig_saude_anual, width='stretch')
 
-fig_renda.update_layout(**get_dark_layout(
-    title='📈 Evolução da Renda Acumulada ao Longo dos Anos',
-    height=450
-))
-fig_renda.update_xaxes(title_text='Anos', dtick=5)
-fig_renda.update_yaxes(title_text='Renda Acumulada (R$)', tickprefix='R$ ')
-
-st.plotly_chart(fig_renda, use_container_width=True)
-
-# Gráfico de barras comparativo
-fig_comp_renda = go.Figure()
-
-categorias_renda = ['Renda Mensal', 'Renda Anual', 'Renda em 5 Anos', 'Renda em 10 Anos']
-valores_com = [
-    DADOS_DF['renda_com_saneamento'],
-    DADOS_DF['renda_com_saneamento'] * 12,
-    DADOS_DF['renda_com_saneamento'] * 12 * 5,
-    DADOS_DF['renda_com_saneamento'] * 12 * 10
-]
-valores_sem = [
-    DADOS_DF['renda_sem_saneamento'],
-    DADOS_DF['renda_sem_saneamento'] * 12,
-    DADOS_DF['renda_sem_saneamento'] * 12 * 5,
-    DADOS_DF['renda_sem_saneamento'] * 12 * 10
-]
-
-fig_comp_renda.add_trace(go.Bar(
-    name='Com Saneamento',
-    x=categorias_renda,
-    y=valores_com,
-    marker=dict(color=CORES['verde'], line=dict(color=CORES['verde_claro'], width=2)),
-    text=[f"R$ {v:,.0f}".replace(",", ".") for v in valores_com],
-    textposition='outside',
-    textfont=dict(color=CORES['verde'], size=11)
-))
-
-fig_comp_renda.add_trace(go.Bar(
-    name='Sem Saneamento',
-    x=categorias_renda,
-    y=valores_sem,
-    marker=dict(color=CORES['vermelho'], line=dict(color=CORES['vermelho_claro'], width=2)),
-    text=[f"R$ {v:,.0f}".replace(",", ".") for v in valores_sem],
-    textposition='outside',
-    textfont=dict(color=CORES['vermelho'], size=11)
-))
-
-fig_comp_renda.update_layout(**get_dark_layout(
-    title='💵 Comparativo de Renda: Com vs Sem Saneamento',
-    height=450
-))
-fig_comp_renda.update_layout(barmode='group')
-fig_comp_renda.update_yaxes(title_text='Valor (R$)', tickprefix='R$ ')
-
-st.plotly_chart(fig_comp_renda, use_container_width=True)
-
-col1, col2 = st.columns(2)
-
-with col1:
     st.markdown("""
     <div class="box-info">
-        <strong>📈 Impacto Acumulado:</strong>
-        <ul>
-            <li><b>1 ano:</b> R$ 13.354,80 de diferença</li>
-            <li><b>5 anos:</b> R$ 66.774,00 de diferença</li>
-            <li><b>10 anos:</b> R$ 133.548,00 de diferença</li>
-            <li><b>20 anos:</b> R$ 267.096,00 de diferença</li>
-        </ul>
+        <strong>💡 Custos Indiretos:</strong> Além dos custos diretos com internações, a falta de saneamento gera 
+        custos indiretos significativos: perda de produtividade, faltas ao trabalho e escola, gastos com medicamentos 
+        e tratamentos ambulatoriais, e impacto psicológico nas famílias afetadas.
     </div>
     """, unsafe_allow_html=True)
 
-with col2:
-    st.markdown("""
-    <div class="box-info">
-        <strong>🔄 Ciclo da Pobreza:</strong>
-        <ol>
-            <li>Falta de saneamento → mais doenças</li>
-            <li>Mais doenças → mais faltas ao trabalho</li>
-            <li>Mais faltas → menor produtividade</li>
-            <li>Menor produtividade → menor renda</li>
-            <li>Menor renda → continua sem saneamento</li>
-        </ol>
-    </div>
-    """, unsafe_allow_html=True)
+secao_saude()
 
 # ============================================
-# 5. SEÇÃO EDUCAÇÃO
+# 4. SEÇÃO RENDA
 # ============================================
-st.markdown("---")
-st.markdown('<h2 class="secao-titulo">🎓 Impacto na Educação: O Futuro Comprometido</h2>', unsafe_allow_html=True)
+# Parâmetros da projeção Monte Carlo da renda acumulada: do arquivo de parâmetros, com a
+# dispersão da renda estimada da tabela do IBGE quando desagregada (a semente fixa torna o gráfico reprodutível)
+# (a pasta de dados pode trazer o seu; senão vale o do repositório)
+PARAMETROS_RENDA_PATH = next(caminho for caminho in (
+    os.path.join(DADOS_PATH, 'parametros_renda.csv'),
+    os.path.join(os.path.dirname(__file__), 'dados', 'parametros_renda.csv'),
+) if os.path.exists(caminho))
+
+@cache_medido(st.cache_data, show_spinner=False, max_entries=ENTRADAS_VERSOES)
+def obter_parametros_renda(impressao, assinatura_parametros):
+    """Parâmetros da simulação, uma vez por versão da renda e do arquivo de parâmetros"""
+    from saneamento.montecarlo import carregar_parametros, estimar_parametros
+    return estimar_parametros(df_renda, carregar_parametros(PARAMETROS_RENDA_PATH))
+
+PARAMETROS_RENDA = obter_parametros_renda(IMPRESSOES['renda'], hash_arquivo(PARAMETROS_RENDA_PATH))
+
+# Anos destacados no resumo do impacto acumulado
+ANOS_IMPACTO = (1, 5, 10, 20)
+
+@fragmento_medido(st.fragment, 'Renda')
+def secao_renda():
+    """Impacto na renda: evolução acumulada e comparativo"""
+    st.markdown("---")
+    st.markdown('<h2 class="secao-titulo">💰 Impacto na Renda: A Desigualdade Econômica</h2>', unsafe_allow_html=True)
 
-tab1, tab2 = st.tabs(["📚 Anos de Escolaridade", "📝 Desempenho no ENEM"])
-
-with tab1:
     st.markdown(f"""
     <div class="texto-explicativo">
-    A diferença de <b>{DADOS_DF['diferenca_escolaridade']:.2f} anos</b> de escolaridade entre pessoas com e sem 
-    acesso a saneamento representa quase <b>2 anos a menos de estudo</b> - o equivalente a não completar 
-    o ensino fundamental.
+    A diferença de renda entre domicílios com e sem saneamento adequado é de 
+    <b>{moeda(DADOS_DF['diferenca_renda'])}</b> por mês. Isso representa muito mais do que um número — 
+    é a materialização de um ciclo de desigualdade que se perpetua por gerações.
     </div>
-    """.replace(".", ","), unsafe_allow_html=True)
+    """, unsafe_allow_html=True)
+
+    # Projeção Monte Carlo da renda acumulada (caminhos, reajuste, inflação e dispersão em saneamento/montecarlo.py)
+    @cache_medido(st.cache_data, show_spinner=False, max_entries=ENTRADAS_VERSOES)
+    def projetar_renda(impressao, parametros):
+        """Percentis da renda acumulada simulada, uma vez por versão da renda e conjunto de parâmetros"""
+        from saneamento.montecarlo import simular_renda
+        return simular_renda(DADOS_DF['renda_com_saneamento'], DADOS_DF['renda_sem_saneamento'], parametros)
+
+    # Gráfico de Área - Evolução da Renda Acumulada (leques de percentis)
+    @cache_medido(st.cache_resource, show_spinner=False, max_entries=ENTRADAS_VERSOES)
+    def construir_fig_renda(impressao, parametros):
+        """Leques P5-P95 e P25-P75 e mediana da renda acumulada com e sem saneamento"""
+        projecao = projetar_renda(impressao, parametros)
+        anos = projecao['anos'].tolist()
+        p5, p25, p50, p75, p95 = range(len(projecao['percentis']))
+
+        fig_renda = go.Figure()
+
+        grupos = [
+            ('com', 'Com Saneamento', CORES['verde'], '81, 207, 102'),
+            ('sem', 'Sem Saneamento', CORES['laranja'], '255, 107, 53'),
+        ]
+        for grupo, nome, cor, rgb in grupos:
+            faixas = projecao[grupo]
+            # Leques: o traço inferior é invisível e o superior preenche até ele
+            for inferior, superior, opacidade in ((p5, p95, 0.15), (p25, p75, 0.3)):
+                fig_renda.add_trace(go.Scatter(
+                    x=anos, y=faixas[inferior].tolist(), mode='lines', line=dict(width=0),
+                    legendgroup=grupo, showlegend=False, hoverinfo='skip'
+                ))
+                fig_renda.add_trace(go.Scatter(
+                    x=anos, y=faixas[superior].tolist(), mode='lines', line=dict(width=0),
+                    fill='tonexty', fillcolor=f'rgba({rgb}, {opacidade})',
+                    legendgroup=grupo, showlegend=False, hoverinfo='skip'
+                ))
+
+            fig_renda.add_trace(go.Scatter(
+                x=anos,
+                y=faixas[p50].tolist(),
+                customdata=np.column_stack([faixas[p5], faixas[p95]]).tolist(),
+                line=dict(color=cor, width=3),
+                mode='lines',
+                name=nome,
+                legendgroup=grupo,
+                hovertemplate='<b>Ano %{x}</b><br>Renda Acumulada (mediana): R$ %{y:,.0f}'
+                              '<br>P5–P95: R$ %{customdata[0]:,.0f} – R$ %{customdata[1]:,.0f}<extra></extra>'
+            ))
+
+        mediana_com = projecao['com'][p50]
+        mediana_sem = projecao['sem'][p50]
+        diferenca_mediana = projecao['diferenca'][p50]
+
+        # Linha vertical marcando 10 anos
+        fig_renda.add_vline(
+            x=10,
+            line_dash="dash",
+            line_color=CORES['amarelo'],
+            annotation_text="10 Anos",
+            annotation_position="top",
+            annotation_font=dict(color=CORES['amarelo'], size=12)
+        )
+
+        # Anotação da diferença (mediana entre os caminhos) no último ano
+        fig_renda.add_annotation(
+            x=anos[-1], y=(mediana_com[-1] + mediana_sem[-1]) / 2,
+            text=f"<b>Diferença mediana em {anos[-1]} anos:<br>{moeda(diferenca_mediana[-1], casas=0)}</b>",
+            showarrow=True,
+            arrowhead=2,
+            arrowcolor=CORES['amarelo'],
+            font=dict(size=14, color=CORES['amarelo']),
+            bgcolor=CORES['bg_card'],
+            bordercolor=CORES['amarelo'],
+            borderwidth=2,
+            borderpad=8,
+            ax=-80,
+            ay=-40
+        )
+
+        fig_renda.update_layout(**get_dark_layout(
+            title='📈 Evolução da Renda Acumulada ao Longo dos Anos',
+            height=450
+        ))
+        fig_renda.update_xaxes(title_text='Anos', dtick=5)
+        fig_renda.update_yaxes(title_text='Renda Acumulada (R$ de hoje)', tickprefix='R$ ')
     
-    # Gráfico de área - Progressão escolar simulada
-    idades = list(range(6, 26))
-    escolaridade_com = [min(max(0, (idade - 6) * 0.95), DADOS_DF['escolaridade_com']) for idade in idades]
-    escolaridade_sem = [min(max(0, (idade - 6) * 0.78), DADOS_DF['escolaridade_sem']) for idade in idades]
+        return fig_renda
+
+    fig_renda = construir_fig_renda(IMPRESSOES['renda'], PARAMETROS_RENDA)
+
+    st.plotly_chart(fig_renda, width='stretch')
+
+    # Gráfico de barras comparativo
+    @cache_medido(st.cache_resource, show_spinner=False, max_entries=ENTRADAS_VERSOES)
+    def construir_fig_comp_renda(impressao):
+        """Gráfico de barras comparando a renda com e sem saneamento"""
+        fig_comp_renda = go.Figure()
+
+        categorias_renda = ['Renda Mensal', 'Renda Anual', 'Renda em 5 Anos', 'Renda em 10 Anos']
+        valores_com = [
+            DADOS_DF['renda_com_saneamento'],
+            DADOS_DF['renda_com_saneamento'] * 12,
+            DADOS_DF['renda_com_saneamento'] * 12 * 5,
+            DADOS_DF['renda_com_saneamento'] * 12 * 10
+        ]
+        valores_sem = [
+            DADOS_DF['renda_sem_saneamento'],
+            DADOS_DF['renda_sem_saneamento'] * 12,
+            DADOS_DF['renda_sem_saneamento'] * 12 * 5,
+            DADOS_DF['renda_sem_saneamento'] * 12 * 10
+        ]
+
+        fig_comp_renda.add_trace(go.Bar(
+            name='Com Saneamento',
+            x=categorias_renda,
+            y=valores_com,
+            marker=dict(color=CORES['verde'], line=dict(color=CORES['verde_claro'], width=2)),
+            text=moeda(valores_com, casas=0),
+            textposition='outside',
+            textfont=dict(color=CORES['verde'], size=11)
+        ))
+
+        fig_comp_renda.add_trace(go.Bar(
+            name='Sem Saneamento',
+            x=categorias_renda,
+            y=valores_sem,
+            marker=dict(color=CORES['vermelho'], line=dict(color=CORES['vermelho_claro'], width=2)),
+            text=moeda(valores_sem, casas=0),
+            textposition='outside',
+            textfont=dict(color=CORES['vermelho'], size=11)
+        ))
+
+        fig_comp_renda.update_layout(**get_dark_layout(
+            title='💵 Comparativo de Renda: Com vs Sem Saneamento',
+            height=450
+        ))
+        fig_comp_renda.update_layout(barmode='group')
+        fig_comp_renda.update_yaxes(title_text='Valor (R$)', tickprefix='R$ ')
     
-    fig_escol = go.Figure()
+        return fig_comp_renda
+
+    fig_comp_renda = construir_fig_comp_renda(IMPRESSOES['renda'])
+
+    st.plotly_chart(fig_comp_renda, width='stretch')
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Mesma simulação do gráfico acima: mediana e faixa P5-P95 da diferença acumulada
+        projecao = projetar_renda(IMPRESSOES['renda'], PARAMETROS_RENDA)
+        p5, p50, p95 = (projecao['percentis'].index(p) for p in (5, 50, 95))
+        itens_impacto = ''.join(
+            f"<li><b>{ano} ano{'s' if ano > 1 else ''}:</b> {moeda(projecao['diferenca'][p50][ano], casas=0)} "
+            f"de diferença (P5–P95: {moeda(projecao['diferenca'][p5][ano], casas=0)} a "
+            f"{moeda(projecao['diferenca'][p95][ano], casas=0)})</li>"
+            for ano in ANOS_IMPACTO if ano <= PARAMETROS_RENDA.anos
+        )
+        st.markdown(f"""
+        <div class="box-info">
+            <strong>📈 Impacto Acumulado (mediana simulada):</strong>
+            <ul>
+                {itens_impacto}
+            </ul>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col2:
+        st.markdown("""
+        <div class="box-info">
+            <strong>🔄 Ciclo da Pobreza:</strong>
+            <ol>
+                <li>Falta de saneamento → mais doenças</li>
+                <li>Mais doenças → mais faltas ao trabalho</li>
+                <li>Mais faltas → menor produtividade</li>
+                <li>Menor produtividade → menor renda</li>
+                <li>Menor renda → continua sem saneamento</li>
+            </ol>
+        </div>
+        """, unsafe_allow_html=True)
+
+secao_renda()
+
+# ============================================
+# 5. SEÇÃO EDUCAÇÃO
+# ============================================
+@fragmento_medido(st.fragment, 'Educação')
+def secao_educacao():
+    """Impacto na educação: escolaridade e ENEM em abas"""
+    st.markdown("---")
+    st.markdown('<h2 class="secao-titulo">🎓 Impacto na Educação: O Futuro Comprometido</h2>', unsafe_allow_html=True)
+
+    # No modo lazy, só a aba selecionada constrói seu conteúdo (a troca reroda o fragmento)
+    tab1, tab2 = st.tabs(["📚 Anos de Escolaridade", "📝 Desempenho no ENEM"],
+                         key='abas_educacao', on_change='rerun' if MODO_LAZY else 'ignore')
+
+    with tab1:
+        if aba_visivel(tab1):
+            st.markdown(f"""
+            <div class="texto-explicativo">
+            A diferença de <b>{decimal(DADOS_DF['diferenca_escolaridade'])} anos</b> de escolaridade entre pessoas com e sem 
+            acesso a saneamento representa quase <b>2 anos a menos de estudo</b> - o equivalente a não completar 
+            o ensino fundamental.
+            </div>
+            """, unsafe_allow_html=True)
     
-    # Área com saneamento
-    fig_escol.add_trace(go.Scatter(
-        x=idades,
-        y=escolaridade_com,
-        fill='tozeroy',
-        fillcolor='rgba(77, 171, 247, 0.4)',
-        line=dict(color=CORES['azul'], width=3),
-        mode='lines',
-        name='Com Saneamento',
-        hovertemplate='<b>Idade: %{x} anos</b><br>Escolaridade: %{y:.1f} anos<extra></extra>'
-    ))
+            # Curvas de escolaridade por idade: da PNAD quando disponíveis, senão a progressão simulada
+            CURVAS_ESCOLARIDADE_DISPONIVEIS = os.path.exists(arquivo_fonte('escolaridade_idade', ANO)[0])
+
+            @cache_medido(st.cache_resource, show_spinner=False, max_entries=ENTRADAS_VERSOES)
+            def construir_fig_escol(impressao, impressao_curvas):
+                """Gráfico de área da progressão da escolaridade por idade"""
+                idades = list(range(6, 26))
+                grupos = [
+                    ('com_saneamento', 'Com Saneamento', CORES['azul'], '77, 171, 247'),
+                    ('sem_saneamento', 'Sem Saneamento', CORES['rosa'], '240, 101, 149'),
+                ]
+                if impressao_curvas is not None:
+                    curvas = carregar_fonte('escolaridade_idade', ANO)
+                    curvas = curvas[curvas['idade'].between(idades[0], idades[-1])]
+                    curvas = {grupo: curvas[curvas['saneamento'] == grupo] for grupo, *_ in grupos}
+                else:
+                    taxas = {'com_saneamento': (0.95, DADOS_DF['escolaridade_com']),
+                             'sem_saneamento': (0.78, DADOS_DF['escolaridade_sem'])}
+                    curvas = {
+                        grupo: pd.DataFrame({'idade': idades, 'media': [min(max(0, (idade - 6) * taxa), teto)
+                                                                        for idade in idades]})
+                        for grupo, (taxa, teto) in taxas.items()
+                    }
     
-    # Área sem saneamento
-    fig_escol.add_trace(go.Scatter(
-        x=idades,
-        y=escolaridade_sem,
-        fill='tozeroy',
-        fillcolor='rgba(240, 101, 149, 0.4)',
-        line=dict(color=CORES['rosa'], width=3),
-        mode='lines',
-        name='Sem Saneamento',
-        hovertemplate='<b>Idade: %{x} anos</b><br>Escolaridade: %{y:.1f} anos<extra></extra>'
-    ))
+                fig_escol = go.Figure()
     
-    # Linha de referência - Ensino Médio completo
-    fig_escol.add_hline(
-        y=12,
-        line_dash="dash",
-        line_color=CORES['amarelo'],
-        annotation_text="Ensino Médio Completo",
-        annotation_position="right",
-        annotation_font=dict(color=CORES['amarelo'], size=11)
-    )
+                for grupo, nome, cor, rgb in grupos:
+                    curva = curvas[grupo]
+                    # Intervalo de confiança (só nas curvas da PNAD)
+                    if 'ic_inferior' in curva:
+                        fig_escol.add_trace(go.Scatter(
+                            x=curva['idade'].tolist(), y=curva['ic_inferior'].tolist(), mode='lines',
+                            line=dict(width=0), legendgroup=grupo, showlegend=False, hoverinfo='skip'
+                        ))
+                        fig_escol.add_trace(go.Scatter(
+                            x=curva['idade'].tolist(), y=curva['ic_superior'].tolist(), mode='lines',
+                            line=dict(width=0), fill='tonexty', fillcolor=f'rgba({rgb}, 0.25)',
+                            legendgroup=grupo, showlegend=False, hoverinfo='skip'
+                        ))
+                        preenchimento = dict()
+                        dica = ('<b>Idade: %{x} anos</b><br>Escolaridade: %{y:.1f} anos'
+                                '<br>IC 95%: %{customdata[0]:.1f} – %{customdata[1]:.1f}<extra></extra>')
+                        extras = dict(legendgroup=grupo,
+                                      customdata=curva[['ic_inferior', 'ic_superior']].to_numpy().tolist())
+                    else:
+                        # Área sob a curva simulada
+                        preenchimento = dict(fill='tozeroy', fillcolor=f'rgba({rgb}, 0.4)')
+                        dica = '<b>Idade: %{x} anos</b><br>Escolaridade: %{y:.1f} anos<extra></extra>'
+                        extras = {}
+
+                    fig_escol.add_trace(go.Scatter(
+                        x=curva['idade'].tolist(),
+                        y=curva['media'].tolist(),
+                        **preenchimento,
+                        line=dict(color=cor, width=3),
+                        mode='lines',
+                        name=nome,
+                        hovertemplate=dica,
+                        **extras
+                    ))
     
-    # Marcador do GAP
-    fig_escol.add_annotation(
-        x=25, y=(DADOS_DF['escolaridade_com'] + DADOS_DF['escolaridade_sem'])/2,
-        text=f"<b>GAP: {DADOS_DF['diferenca_escolaridade']:.2f} anos</b>".replace(".", ","),
-        showarrow=True,
-        arrowhead=2,
-        arrowcolor=CORES['amarelo'],
-        font=dict(size=14, color=CORES['texto']),
-        bgcolor=CORES['bg_card'],
-        bordercolor=CORES['amarelo'],
-        borderwidth=2,
-        borderpad=8,
-        ax=-60,
-        ay=0
-    )
+                # Linha de referência - Ensino Médio completo
+                fig_escol.add_hline(
+                    y=12,
+                    line_dash="dash",
+                    line_color=CORES['amarelo'],
+                    annotation_text="Ensino Médio Completo",
+                    annotation_position="right",
+                    annotation_font=dict(color=CORES['amarelo'], size=11)
+                )
     
-    fig_escol.update_layout(**get_dark_layout(
-        title='📚 Progressão da Escolaridade por Idade',
-        height=450
-    ))
-    fig_escol.update_xaxes(title_text='Idade (anos)', dtick=2)
-    fig_escol.update_yaxes(title_text='Anos de Estudo', dtick=2)
+                # Marcador do GAP: nas curvas da PNAD, a diferença na maior idade com as duas curvas
+                if impressao_curvas is not None:
+                    finais = pd.merge(curvas['com_saneamento'], curvas['sem_saneamento'], on='idade',
+                                      suffixes=('_com', '_sem')).nlargest(1, 'idade')
+                if impressao_curvas is not None and len(finais):
+                    idade_gap = int(finais['idade'].iloc[0])
+                    topo_gap, base_gap = finais['media_com'].iloc[0], finais['media_sem'].iloc[0]
+                    gap = topo_gap - base_gap
+                else:
+                    idade_gap, topo_gap, base_gap = 25, DADOS_DF['escolaridade_com'], DADOS_DF['escolaridade_sem']
+                    gap = DADOS_DF['diferenca_escolaridade']
+                fig_escol.add_annotation(
+                    x=idade_gap, y=(topo_gap + base_gap)/2,
+                    text=f"<b>GAP: {decimal(gap)} anos</b>",
+                    showarrow=True,
+                    arrowhead=2,
+                    arrowcolor=CORES['amarelo'],
+                    font=dict(size=14, color=CORES['texto']),
+                    bgcolor=CORES['bg_card'],
+                    bordercolor=CORES['amarelo'],
+                    borderwidth=2,
+                    borderpad=8,
+                    ax=-60,
+                    ay=0
+                )
     
-    st.plotly_chart(fig_escol, use_container_width=True)
+                fig_escol.update_layout(**get_dark_layout(
+                    title='📚 Progressão da Escolaridade por Idade',
+                    height=450
+                ))
+                fig_escol.update_xaxes(title_text='Idade (anos)', dtick=2)
+                fig_escol.update_yaxes(title_text='Anos de Estudo', dtick=2)
+        
+                return fig_escol
     
-    st.markdown("""
-    <div class="box-info">
-        <strong>📖 O que isso significa:</strong><br>
-        Quase 2 anos a menos de estudo impactam diretamente nas oportunidades de emprego, 
-        capacidade de compreensão de direitos, acesso a informações de saúde e participação 
-        cidadã. É um ciclo que se perpetua por gerações.
-    </div>
-    """, unsafe_allow_html=True)
-
-with tab2:
-    st.markdown(f"""
-    <div class="texto-explicativo">
-    A diferença de <b>{DADOS_DF['diferenca_enem']:.2f} pontos</b> no ENEM entre estudantes com e sem 
-    banheiro adequado pode significar a diferença entre entrar ou não em uma universidade pública.
-    </div>
-    """.replace(".", ","), unsafe_allow_html=True)
+            fig_escol = construir_fig_escol(
+                IMPRESSOES['educacao'],
+                obter_impressao_fonte('escolaridade_idade', ANO) if CURVAS_ESCOLARIDADE_DISPONIVEIS else None
+            )
     
-    # Gráfico de barras estilo lollipop com fundo escuro
-    fig_enem = go.Figure()
+            st.plotly_chart(fig_escol, width='stretch')
     
-    categorias_enem = ['Com Banheiro Adequado', 'Sem Banheiro Adequado']
-    valores_enem = [DADOS_DF['enem_com_banheiro'], DADOS_DF['enem_sem_banheiro']]
-    cores_enem = [CORES['cyan'], CORES['rosa']]
+            st.markdown("""
+            <div class="box-info">
+                <strong>📖 O que isso significa:</strong><br>
+                Quase 2 anos a menos de estudo impactam diretamente nas oportunidades de emprego, 
+                capacidade de compreensão de direitos, acesso a informações de saúde e participação 
+                cidadã. É um ciclo que se perpetua por gerações.
+            </div>
+            """, unsafe_allow_html=True)
+
+    with tab2:
+        if aba_visivel(tab2):
+            st.markdown(f"""
+            <div class="texto-explicativo">
+            A diferença de <b>{decimal(DADOS_DF['diferenca_enem'])} pontos</b> no ENEM entre estudantes com e sem 
+            banheiro adequado pode significar a diferença entre entrar ou não em uma universidade pública.
+            </div>
+            """, unsafe_allow_html=True)
     
-    # Barras
-    for i, (cat, val, cor) in enumerate(zip(categorias_enem, valores_enem, cores_enem)):
-        # Linha vertical (stem)
-        fig_enem.add_trace(go.Scatter(
-            x=[cat, cat],
-            y=[0, val],
-            mode='lines',
-            line=dict(color=cor, width=20),
-            showlegend=False,
-            hoverinfo='skip'
-        ))
+            # Gráfico de barras estilo lollipop com fundo escuro
+            @cache_medido(st.cache_resource, show_spinner=False, max_entries=ENTRADAS_VERSOES)
+            def construir_fig_enem(impressao):
+                """Gráfico lollipop da nota média no ENEM"""
+                fig_enem = go.Figure()
+    
+                categorias_enem = ['Com Banheiro Adequado', 'Sem Banheiro Adequado']
+                valores_enem = [DADOS_DF['enem_com_banheiro'], DADOS_DF['enem_sem_banheiro']]
+                cores_enem = [CORES['cyan'], CORES['rosa']]
+    
+                # Barras
+                for i, (cat, val, cor) in enumerate(zip(categorias_enem, valores_enem, cores_enem)):
+                    # Linha vertical (stem)
+                    fig_enem.add_trace(go.Scatter(
+                        x=[cat, cat],
+                        y=[0, val],
+                        mode='lines',
+                        line=dict(color=cor, width=20),
+                        showlegend=False,
+                        hoverinfo='skip'
+                    ))
         
-        # Círculo no topo
-        fig_enem.add_trace(go.Scatter(
-            x=[cat],
-            y=[val],
-            mode='markers+text',
-            marker=dict(size=50, color=cor, line=dict(color='white', width=3)),
-            text=[f"{val:.1f}".replace(".", ",")],
-            textposition='middle center',
-            textfont=dict(size=14, color='white', family='Arial Black'),
-            name=cat,
-            hovertemplate=f'<b>{cat}</b><br>Nota: {val:.2f} pontos<extra></extra>'
-        ))
+                    # Círculo no topo
+                    fig_enem.add_trace(go.Scatter(
+                        x=[cat],
+                        y=[val],
+                        mode='markers+text',
+                        marker=dict(size=50, color=cor, line=dict(color='white', width=3)),
+                        text=[decimal(val, 1)],
+                        textposition='middle center',
+                        textfont=dict(size=14, color='white', family='Arial Black'),
+                        name=cat,
+                        hovertemplate=f'<b>{cat}</b><br>Nota: {decimal(val)} pontos<extra></extra>'
+                    ))
     
-    # Linha de referência - média nacional
-    fig_enem.add_hline(
-        y=500,
-        line_dash="dash",
-        line_color=CORES['amarelo'],
-        line_width=3,
-        annotation_text="📌 Média Nacional (500 pts)",
-        annotation_position="right",
-        annotation_font=dict(color=CORES['amarelo'], size=13, family='Arial Black')
-    )
+                # Dispersão das notas (microdados): mediana com a faixa P10-P90 e os quartis no hover
+                teto_eixo = 600
+                if ESTATISTICAS_ENEM is not None:
+                    for cat, grupo, cor in zip(categorias_enem, ('com_saneamento', 'sem_saneamento'), cores_enem):
+                        if not ESTATISTICAS_ENEM[grupo]['participantes']:
+                            continue
+                        quantis = ESTATISTICAS_ENEM[grupo]['quantis']
+                        p10, p25, p50, p75, p90 = (quantis[q] for q in (0.1, 0.25, 0.5, 0.75, 0.9))
+                        fig_enem.add_trace(go.Scatter(
+                            x=[cat],
+                            y=[p50],
+                            mode='markers',
+                            marker=dict(symbol='diamond', size=14, color='white', line=dict(color=cor, width=2)),
+                            error_y=dict(type='data', symmetric=False, array=[p90 - p50], arrayminus=[p50 - p10],
+                                         color='white', thickness=2, width=12),
+                            showlegend=False,
+                            hovertemplate=(
+                                f'<b>{cat}</b><br>Mediana: {decimal(p50, 1)}<br>'
+                                f'P25–P75: {decimal(p25, 1)} – {decimal(p75, 1)}<br>'
+                                f'P10–P90: {decimal(p10, 1)} – {decimal(p90, 1)}<br>'
+                                f"Participantes: {inteiro(ESTATISTICAS_ENEM[grupo]['participantes'])}<extra></extra>"
+                            )
+                        ))
+                        teto_eixo = max(teto_eixo, p90 + 40)
     
-    # Anotação da diferença
-    fig_enem.add_annotation(
-        x=0.5, y=420,
-        xref='paper',
-        text=f"<b>Diferença: {DADOS_DF['diferenca_enem']:.2f} pontos</b>".replace(".", ","),
-        showarrow=False,
-        font=dict(size=16, color=CORES['texto']),
-        bgcolor=CORES['vermelho'],
-        bordercolor=CORES['vermelho_claro'],
-        borderwidth=2,
-        borderpad=10
-    )
+                # Linha de referência - média nacional
+                fig_enem.add_hline(
+                    y=500,
+                    line_dash="dash",
+                    line_color=CORES['amarelo'],
+                    line_width=3,
+                    annotation_text="📌 Média Nacional (500 pts)",
+                    annotation_position="right",
+                    annotation_font=dict(color=CORES['amarelo'], size=13, family='Arial Black')
+                )
     
-    fig_enem.update_layout(**get_dark_layout(
-        title='🎯 Nota Média no ENEM por Condição de Saneamento',
-        height=500,
-        showlegend=False
-    ))
-    fig_enem.update_yaxes(title_text='Pontuação', range=[0, 600])
+                # Anotação da diferença
+                fig_enem.add_annotation(
+                    x=0.5, y=420,
+                    xref='paper',
+                    text=f"<b>Diferença: {decimal(DADOS_DF['diferenca_enem'])} pontos</b>",
+                    showarrow=False,
+                    font=dict(size=16, color=CORES['texto']),
+                    bgcolor=CORES['vermelho'],
+                    bordercolor=CORES['vermelho_claro'],
+                    borderwidth=2,
+                    borderpad=10
+                )
     
-    st.plotly_chart(fig_enem, use_container_width=True)
+                fig_enem.update_layout(**get_dark_layout(
+                    title='🎯 Nota Média no ENEM por Condição de Saneamento',
+                    height=500,
+                    showlegend=False
+                ))
+                fig_enem.update_yaxes(title_text='Pontuação', range=[0, teto_eixo])
+        
+                return fig_enem
     
-    st.markdown(f"""
-    <div class="box-info">
-        <strong>🎯 Impacto de ~80 pontos:</strong><br>
-        Uma diferença de aproximadamente 80 pontos no ENEM pode determinar:
-        <ul>
-            <li>Acesso ou não a cursos competitivos (Medicina, Direito, Engenharias)</li>
-            <li>Conseguir ou não bolsa integral no ProUni</li>
-            <li>Entrar ou ficar de fora de uma universidade federal</li>
-            <li>O rumo de toda uma vida profissional</li>
-        </ul>
-    </div>
-    """, unsafe_allow_html=True)
+            fig_enem = construir_fig_enem(IMPRESSOES['educacao'])
+    
+            st.plotly_chart(fig_enem, width='stretch')
+    
+            # Histogramas das notas por grupo, quando há a distribuição dos microdados
+            @cache_medido(st.cache_resource, show_spinner=False, max_entries=ENTRADAS_VERSOES)
+            def construir_fig_enem_distribuicao(impressao):
+                """Histogramas sobrepostos da nota média no ENEM, com e sem banheiro"""
+                fig_distribuicao = go.Figure()
+                grupos = [
+                    ('com_saneamento', 'Com Banheiro Adequado', CORES['cyan']),
+                    ('sem_saneamento', 'Sem Banheiro Adequado', CORES['rosa']),
+                ]
+                for grupo, nome, cor in grupos:
+                    if not ESTATISTICAS_ENEM[grupo]['participantes']:
+                        continue
+                    histograma = ESTATISTICAS_ENEM[grupo]['histograma']
+                    largura = histograma['inicio'][1] - histograma['inicio'][0]
+                    fig_distribuicao.add_trace(go.Bar(
+                        x=[inicio + largura / 2 for inicio in histograma['inicio']],
+                        y=[fracao * 100 for fracao in histograma['fracao']],
+                        width=largura,
+                        name=nome,
+                        marker=dict(color=cor, opacity=0.55),
+                        hovertemplate=f'<b>{nome}</b><br>Nota: %{{x:.0f}} ± {largura // 2}'
+                                      '<br>Participantes: %{y:.1f}%<extra></extra>'
+                    ))
+                    fig_distribuicao.add_vline(
+                        x=ESTATISTICAS_ENEM[grupo]['media'], line_dash='dash', line_color=cor, line_width=2
+                    )
+    
+                fig_distribuicao.update_layout(**get_dark_layout(
+                    title='📊 Distribuição das Notas no ENEM por Condição de Saneamento',
+                    height=400
+                ))
+                fig_distribuicao.update_layout(barmode='overlay')
+                fig_distribuicao.update_xaxes(title_text='Nota média (pontos)', range=[250, 850])
+                fig_distribuicao.update_yaxes(title_text='Participantes do grupo (%)', ticksuffix='%')
+    
+                return fig_distribuicao
+    
+            if ESTATISTICAS_ENEM is not None:
+                st.plotly_chart(construir_fig_enem_distribuicao(IMPRESSOES['educacao']), width='stretch')
+    
+            st.markdown(f"""
+            <div class="box-info">
+                <strong>🎯 Impacto de ~80 pontos:</strong><br>
+                Uma diferença de aproximadamente 80 pontos no ENEM pode determinar:
+                <ul>
+                    <li>Acesso ou não a cursos competitivos (Medicina, Direito, Engenharias)</li>
+                    <li>Conseguir ou não bolsa integral no ProUni</li>
+                    <li>Entrar ou ficar de fora de uma universidade federal</li>
+                    <li>O rumo de toda uma vida profissional</li>
+                </ul>
+            </div>
+            """, unsafe_allow_html=True)
+
+secao_educacao()
 
 # ============================================
 # 6. VISÃO INTEGRADA
 # ============================================
-st.markdown("---")
-st.markdown('<h2 class="secao-titulo">🔄 Visão Integrada: O Ciclo Completo</h2>', unsafe_allow_html=True)
-
-# Normalização dos dados para o gráfico radar (0-100%)
-renda_max = max(DADOS_DF['renda_com_saneamento'], DADOS_DF['renda_sem_saneamento'])
-renda_com = (DADOS_DF['renda_com_saneamento'] / renda_max) * 100
-renda_sem = (DADOS_DF['renda_sem_saneamento'] / renda_max) * 100
-
-escol_max = max(DADOS_DF['escolaridade_com'], DADOS_DF['escolaridade_sem'])
-escol_com = (DADOS_DF['escolaridade_com'] / escol_max) * 100
-escol_sem = (DADOS_DF['escolaridade_sem'] / escol_max) * 100
-
-enem_max = max(DADOS_DF['enem_com_banheiro'], DADOS_DF['enem_sem_banheiro'])
-enem_com = (DADOS_DF['enem_com_banheiro'] / enem_max) * 100
-enem_sem = (DADOS_DF['enem_sem_banheiro'] / enem_max) * 100
-
-# Gráfico Radar estilo escuro
-categorias = ['Saúde', 'Renda', 'Escolaridade', 'ENEM', 'Saúde']
-
-fig_radar = go.Figure()
-
-fig_radar.add_trace(go.Scatterpolar(
-    r=[100, renda_com, escol_com, enem_com, 100],
-    theta=categorias,
-    fill='toself',
-    fillcolor='rgba(77, 171, 247, 0.4)',
-    line=dict(color=CORES['azul'], width=3),
-    name='✅ Com Saneamento',
-    marker=dict(size=8, color=CORES['azul'])
-))
-
-fig_radar.add_trace(go.Scatterpolar(
-    r=[88, renda_sem, escol_sem, enem_sem, 88],
-    theta=categorias,
-    fill='toself',
-    fillcolor='rgba(255, 107, 107, 0.4)',
-    line=dict(color=CORES['vermelho'], width=3),
-    name='❌ Sem Saneamento',
-    marker=dict(size=8, color=CORES['vermelho'])
-))
-
-fig_radar.update_layout(
-    polar=dict(
-        radialaxis=dict(
-            visible=True,
-            range=[0, 100],
-            tickfont=dict(size=10, color=CORES['texto']),
-            gridcolor=CORES['grid'],
-            linecolor=CORES['grid']
-        ),
-        angularaxis=dict(
-            tickfont=dict(size=14, color=CORES['texto'], family='Arial Black'),
-            linecolor=CORES['grid'],
-            gridcolor=CORES['grid']
-        ),
-        bgcolor=CORES['bg_escuro']
-    ),
-    showlegend=True,
-    legend=dict(
-        orientation='h',
-        yanchor='bottom',
-        y=-0.15,
-        xanchor='center',
-        x=0.5,
-        font=dict(size=14, color=CORES['texto'])
-    ),
-    title=dict(
-        text='🔍 Comparativo Geral: Indicadores Normalizados (0-100%)',
-        font=dict(size=20, color=CORES['texto']),
-        x=0.5
-    ),
-    paper_bgcolor=CORES['bg_escuro'],
-    height=550,
-    margin=dict(t=80, b=100)
-)
-
-st.plotly_chart(fig_radar, use_container_width=True)
-
-# Ciclos
-col1, col2 = st.columns(2)
-
-with col1:
-    st.markdown("""
-    <div class="ciclo-vicioso">
-        <h3 style="text-align: center; margin-bottom: 1rem;">🔻 Ciclo Vicioso</h3>
-        <div class="ciclo-item">1. ❌ Falta de saneamento básico</div>
-        <div class="ciclo-item">2. 🦠 Aumento de doenças</div>
-        <div class="ciclo-item">3. 🏥 Mais internações e gastos</div>
-        <div class="ciclo-item">4. 📉 Faltas na escola e trabalho</div>
-        <div class="ciclo-item">5. 📚 Menor escolaridade</div>
-        <div class="ciclo-item">6. 💸 Menor renda</div>
-        <div class="ciclo-item" style="border-bottom: none;">7. 🔄 Permanece sem saneamento</div>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col2:
-    st.markdown("""
-    <div class="ciclo-virtuoso">
-        <h3 style="text-align: center; margin-bottom: 1rem;">🔺 Ciclo Virtuoso</h3>
-        <div class="ciclo-item">1. ✅ Acesso a saneamento básico</div>
-        <div class="ciclo-item">2. 💪 Redução de doenças</div>
-        <div class="ciclo-item">3. 💰 Economia com saúde</div>
-        <div class="ciclo-item">4. 📈 Mais frequência escolar</div>
-        <div class="ciclo-item">5. 🎓 Maior escolaridade</div>
-        <div class="ciclo-item">6. 💵 Maior renda</div>
-        <div class="ciclo-item" style="border-bottom: none;">7. 🏠 Melhores condições de vida</div>
-    </div>
-    """, unsafe_allow_html=True)
+@fragmento_medido(st.fragment, 'Visão Integrada')
+def secao_visao_integrada():
+    """Visão integrada: radar normalizado e ciclos"""
+    st.markdown("---")
+    st.markdown('<h2 class="secao-titulo">🔄 Visão Integrada: O Ciclo Completo</h2>', unsafe_allow_html=True)
+
+    # No modo lazy, o conteúdo só é construído quando o usuário abre a seção
+    conteudo = conteudo_sob_demanda('🔄 Ver radar e ciclos', 'abrir_visao_integrada')
+    if conteudo is None:
+        return
+
+    with conteudo:
+        # Matriz indicadores × grupos do radar (linhas na ordem dos eixos). Saúde entra
+        # como índice do painel (100 = com saneamento), normalizado como os demais
+        INDICADORES_RADAR = {
+            'Saúde': (100, 88),
+            'Renda': (DADOS_DF['renda_com_saneamento'], DADOS_DF['renda_sem_saneamento']),
+            'Escolaridade': (DADOS_DF['escolaridade_com'], DADOS_DF['escolaridade_sem']),
+            'ENEM': (DADOS_DF['enem_com_banheiro'], DADOS_DF['enem_sem_banheiro']),
+        }
+        # Colunas da matriz: rótulo, cor da linha e preenchimento
+        GRUPOS_RADAR = (
+            ('✅ Com Saneamento', CORES['azul'], 'rgba(77, 171, 247, 0.4)'),
+            ('❌ Sem Saneamento', CORES['vermelho'], 'rgba(255, 107, 107, 0.4)'),
+        )
+        # Rótulo exibido → método de saneamento.radar (o grupo de referência é o primeiro)
+        NORMALIZACOES_RADAR = {
+            '% do maior': 'maximo',
+            'Mín-máx': 'minmax',
+            'Z-score': 'zscore',
+            '% de com saneamento': 'referencia',
+        }
+        TITULOS_RADAR = {
+            'maximo': 'Indicadores Normalizados (0-100%)',
+            'minmax': 'Indicadores Normalizados Mín-Máx (0-100)',
+            'zscore': 'Indicadores em Desvios Padrão (z-score)',
+            'referencia': 'Indicadores em % do Grupo com Saneamento',
+        }
+
+        @cache_medido(st.cache_resource, show_spinner=False, max_entries=ENTRADAS_VERSOES * len(METODOS))
+        def construir_fig_radar(impressao, metodo='maximo'):
+            """Gráfico radar com os indicadores normalizados de uma vez (indicadores × grupos)"""
+            categorias = list(INDICADORES_RADAR)
+            valores = normalizar(np.array(list(INDICADORES_RADAR.values()), dtype=np.float64),
+                                 metodo=metodo, referencia=0)
+            # Fecha o polígono repetindo o primeiro eixo
+            categorias.append(categorias[0])
+            valores = np.vstack([valores, valores[:1]])
+
+            # Gráfico Radar estilo escuro
+            fig_radar = go.Figure()
+
+            for coluna, (nome, cor, preenchimento) in enumerate(GRUPOS_RADAR):
+                fig_radar.add_trace(go.Scatterpolar(
+                    r=valores[:, coluna].tolist(),
+                    theta=categorias,
+                    fill='toself',
+                    fillcolor=preenchimento,
+                    line=dict(color=cor, width=3),
+                    name=nome,
+                    marker=dict(size=8, color=cor)
+                ))
+
+            fig_radar.update_layout(
+                polar=dict(
+                    radialaxis=dict(
+                        visible=True,
+                        range=faixa_radial(valores, metodo),
+                        tickfont=dict(size=10, color=CORES['texto']),
+                        gridcolor=CORES['grid'],
+                        linecolor=CORES['grid']
+                    ),
+                    angularaxis=dict(
+                        tickfont=dict(size=14, color=CORES['texto'], family='Arial Black'),
+                        linecolor=CORES['grid'],
+                        gridcolor=CORES['grid']
+                    ),
+                    bgcolor=CORES['bg_escuro']
+                ),
+                showlegend=True,
+                legend=dict(
+                    orientation='h',
+                    yanchor='bottom',
+                    y=-0.15,
+                    xanchor='center',
+                    x=0.5,
+                    font=dict(size=14, color=CORES['texto'])
+                ),
+                title=dict(
+                    text=f'🔍 Comparativo Geral: {TITULOS_RADAR[metodo]}',
+                    font=dict(size=20, color=CORES['texto']),
+                    x=0.5
+                ),
+                paper_bgcolor=CORES['bg_escuro'],
+                height=550,
+                margin=dict(t=80, b=100)
+            )
+    
+            return fig_radar
+
+        normalizacao = st.radio("Normalização do radar", list(NORMALIZACOES_RADAR), horizontal=True,
+                                label_visibility="collapsed")
+        fig_radar = construir_fig_radar(obter_impressao_dados(ANO, ('renda', *FONTES_EDUCACAO)),
+                                        NORMALIZACOES_RADAR[normalizacao])
+
+        st.plotly_chart(fig_radar, width='stretch')
+
+        # Ciclos
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("""
+            <div class="ciclo-vicioso">
+                <h3 style="text-align: center; margin-bottom: 1rem;">🔻 Ciclo Vicioso</h3>
+                <div class="ciclo-item">1. ❌ Falta de saneamento básico</div>
+                <div class="ciclo-item">2. 🦠 Aumento de doenças</div>
+                <div class="ciclo-item">3. 🏥 Mais internações e gastos</div>
+                <div class="ciclo-item">4. 📉 Faltas na escola e trabalho</div>
+                <div class="ciclo-item">5. 📚 Menor escolaridade</div>
+                <div class="ciclo-item">6. 💸 Menor renda</div>
+                <div class="ciclo-item" style="border-bottom: none;">7. 🔄 Permanece sem saneamento</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with col2:
+            st.markdown("""
+            <div class="ciclo-virtuoso">
+                <h3 style="text-align: center; margin-bottom: 1rem;">🔺 Ciclo Virtuoso</h3>
+                <div class="ciclo-item">1. ✅ Acesso a saneamento básico</div>
+                <div class="ciclo-item">2. 💪 Redução de doenças</div>
+                <div class="ciclo-item">3. 💰 Economia com saúde</div>
+                <div class="ciclo-item">4. 📈 Mais frequência escolar</div>
+                <div class="ciclo-item">5. 🎓 Maior escolaridade</div>
+                <div class="ciclo-item">6. 💵 Maior renda</div>
+                <div class="ciclo-item" style="border-bottom: none;">7. 🏠 Melhores condições de vida</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+secao_visao_integrada()
 
 # ============================================
 # 7. CONCLUSÕES
 # ============================================
-st.markdown("---")
-st.markdown('<h2 class="secao-titulo">💡 Conclusões e Recomendações</h2>', unsafe_allow_html=True)
-
-st.markdown("### Síntese dos Achados")
-
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    st.markdown(f"""
-    <div class="card-conclusao borda-saude">
-        <h4>🏥 Saúde</h4>
-        <p><b>{DADOS_DF['internacoes_total']:,}</b> internações e <b>{DADOS_DF['obitos']}</b> óbitos 
-        poderiam ter sido evitados com saneamento adequado, gerando economia de 
-        <b>R$ {DADOS_DF['custo_internacoes']:,.2f}</b> ao sistema de saúde.</p>
-    </div>
-    """.replace(",", "X").replace(".", ",").replace("X", "."), unsafe_allow_html=True)
-
-with col2:
-    st.markdown(f"""
-    <div class="card-conclusao borda-renda">
-        <h4>💰 Renda</h4>
-        <p>A diferença mensal de <b>R$ {DADOS_DF['diferenca_renda']:,.2f}</b> 
-        representa mais de <b>R$ 13.000/ano</b> que deixam de circular na economia local, 
-        perpetuando o ciclo de pobreza.</p>
-    </div>
-    """.replace(",", "X").replace(".", ",").replace("X", "."), unsafe_allow_html=True)
-
-with col3:
-    st.markdown(f"""
-    <div class="card-conclusao borda-educacao">
-        <h4>🎓 Educação</h4>
-        <p>O gap de <b>{DADOS_DF['diferenca_escolaridade']:.2f}</b> anos de estudo e 
-        <b>{DADOS_DF['diferenca_enem']:.2f}</b> pontos no ENEM compromete 
-        o futuro de milhares de jovens do DF.</p>
-    </div>
-    """.replace(".", ","), unsafe_allow_html=True)
-
-st.markdown("### Recomendações")
-
-col1, col2 = st.columns(2)
-
-with col1:
-    st.markdown("""
-    <div class="box-info">
-        <h4>📅 Curto Prazo (1-2 anos)</h4>
-        <ul>
-            <li>Mapear áreas prioritárias sem cobertura</li>
-            <li>Implementar soluções emergenciais de tratamento de água</li>
-            <li>Intensificar campanhas de educação sanitária</li>
-            <li>Aumentar fiscalização de ligações clandestinas</li>
-            <li>Criar programa de subsídio para famílias de baixa renda</li>
-        </ul>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col2:
-    st.markdown("""
-    <div class="box-info">
-        <h4>📅 Longo Prazo (3-10 anos)</h4>
-        <ul>
-            <li>Universalização do acesso à água tratada</li>
-            <li>Expansão da rede de coleta e tratamento de esgoto</li>
-            <li>Integração das políticas de saneamento, saúde e educação</li>
-            <li>Investimento em tecnologias sustentáveis</li>
-            <li>Monitoramento contínuo de indicadores</li>
-        </ul>
-    </div>
-    """, unsafe_allow_html=True)
+@fragmento_medido(st.fragment, 'Conclusões')
+def secao_conclusoes():
+    """Conclusões e recomendações"""
+    st.markdown("---")
+    st.markdown('<h2 class="secao-titulo">💡 Conclusões e Recomendações</h2>', unsafe_allow_html=True)
+
+    # No modo lazy, o conteúdo só é construído quando o usuário abre a seção
+    conteudo = conteudo_sob_demanda('💡 Ver conclusões e recomendações', 'abrir_conclusoes')
+    if conteudo is None:
+        return
+
+    with conteudo:
+        st.markdown("### Síntese dos Achados")
+
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.markdown(f"""
+            <div class="card-conclusao borda-saude">
+                <h4>🏥 Saúde</h4>
+                <p><b>{inteiro(DADOS_DF['internacoes_total'])}</b> internações e <b>{inteiro(DADOS_DF['obitos'])}</b> óbitos 
+                poderiam ter sido evitados com saneamento adequado, gerando economia de 
+                <b>{moeda(DADOS_DF['custo_internacoes'])}</b> ao sistema de saúde.</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with col2:
+            st.markdown(f"""
+            <div class="card-conclusao borda-renda">
+                <h4>💰 Renda</h4>
+                <p>A diferença mensal de <b>{moeda(DADOS_DF['diferenca_renda'])}</b> 
+                representa <b>{moeda(DADOS_DF['diferenca_renda'] * 12, casas=0)}/ano</b> que deixam de circular na economia local, 
+                perpetuando o ciclo de pobreza.</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with col3:
+            st.markdown(f"""
+            <div class="card-conclusao borda-educacao">
+                <h4>🎓 Educação</h4>
+                <p>O gap de <b>{decimal(DADOS_DF['diferenca_escolaridade'])}</b> anos de estudo e 
+                <b>{decimal(DADOS_DF['diferenca_enem'])}</b> pontos no ENEM compromete 
+                o futuro de milhares de jovens do DF.</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+        st.markdown("### Recomendações")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("""
+            <div class="box-info">
+                <h4>📅 Curto Prazo (1-2 anos)</h4>
+                <ul>
+                    <li>Mapear áreas prioritárias sem cobertura</li>
+                    <li>Implementar soluções emergenciais de tratamento de água</li>
+                    <li>Intensificar campanhas de educação sanitária</li>
+                    <li>Aumentar fiscalização de ligações clandestinas</li>
+                    <li>Criar programa de subsídio para famílias de baixa renda</li>
+                </ul>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with col2:
+            st.markdown("""
+            <div class="box-info">
+                <h4>📅 Longo Prazo (3-10 anos)</h4>
+                <ul>
+                    <li>Universalização do acesso à água tratada</li>
+                    <li>Expansão da rede de coleta e tratamento de esgoto</li>
+                    <li>Integração das políticas de saneamento, saúde e educação</li>
+                    <li>Investimento em tecnologias sustentáveis</li>
+                    <li>Monitoramento contínuo de indicadores</li>
+                </ul>
+            </div>
+            """, unsafe_allow_html=True)
+
+        st.markdown("""
+        <div class="box-alerta">
+            <h4>⚠️ A Urgência da Ação</h4>
+            <p>Cada dia sem ação representa mais vidas impactadas, mais recursos desperdiçados e mais 
+            oportunidades perdidas. O saneamento básico não é apenas uma questão de infraestrutura — 
+            é uma questão de <b>direitos humanos</b>, <b>justiça social</b> e <b>desenvolvimento sustentável</b>.</p>
+            <p style="text-align: center; font-size: 1.2rem; margin-top: 1rem;">
+                <b>"Saneamento para todos não é um sonho, é uma necessidade urgente."</b>
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
 
-st.markdown("""
-<div class="box-alerta">
-    <h4>⚠️ A Urgência da Ação</h4>
-    <p>Cada dia sem ação representa mais vidas impactadas, mais recursos desperdiçados e mais 
-    oportunidades perdidas. O saneamento básico não é apenas uma questão de infraestrutura — 
-    é uma questão de <b>direitos humanos</b>, <b>justiça social</b> e <b>desenvolvimento sustentável</b>.</p>
-    <p style="text-align: center; font-size: 1.2rem; margin-top: 1rem;">
-        <b>"Saneamento para todos não é um sonho, é uma necessidade urgente."</b>
-    </p>
-</div>
-""", unsafe_allow_html=True)
+secao_conclusoes()
 
 # ============================================
 # 8. RODAPÉ
 # ============================================
+MEDIDOR.marco('Rodapé')
 st.markdown("---")
-st.markdown("""
+st.markdown(f"""
 <div class="rodape">
     <h4>📚 Fontes de Dados</h4>
     <p>
-        <b>DATASUS</b> - Sistema de Informações Hospitalares (SIH/SUS) - 2023<br>
-        <b>IBGE</b> - Pesquisa Nacional por Amostra de Domicílios (PNAD) - 2023<br>
-        <b>INEP</b> - Microdados do ENEM - 2023<br>
-        <b>SINISA</b> - Sistema Nacional de Informações sobre Saneamento - 2023
+        <b>DATASUS</b> - Sistema de Informações Hospitalares (SIH/SUS) - {ANO}<br>
+        <b>IBGE</b> - Pesquisa Nacional por Amostra de Domicílios (PNAD) - {ANO}<br>
+        <b>INEP</b> - Microdados do ENEM - {ANO}<br>
+        <b>SINISA</b> - Sistema Nacional de Informações sobre Saneamento - {ANO}
     </p>
     <p style="margin-top: 1rem;">
         🔗 <a href="https://www.painelsaneamento.org.br/" target="_blank">Painel Saneamento Brasil</a>
@@ -1162,7 +1596,22 @@ st.markdown("""
     </div>
     <p style="color: #666; font-size: 0.9rem; margin-top: 1rem;">
         💧 Dashboard desenvolvido para análise da disparidade socioeconômica causada pela falta de saneamento básico no Distrito Federal<br>
-        🗓️ Dados referentes ao ano de 2023 | Última atualização: Dezembro/2024
+        🗓️ Dados referentes ao ano de {ANO} | Última atualização: Dezembro/2024
     </p>
 </div>
 """, unsafe_allow_html=True)
+
+# ============================================
+# PAINEL DE DESEMPENHO (OCULTO)
+# ============================================
+MEDIDOR.concluir()
+
+if MODO_DEBUG:
+    with st.expander("⏱️ Desempenho deste rerun", expanded=True):
+        st.dataframe(pd.DataFrame(tabela_secoes(MEDIDOR.registros)), hide_index=True)
+        if MEDIDOR.registros and 'pico_kb' in MEDIDOR.registros[0]:
+            st.caption("Alocação e pico medidos no processo inteiro: incluem as outras sessões simultâneas")
+        st.caption("Memória das partições carregadas (antes e depois da compactação de tipos)")
+        st.dataframe(pd.DataFrame(relatorio_memoria({fonte: carregar_fonte(fonte, ANO) for fonte in FONTES})),
+                     hide_index=True)
+        st.json(MEDIDOR.resumo(), expanded=False)
@@ -0,0 +1 @@
+"""Módulos de apoio do Dashboard Saneamento (carga, cache e processamento dos dados)"""
@@ -0,0 +1,205 @@
+"""
+Motor de consulta embutido para agregações filtradas sobre as partições carregadas.
+
+Roda no próprio processo, sem serviço externo. O motor padrão é o DuckDB, uma
+dependência opcional (`pip install -r requirements-duckdb.txt`), que consulta os
+DataFrames no lugar, sem cópia. Sem ele, o padrão é o SQLite da biblioteca
+padrão, que copia a partição para o banco em memória uma vez por versão e
+indexa a coluna-chave. O pandas (`MotorConsulta('pandas')`, máscaras
+vetorizadas e `groupby` sobre o DataFrame registrado) fica como alternativa sem
+cópia nem índice. Só o resultado agregado, em geral poucas linhas, volta como
+DataFrame.
+
+Filtros aceitos em `agregar`: valor único (`=`), lista/tupla/conjunto (`IN`) e
+`Faixa(minimo, maximo)` (limites inclusivos; `None` deixa o lado aberto).
+"""
+
+import importlib.util
+import sqlite3
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# Motores disponíveis: o DuckDB quando instalado (requirements-duckdb.txt); senão o SQLite indexado
+MOTORES = ('duckdb', 'pandas', 'sqlite')
+DUCKDB_DISPONIVEL = importlib.util.find_spec('duckdb') is not None
+MOTOR_PADRAO = 'duckdb' if DUCKDB_DISPONIVEL else 'sqlite'
+
+# Funções de agregação: nome -> SQL (`contagem` aceita coluna None para COUNT(*))
+FUNCOES = {
+    'soma': 'SUM',
+    'media': 'AVG',
+    'minimo': 'MIN',
+    'maximo': 'MAX',
+    'contagem': 'COUNT',
+}
+
+# As mesmas funções no pandas (`soma` sem linhas dá NaN, como o NULL do SQL)
+FUNCOES_PANDAS = {
+    'soma': lambda serie: serie.sum(min_count=1),
+    'media': 'mean',
+    'minimo': 'min',
+    'maximo': 'max',
+    'contagem': 'count',
+}
+
+Faixa = namedtuple('Faixa', 'minimo maximo', defaults=(None, None))
+
+
+def _identificador(nome):
+    """Nome de tabela ou coluna entre aspas duplas (aspas internas duplicadas)"""
+    return '"' + str(nome).replace('"', '""') + '"'
+
+
+class MotorConsulta:
+    """
+    Tabelas registradas e agregações com os filtros aplicados dentro do motor.
+
+    Uma instância pode ser compartilhada entre sessões: as consultas SQL são
+    serializadas por uma trava; no pandas as tabelas são só lidas, sem trava.
+    """
+
+    def __init__(self, motor=None):
+        self.motor = motor or MOTOR_PADRAO
+        if self.motor == 'duckdb':
+            import duckdb
+            self._conexao = duckdb.connect(':memory:')
+        elif self.motor == 'sqlite':
+            self._conexao = sqlite3.connect(':memory:', check_same_thread=False)
+        elif self.motor == 'pandas':
+            self._conexao = None
+        else:
+            raise ValueError(f"Motor de consulta desconhecido: '{self.motor}' (use {', '.join(MOTORES)})")
+        self._colunas = {}
+        self._tabelas = {}
+        self._trava = threading.Lock()
+
+    def registrar(self, tabela, df, indices=()):
+        """Registra `df` como `tabela` (somente leitura); no SQLite, cria índices nas colunas de `indices`"""
+        with self._trava:
+            if self.motor == 'duckdb':
+                self._conexao.register(tabela, df)
+            elif self.motor == 'pandas':
+                self._tabelas[tabela] = df
+            else:
+                df.to_sql(tabela, self._conexao, index=False, if_exists='replace')
+                for coluna in indices:
+                    self._conexao.execute(
+                        f'CREATE INDEX {_identificador(f"ix_{tabela}_{coluna}")} '
+                        f'ON {_identificador(tabela)} ({_identificador(coluna)})'
+                    )
+            self._colunas[tabela] = set(df.columns)
+
+    def tabelas(self):
+        """Nomes das tabelas registradas"""
+        return sorted(self._colunas)
+
+    def agregar(self, tabela, medidas, por=(), filtros=None):
+        """
+        Agrega `tabela` agrupando por `por`, só sobre as linhas que passam nos `filtros`.
+
+        `medidas` mapeia o nome da coluna de saída para `(funcao, coluna)`, com
+        `funcao` em `FUNCOES`. Retorna um DataFrame com as colunas de `por`
+        seguidas das medidas, ordenado pelas colunas de `por`.
+        """
+        colunas = self._colunas.get(tabela)
+        if colunas is None:
+            raise KeyError(f"Tabela '{tabela}' não registrada no motor de consulta")
+        filtros = filtros or {}
+        desconhecidas = [c for c in (*por, *filtros, *(c for _, c in medidas.values() if c is not None))
+                         if c not in colunas]
+        if desconhecidas:
+            raise KeyError(f"Colunas inexistentes em '{tabela}': {', '.join(map(str, desconhecidas))}")
+        invalidas = [funcao for funcao, _ in medidas.values() if funcao not in FUNCOES]
+        if invalidas:
+            raise ValueError(f"Função de agregação desconhecida: '{invalidas[0]}'")
+        if self.motor == 'pandas':
+            return _agregar_pandas(self._tabelas[tabela], medidas, por, filtros)
+
+        selecao = [_identificador(coluna) for coluna in por]
+        for nome, (funcao, coluna) in medidas.items():
+            argumento = '*' if coluna is None else _identificador(coluna)
+            selecao.append(f'{FUNCOES[funcao]}({argumento}) AS {_identificador(nome)}')
+
+        condicoes, parametros = [], []
+        for coluna, valor in filtros.items():
+            coluna_sql = _identificador(coluna)
+            if isinstance(valor, Faixa):
+                if valor.minimo is not None:
+                    condicoes.append(f'{coluna_sql} >= ?')
+                    parametros.append(valor.minimo)
+                if valor.maximo is not None:
+                    condicoes.append(f'{coluna_sql} <= ?')
+                    parametros.append(valor.maximo)
+            elif isinstance(valor, (list, tuple, set, frozenset)):
+                valores = list(valor)
+                if not valores:
+                    condicoes.append('FALSE')
+                    continue
+                condicoes.append(f"{coluna_sql} IN ({', '.join('?' * len(valores))})")
+                parametros.extend(valores)
+            else:
+                condicoes.append(f'{coluna_sql} = ?')
+                parametros.append(valor)
+
+        sql = f'SELECT {", ".join(selecao)} FROM {_identificador(tabela)}'
+        if condicoes:
+            sql += ' WHERE ' + ' AND '.join(condicoes)
+        if por:
+            agrupamento = ', '.join(_identificador(coluna) for coluna in por)
+            sql += f' GROUP BY {agrupamento} ORDER BY {agrupamento}'
+        return self._executar(sql, [_valor_python(p) for p in parametros])
+
+    def _executar(self, sql, parametros):
+        with self._trava:
+            if self.motor == 'duckdb':
+                return self._conexao.execute(sql, parametros).df()
+            return pd.read_sql_query(sql, self._conexao, params=parametros)
+
+    def fechar(self):
+        """Fecha a conexão (as tabelas em memória são descartadas)"""
+        with self._trava:
+            self._tabelas.clear()
+            if self._conexao is not None:
+                self._conexao.close()
+
+
+def _agregar_pandas(df, medidas, por, filtros):
+    """`MotorConsulta.agregar` no pandas: filtros como máscaras vetorizadas e agrupamento com `groupby`"""
+    mascara = np.ones(len(df), dtype=bool)
+    for coluna, valor in filtros.items():
+        serie = df[coluna]
+        if isinstance(valor, Faixa):
+            if valor.minimo is not None:
+                mascara &= (serie >= valor.minimo).to_numpy()
+            if valor.maximo is not None:
+                mascara &= (serie <= valor.maximo).to_numpy()
+        elif isinstance(valor, (list, tuple, set, frozenset)):
+            mascara &= serie.isin(list(valor)).to_numpy()
+        else:
+            mascara &= (serie == valor).to_numpy()
+    linhas = df if mascara.all() else df[mascara]
+
+    if not por:
+        return pd.DataFrame({
+            nome: [len(linhas) if coluna is None else linhas[coluna].agg(FUNCOES_PANDAS[funcao])]
+            for nome, (funcao, coluna) in medidas.items()
+        })
+
+    agregacoes = {
+        nome: (por[0], 'size') if coluna is None else (coluna, FUNCOES_PANDAS[funcao])
+        for nome, (funcao, coluna) in medidas.items()
+    }
+    resultado = linhas.groupby(list(por), observed=True, sort=True).agg(**agregacoes).reset_index()
+    # Chaves categóricas (tipos compactos) voltam como os valores, como no SQL
+    for coluna in por:
+        if isinstance(resultado[coluna].dtype, pd.CategoricalDtype):
+            resultado[coluna] = resultado[coluna].astype(resultado[coluna].cat.categories.dtype)
+    return resultado
+
+
+def _valor_python(valor):
+    """Escalares numpy como tipos nativos (o SQLite não aceita np.int64 como parâmetro)"""
+    return valor.item() if hasattr(valor, 'item') else valor
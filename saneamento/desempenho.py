@@ -0,0 +1,225 @@
+"""Instrumentação de tempo, alocações e cache por seção de um rerun do dashboard"""
+
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Arquivo JSON Lines onde cada rerun é registrado (desligado se vazio)
+ARQUIVO_LOG = os.environ.get('SANEAMENTO_LOG_DESEMPENHO', '')
+
+# Medição de alocações (tracemalloc), só habilitável no servidor: o rastreamento vale
+# para o processo inteiro e deixa mais lentas todas as sessões enquanto está ligado
+ALOCACOES_HABILITADAS = os.environ.get('SANEAMENTO_MEDIR_ALOCACOES', '0') == '1'
+
+# Medidores com alocações em andamento; o tracemalloc fica ligado só enquanto houver algum
+_trava_alocacoes = threading.Lock()
+_medidores_alocacoes = 0
+_iniciado_aqui = False
+
+# Cada sessão do Streamlit roda o script em sua própria thread
+_estado = threading.local()
+
+
+class Medidor:
+    """
+    Registra o tempo de parede, as alocações e os acertos de cache de cada seção.
+
+    As seções são marcadas em sequência com `marco(nome)` (cada marco fecha o
+    anterior) ou delimitadas com `with medidor.secao(nome)`. Alocações usam
+    tracemalloc e só são medidas com `alocacoes=True` e `ALOCACOES_HABILITADAS`,
+    pois têm custo. O tracemalloc é global: alocações e picos são do processo
+    inteiro (incluem outras sessões simultâneas), não só desta seção.
+    """
+
+    def __init__(self, alocacoes=False):
+        self.alocacoes = alocacoes and ALOCACOES_HABILITADAS
+        self.registros = []
+        self._aberta = None
+        self.concluido = False
+        self._inicio_rerun = time.perf_counter()
+        # Um rerun interrompido (ex.: st.rerun) não chega a concluir: libera as alocações dele
+        anterior = medidor_atual()
+        if anterior is not None and not anterior.concluido:
+            anterior._liberar_alocacoes()
+        self._rastreando = self.alocacoes
+        if self._rastreando:
+            _ligar_alocacoes()
+        _estado.medidor = self
+
+    def _liberar_alocacoes(self):
+        if self._rastreando:
+            self._rastreando = False
+            _desligar_alocacoes()
+
+    def _abrir(self, nome):
+        registro = {'secao': nome, 'cache': []}
+        if self._rastreando:
+            tracemalloc.reset_peak()
+            registro['_memoria_inicial'] = tracemalloc.get_traced_memory()[0]
+        registro['_inicio'] = time.perf_counter()
+        return registro
+
+    def _fechar(self, registro):
+        registro['tempo_ms'] = round((time.perf_counter() - registro.pop('_inicio')) * 1000, 3)
+        if self._rastreando and '_memoria_inicial' in registro:
+            atual, pico = tracemalloc.get_traced_memory()
+            inicial = registro.pop('_memoria_inicial')
+            registro['alocado_kb'] = round((atual - inicial) / 1024, 1)
+            registro['pico_kb'] = round((pico - inicial) / 1024, 1)
+        self.registros.append(registro)
+
+    def marco(self, nome):
+        """Fecha a seção aberta (se houver) e inicia a seção `nome`"""
+        if self._aberta is not None:
+            self._fechar(self._aberta)
+        self._aberta = self._abrir(nome)
+
+    @contextmanager
+    def secao(self, nome):
+        """Mede o bloco como uma seção própria"""
+        anterior, self._aberta = self._aberta, self._abrir(nome)
+        try:
+            yield
+        finally:
+            self._fechar(self._aberta)
+            self._aberta = anterior
+
+    def registrar_cache(self, nome, miss, tempo_ms):
+        """Anota uma chamada de função cacheada na seção aberta"""
+        if self._aberta is not None:
+            self._aberta['cache'].append({'funcao': nome, 'miss': miss, 'tempo_ms': round(tempo_ms, 3)})
+
+    def concluir(self):
+        """Fecha a última seção e grava o rerun no log JSON Lines, se configurado"""
+        if self._aberta is not None:
+            self._fechar(self._aberta)
+            self._aberta = None
+        self._liberar_alocacoes()
+        self.concluido = True
+        if ARQUIVO_LOG:
+            self.gravar_jsonl(ARQUIVO_LOG)
+        return self.registros
+
+    def resumo(self):
+        """Registro do rerun completo, no formato gravado em JSON Lines"""
+        return {
+            'timestamp': time.time(),
+            'total_ms': round((time.perf_counter() - self._inicio_rerun) * 1000, 3),
+            'secoes': self.registros,
+        }
+
+    def gravar_jsonl(self, caminho):
+        """Acrescenta o resumo do rerun como uma linha JSON"""
+        linha = json.dumps(self.resumo(), ensure_ascii=False, default=str)
+        with open(caminho, 'a', encoding='utf-8') as arquivo:
+            arquivo.write(linha + '\n')
+
+
+def _ligar_alocacoes():
+    """Liga o tracemalloc para mais um Medidor (só o primeiro o inicia, se ainda estiver desligado)"""
+    global _medidores_alocacoes, _iniciado_aqui
+    with _trava_alocacoes:
+        if _medidores_alocacoes == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _iniciado_aqui = True
+        _medidores_alocacoes += 1
+
+
+def _desligar_alocacoes():
+    """Libera o tracemalloc de um Medidor; o último para o rastreamento, se foi ele que o iniciou"""
+    global _medidores_alocacoes, _iniciado_aqui
+    with _trava_alocacoes:
+        _medidores_alocacoes -= 1
+        if _medidores_alocacoes == 0 and _iniciado_aqui:
+            tracemalloc.stop()
+            _iniciado_aqui = False
+
+
+def medidor_atual():
+    """Medidor do rerun em execução nesta thread (ou None)"""
+    return getattr(_estado, 'medidor', None)
+
+
+def cache_medido(decorador_cache, **opcoes):
+    """
+    Aplica um decorador de cache do Streamlit registrando acerto/miss e tempo de cada chamada.
+
+    Uso: `@cache_medido(st.cache_resource, show_spinner=False)`.
+    """
+    def decorar(funcao):
+        @functools.wraps(funcao)
+        def corpo(*args, **kwargs):
+            # Só executa quando o cache não tem o valor: marca miss na chamada corrente
+            _estado.pilha_miss[-1] = True
+            return funcao(*args, **kwargs)
+
+        cacheada = decorador_cache(**opcoes)(corpo)
+
+        @functools.wraps(funcao)
+        def chamada(*args, **kwargs):
+            if not hasattr(_estado, 'pilha_miss'):
+                _estado.pilha_miss = []
+            _estado.pilha_miss.append(False)
+            inicio = time.perf_counter()
+            try:
+                return cacheada(*args, **kwargs)
+            finally:
+                miss = _estado.pilha_miss.pop()
+                medidor = medidor_atual()
+                if medidor is not None:
+                    medidor.registrar_cache(funcao.__name__, miss, (time.perf_counter() - inicio) * 1000)
+
+        chamada.clear = cacheada.clear
+        return chamada
+
+    return decorar
+
+
+def fragmento_medido(decorador_fragmento, nome):
+    """
+    Aplica `st.fragment` a uma seção do dashboard, marcando-a como seção do Medidor.
+
+    No rerun completo a seção entra como um marco do Medidor do rerun. Num rerun
+    parcial (só o fragmento) esse Medidor já foi concluído: a seção é medida num
+    Medidor próprio, registrado como um rerun à parte.
+
+    Uso: `@fragmento_medido(st.fragment, 'Saúde')`.
+    """
+    def decorar(funcao):
+        @functools.wraps(funcao)
+        def secao(*args, **kwargs):
+            medidor = medidor_atual()
+            if medidor is not None and not medidor.concluido:
+                medidor.marco(nome)
+                return funcao(*args, **kwargs)
+
+            parcial = Medidor(alocacoes=getattr(medidor, 'alocacoes', False))
+            parcial.marco(nome)
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                parcial.concluir()
+
+        return decorador_fragmento(secao)
+
+    return decorar
+
+
+def tabela_secoes(registros):
+    """Resume os registros em uma linha por seção (tempo, memória e acertos de cache)"""
+    linhas = []
+    for registro in registros:
+        misses = sum(1 for chamada in registro['cache'] if chamada['miss'])
+        linhas.append({
+            'seção': registro['secao'],
+            'tempo (ms)': registro['tempo_ms'],
+            'alocado no processo (KB)': registro.get('alocado_kb'),
+            'pico do processo (KB)': registro.get('pico_kb'),
+            'cache hit': len(registro['cache']) - misses,
+            'cache miss': misses,
+        })
+    return linhas
@@ -0,0 +1,131 @@
+"""
+Agregação dos microdados do ENEM (INEP) por condição de saneamento do domicílio.
+
+Usa a pergunta Q008 do questionário socioeconômico ("Na sua residência tem
+banheiro?"): a resposta A (não) marca o participante como sem saneamento. A
+nota é a média das quatro provas objetivas e da redação, só para quem tem as
+cinco notas.
+
+Cada bloco vira, por grupo, o número de participantes e a soma das notas em
+classes de `LARGURA_CLASSE` ponto: somas que se juntam entre blocos e processos
+numa única passada. Delas saem a média exata, os quantis (interpolados dentro
+da classe, erro menor que a largura) e os histogramas.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Colunas lidas do arquivo de microdados do ENEM e seus tipos
+COLUNAS_ENEM = {
+    'SG_UF_PROVA': 'category',
+    'NU_NOTA_CN': 'float64',
+    'NU_NOTA_CH': 'float64',
+    'NU_NOTA_LC': 'float64',
+    'NU_NOTA_MT': 'float64',
+    'NU_NOTA_REDACAO': 'float64',
+    'Q008': 'category',
+}
+
+COLUNAS_NOTAS = ['NU_NOTA_CN', 'NU_NOTA_CH', 'NU_NOTA_LC', 'NU_NOTA_MT', 'NU_NOTA_REDACAO']
+
+# Respostas da Q008 que indicam domicílio sem banheiro
+RESPOSTAS_SEM_BANHEIRO = ('A',)
+
+# Os arquivos do INEP usam ';' e latin-1
+SEPARADOR = ';'
+CODIFICACAO = 'latin-1'
+
+# Versão da lógica de agregação, na variante do snapshot do dashboard: incrementar a cada
+# mudança no resultado, senão os snapshots dos arquivos brutos seguem servindo o antigo
+VERSAO_AGREGACAO = '1'
+
+GRUPOS = ('com_saneamento', 'sem_saneamento')
+
+# Classes de nota (pontos) acumuladas por grupo, de 0 a NOTA_MAXIMA
+LARGURA_CLASSE = 1
+NOTA_MAXIMA = 1000
+N_CLASSES = NOTA_MAXIMA // LARGURA_CLASSE
+
+# Quantis calculados a partir das classes
+QUANTIS = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+def parcial_enem(bloco, uf=None):
+    """Participantes e soma das notas médias por grupo × classe de nota de um bloco (somáveis entre blocos)"""
+    if uf is not None:
+        bloco = bloco[bloco['SG_UF_PROVA'] == uf]
+    notas = bloco[COLUNAS_NOTAS].to_numpy(dtype=np.float64)
+    completos = ~np.isnan(notas).any(axis=1) & bloco['Q008'].notna().to_numpy()
+    grupo = bloco['Q008'].isin(RESPOSTAS_SEM_BANHEIRO).to_numpy()[completos].astype(np.intp)
+    media = notas[completos].mean(axis=1)
+
+    classe = np.clip(media // LARGURA_CLASSE, 0, N_CLASSES - 1).astype(np.intp)
+    celula = grupo * N_CLASSES + classe
+    return {
+        'participantes': np.bincount(celula, minlength=2 * N_CLASSES).reshape(2, N_CLASSES).astype(np.int64),
+        'soma_notas': np.bincount(celula, weights=media, minlength=2 * N_CLASSES).reshape(2, N_CLASSES),
+    }
+
+
+def linha_nota_enem(parcial):
+    """Linha `nota_enem` de `educacao_ibge_inep_<ano>.csv` (nota média por grupo)"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        com, sem = (parcial['soma_notas'].sum(axis=1) / parcial['participantes'].sum(axis=1)).round(2)
+    return {'indicador': 'nota_enem', 'com_saneamento': com, 'sem_saneamento': sem, 'unidade': 'pontos'}
+
+
+def resumo_notas(parcial):
+    """Distribuição compacta das notas (`notas_enem_<ano>.csv`): saneamento, nota, participantes, soma_notas"""
+    grupos, classes = np.nonzero(parcial['participantes'])
+    return pd.DataFrame({
+        'saneamento': np.asarray(GRUPOS)[grupos],
+        'nota': classes * LARGURA_CLASSE,
+        'participantes': parcial['participantes'][grupos, classes],
+        'soma_notas': parcial['soma_notas'][grupos, classes].round(2),
+    })
+
+
+def _quantis(contagens, quantis):
+    """Quantis de uma distribuição em classes, interpolando linearmente dentro da classe"""
+    acumulado = np.cumsum(contagens)
+    alvos = np.asarray(quantis) * acumulado[-1]
+    classe = np.minimum(np.searchsorted(acumulado, alvos, side='left'), len(contagens) - 1)
+    antes = acumulado[classe] - contagens[classe]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fracao = np.nan_to_num((alvos - antes) / contagens[classe])
+    return (classe + fracao) * LARGURA_CLASSE
+
+
+def estatisticas_notas(df, quantis=QUANTIS, largura_histograma=20):
+    """
+    Por grupo: participantes, média, quantis e histograma a partir da distribuição em classes.
+
+    O histograma reagrupa as classes em faixas de `largura_histograma` pontos e
+    traz o início de cada faixa e a fração dos participantes do grupo nela.
+    Todo grupo de `GRUPOS` tem entrada: sem participantes, a média e os quantis
+    são NaN e as frações do histograma, zero.
+    """
+    estatisticas = {}
+    por_faixa = largura_histograma // LARGURA_CLASSE
+    for grupo in GRUPOS:
+        linhas = df[df['saneamento'] == grupo]
+        contagens = np.zeros(N_CLASSES, dtype=np.int64)
+        contagens[linhas['nota'].to_numpy(dtype=np.intp) // LARGURA_CLASSE] = linhas['participantes'].to_numpy()
+        total = int(contagens.sum())
+        faixas = contagens.reshape(-1, por_faixa).sum(axis=1)
+        if total == 0:
+            media, valores_quantis, fracao = np.nan, [np.nan] * len(quantis), np.zeros(len(faixas))
+        else:
+            media = float(linhas['soma_notas'].sum() / total)
+            valores_quantis, fracao = _quantis(contagens, quantis).tolist(), faixas / total
+
+        estatisticas[grupo] = {
+            'participantes': total,
+            'media': media,
+            'quantis': dict(zip(quantis, valores_quantis)),
+            'histograma': {
+                'inicio': (np.arange(len(faixas)) * largura_histograma).tolist(),
+                'fracao': fracao.tolist(),
+            },
+        }
+    return estatisticas
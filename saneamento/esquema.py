@@ -0,0 +1,152 @@
+"""
+Esquema declarativo das fontes de dados, verificado com operações vetorizadas.
+
+Cada fonte declara suas colunas (com o tipo esperado), as chaves de indicador
+obrigatórias e permitidas e as faixas válidas de valores. Uma chave fora das
+permitidas (ex.: indicador com erro de digitação) reprova a partição, em vez de
+sumir em silêncio do registro; linhas desagregadas usam a chave permitida com um
+sufixo numérico (`com_saneamento_000000002`, `populacao_total_0000001`). A verificação roda uma vez por
+snapshot: `VERSAO_ESQUEMA` entra na chave do snapshot, então um snapshot
+existente já foi validado com as regras atuais.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Incrementar quando as regras mudarem, para revalidar (e regravar) os snapshots
+VERSAO_ESQUEMA = '2'
+
+# Sufixo das chaves de linhas desagregadas (por município, RA, faixa...): '_' + número
+SUFIXO_DESAGREGADO = r'_\d+$'
+
+# Tipos de coluna: nome -> verificação do dtype
+TIPOS = {
+    'inteiro': pd.api.types.is_integer_dtype,
+    'numero': lambda dtype: pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype),
+    'texto': lambda dtype: pd.api.types.is_string_dtype(dtype) or pd.api.types.is_object_dtype(dtype),
+}
+
+# Por fonte: colunas e tipos, coluna de chave, chaves obrigatórias e permitidas, faixas (mín, máx) por coluna
+ESQUEMAS = {
+    'saude': {
+        'colunas': {'mes': 'texto', 'internacoes': 'inteiro', 'obitos': 'inteiro', 'custo_total': 'numero'},
+        'faixas': {'internacoes': (0, None), 'obitos': (0, None), 'custo_total': (0, None)},
+    },
+    'renda': {
+        'colunas': {'categoria': 'texto', 'renda_media_mensal': 'numero'},
+        'chave': 'categoria',
+        'chaves': ('com_saneamento', 'sem_saneamento'),
+        'permitidas': ('com_saneamento', 'sem_saneamento'),
+        'faixas': {'renda_media_mensal': (0, None)},
+    },
+    'educacao': {
+        'colunas': {'indicador': 'texto', 'com_saneamento': 'numero', 'sem_saneamento': 'numero'},
+        'chave': 'indicador',
+        'chaves': ('escolaridade', 'nota_enem'),
+        'permitidas': ('escolaridade', 'nota_enem'),
+        'faixas': {'com_saneamento': (0, 1000), 'sem_saneamento': (0, 1000)},
+    },
+    'cobertura': {
+        'colunas': {'indicador': 'texto', 'valor': 'numero', 'percentual': 'numero'},
+        'chave': 'indicador',
+        'chaves': ('populacao_total', 'sem_agua_tratada', 'sem_coleta_esgoto'),
+        'permitidas': ('populacao_total', 'sem_agua_tratada', 'sem_coleta_esgoto', 'com_agua_tratada',
+                       'com_coleta_esgoto'),
+        'faixas': {'valor': (0, None), 'percentual': (0, 100)},
+    },
+    'escolaridade_idade': {
+        'colunas': {'idade': 'inteiro', 'saneamento': 'texto', 'media': 'numero', 'ic_inferior': 'numero',
+                    'ic_superior': 'numero', 'n_efetivo': 'numero'},
+        'chave': 'saneamento',
+        'chaves': ('com_saneamento', 'sem_saneamento'),
+        'permitidas': ('com_saneamento', 'sem_saneamento'),
+        'faixas': {'idade': (0, 120), 'media': (0, 30), 'ic_inferior': (0, 30), 'n_efetivo': (0, None)},
+    },
+    'notas_enem': {
+        'colunas': {'saneamento': 'texto', 'nota': 'inteiro', 'participantes': 'inteiro', 'soma_notas': 'numero'},
+        'chave': 'saneamento',
+        'chaves': ('com_saneamento', 'sem_saneamento'),
+        'permitidas': ('com_saneamento', 'sem_saneamento'),
+        'faixas': {'nota': (0, 1000), 'participantes': (0, None), 'soma_notas': (0, None)},
+    },
+    'regioes': {
+        'colunas': {'ra': 'texto', 'nome': 'texto', 'populacao': 'numero', 'sem_agua_tratada': 'numero',
+                    'sem_coleta_esgoto': 'numero', 'internacoes': 'numero', 'renda_media_mensal': 'numero'},
+        'chave': 'ra',
+        'faixas': {'populacao': (0, None), 'sem_agua_tratada': (0, None), 'sem_coleta_esgoto': (0, None),
+                   'internacoes': (0, None), 'renda_media_mensal': (0, None)},
+    },
+}
+
+
+class ErroEsquema(ValueError):
+    """Partição de dados fora do esquema declarado da fonte"""
+
+    def __init__(self, fonte, problemas, origem=None):
+        self.fonte = fonte
+        self.problemas = problemas
+        local = f' ({origem})' if origem else ''
+        super().__init__(f"Fonte '{fonte}'{local} fora do esquema:\n- " + '\n- '.join(problemas))
+
+
+def verificar(df, fonte):
+    """Lista os problemas de `df` em relação ao esquema da fonte (vazia se estiver tudo certo)"""
+    esquema = ESQUEMAS[fonte]
+    problemas = []
+
+    if df.empty:
+        problemas.append('nenhuma linha')
+
+    ausentes = [coluna for coluna in esquema['colunas'] if coluna not in df.columns]
+    if ausentes:
+        problemas.append(f"colunas ausentes: {', '.join(ausentes)}")
+
+    for coluna, tipo in esquema['colunas'].items():
+        if coluna in ausentes:
+            continue
+        serie = df[coluna]
+        if not TIPOS[tipo](serie.dtype):
+            problemas.append(f"coluna '{coluna}' com tipo {serie.dtype}, esperado {tipo}")
+            continue
+        nulos = int(serie.isna().sum())
+        if nulos:
+            problemas.append(f"coluna '{coluna}' com {nulos} valor(es) ausente(s)")
+
+    for coluna, (minimo, maximo) in esquema.get('faixas', {}).items():
+        if coluna in ausentes or not TIPOS['numero'](df[coluna].dtype):
+            continue
+        valores = df[coluna].to_numpy(dtype=np.float64, na_value=np.nan)
+        fora = np.zeros(len(valores), dtype=bool)
+        if minimo is not None:
+            fora |= valores < minimo
+        if maximo is not None:
+            fora |= valores > maximo
+        if fora.any():
+            faixa = f"[{'' if minimo is None else minimo}, {'' if maximo is None else maximo}]"
+            problemas.append(f"coluna '{coluna}' com {int(fora.sum())} valor(es) fora de {faixa}, "
+                             f"ex.: {valores[fora][0]:g}")
+
+    chave = esquema.get('chave')
+    if chave and chave not in ausentes:
+        faltando = pd.Index(esquema.get('chaves', ())).difference(df[chave].unique())
+        if len(faltando):
+            problemas.append(f"chaves obrigatórias ausentes em '{chave}': {', '.join(faltando)}")
+
+        permitidas = esquema.get('permitidas')
+        if permitidas is not None:
+            # Só os valores distintos são verificados; o sufixo numérico das linhas desagregadas sai antes
+            unicas = pd.Series(df[chave].dropna().unique()).astype(str)
+            inesperadas = unicas[~unicas.str.replace(SUFIXO_DESAGREGADO, '', regex=True).isin(permitidas)]
+            if len(inesperadas):
+                exemplos = ', '.join(inesperadas.head(5))
+                problemas.append(f"{len(inesperadas)} chave(s) não permitida(s) em '{chave}', ex.: {exemplos}")
+
+    return problemas
+
+
+def validar(df, fonte, origem=None):
+    """Levanta `ErroEsquema` se `df` não seguir o esquema da fonte; retorna o próprio `df`"""
+    problemas = verificar(df, fonte)
+    if problemas:
+        raise ErroEsquema(fonte, problemas, origem)
+    return df
@@ -0,0 +1,231 @@
+"""
+Exportação estática do dashboard: um único HTML autocontido, sem sessão Python por visitante.
+
+O script é executado uma vez, sem navegador, pelo `AppTest` do Streamlit, e a
+árvore de elementos resultante (CSS, banner, métricas, colunas, abas e os
+gráficos Plotly com os dados embutidos) é convertida em HTML. O Plotly.js vai
+embutido uma única vez (ou referenciado pela CDN) e as abas funcionam só com CSS:
+
+    python -m saneamento.estatico --saida site/index.html
+    python -m saneamento.estatico --saida site/2022.html --ano 2022 --plotlyjs cdn
+
+Widgets (seletor de ano, indicador do mapa) não têm efeito no HTML estático:
+a página mostra o estado padrão de cada um.
+"""
+
+import argparse
+import html
+import json
+import logging
+import os
+import re
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(RAIZ, 'dashboard-saneamento.py')
+
+TITULO_PADRAO = 'Dashboard Saneamento'
+
+# Widgets omitidos na exportação: a página estática mostra o estado padrão deles
+WIDGETS_IGNORADOS = {'selectbox', 'radio'}
+
+CONFIG_PLOTLY = {'responsive': True, 'displaylogo': False}
+
+# Layout mínimo que substitui o do Streamlit (colunas, abas, métricas)
+CSS_BASE = """
+* { box-sizing: border-box; }
+body { margin: 0; font-family: "Source Sans Pro", "Segoe UI", Roboto, sans-serif; color: #fafafa; background: #0e1117; }
+.main .block-container { max-width: 100%; margin: 0 auto; }
+.bloco { display: flex; flex-direction: column; gap: 1rem; }
+.colunas { display: flex; flex-wrap: wrap; gap: 1rem; margin-bottom: 1rem; }
+.coluna { min-width: 280px; display: flex; flex-direction: column; gap: 1rem; }
+.grafico { width: 100%; min-height: 400px; margin-bottom: 1rem; }
+hr { border: none; border-top: 1px solid rgba(250, 250, 250, 0.2); margin: 2rem 0; }
+[data-testid="stMetric"] { padding: 0.5rem 0; }
+[data-testid="stMetricLabel"] { font-size: 0.9rem; opacity: 0.85; }
+[data-testid="stMetricDelta"] { font-size: 0.9rem; }
+.delta-verde { color: #09ab3b; }
+.delta-vermelho { color: #ff2b2b; }
+.delta-cinza { color: #a3a8b8; }
+.stTabs > input { display: none; }
+.stTabs [data-baseweb="tab-list"] { display: flex; }
+.stTabs [data-baseweb="tab"] { cursor: pointer; padding: 0.5rem 1rem; }
+.stTabs .painel { display: none; padding-top: 1rem; }
+details { border: 1px solid rgba(250, 250, 250, 0.2); border-radius: 8px; padding: 0.5rem 1rem; margin-bottom: 1rem; }
+"""
+
+# Redimensiona os gráficos de uma aba quando ela passa a ser exibida
+JS_ABAS = """
+document.querySelectorAll('.stTabs > input').forEach(function (entrada) {
+  entrada.addEventListener('change', function () {
+    var painel = document.getElementById(entrada.dataset.painel);
+    painel.querySelectorAll('.js-plotly-plot').forEach(function (g) { Plotly.Plots.resize(g); });
+  });
+});
+"""
+
+
+def markdown_para_html(texto):
+    """Converte o subconjunto de Markdown usado pelo dashboard (HTML bruto, `---` e títulos `#`)"""
+    texto = texto.strip()
+    if texto.startswith('<'):
+        return texto
+    if texto == '---':
+        return '<hr>'
+    titulo = re.match(r'^(#{1,6})\s+(.*)$', texto)
+    if titulo:
+        nivel = len(titulo.group(1))
+        return f'<h{nivel}>{_negrito(html.escape(titulo.group(2)))}</h{nivel}>'
+    return f'<p>{_negrito(html.escape(texto))}</p>'
+
+
+def _negrito(texto):
+    return re.sub(r'\*\*(.+?)\*\*', r'<b>\1</b>', texto)
+
+
+def embutir_estilos(trecho):
+    """Troca os <link> para CSS de app/static/ pelo conteúdo do arquivo (a página exportada não tem servidor)"""
+    def estilo(link):
+        with open(os.path.join(RAIZ, 'static', link.group(1)), encoding='utf-8') as arquivo:
+            return f'<style>{arquivo.read()}</style>'
+
+    return re.sub(r'<link rel="stylesheet" href="app/static/([^"?]+)(?:\?[^"]*)?">', estilo, trecho)
+
+
+class RenderizadorEstatico:
+    """Percorre a árvore de elementos de um run do `AppTest` e gera o HTML equivalente"""
+
+    def __init__(self):
+        self.graficos = 0
+        self.abas = 0
+
+    def no(self, no):
+        tipo = getattr(no, 'type', None)
+        metodo = getattr(self, f'_{tipo}', None)
+        if metodo is None:
+            if tipo in WIDGETS_IGNORADOS:
+                return ''
+            raise ValueError(f"Elemento '{tipo}' não suportado na exportação estática")
+        return metodo(no)
+
+    def filhos(self, no):
+        return ''.join(self.no(filho) for filho in no.children.values())
+
+    def _main(self, no):
+        return f'<div class="bloco">{self.filhos(no)}</div>'
+
+    _vertical = _main
+
+    def _flex_container(self, no):
+        if no.proto.flex_container.direction == no.proto.flex_container.HORIZONTAL:
+            return f'<div class="colunas">{self.filhos(no)}</div>'
+        return self._main(no)
+
+    def _column(self, no):
+        return f'<div class="coluna" style="flex: {no.proto.weight:g} 1 0">{self.filhos(no)}</div>'
+
+    def _tab_container(self, no):
+        self.abas += 1
+        grupo = f'abas-{self.abas}'
+        entradas, rotulos, paineis, regras = [], [], [], []
+        for i, aba in enumerate(no.children.values()):
+            id_aba = f'{grupo}-{i}'
+            marcado = ' checked' if i == 0 else ''
+            entradas.append(f'<input type="radio" name="{grupo}" id="{id_aba}" data-painel="{id_aba}-painel"{marcado}>')
+            rotulos.append(f'<label for="{id_aba}" data-baseweb="tab">{html.escape(aba.label)}</label>')
+            paineis.append(f'<div class="painel" id="{id_aba}-painel">{self.filhos(aba)}</div>')
+            regras.append(f'#{id_aba}:checked ~ #{id_aba}-painel {{ display: block; }}'
+                          f'#{id_aba}:checked ~ [data-baseweb="tab-list"] [for="{id_aba}"] '
+                          '{ border-bottom: 3px solid currentColor; }')
+        return (f'<style>{"".join(regras)}</style><div class="stTabs">{"".join(entradas)}'
+                f'<div data-baseweb="tab-list">{"".join(rotulos)}</div>{"".join(paineis)}</div>')
+
+    def _expander(self, no):
+        aberto = ' open' if no.proto.expanded else ''
+        return f'<details{aberto}><summary>{html.escape(no.label)}</summary>{self.filhos(no)}</details>'
+
+    def _markdown(self, no):
+        return embutir_estilos(markdown_para_html(no.value))
+
+    def _html(self, no):
+        return no.proto.body
+
+    def _metric(self, no):
+        proto = no.proto
+        delta = ''
+        if proto.delta:
+            classe = {proto.RED: 'delta-vermelho', proto.GREEN: 'delta-verde'}.get(proto.color, 'delta-cinza')
+            delta = f'<div data-testid="stMetricDelta" class="{classe}">{html.escape(proto.delta)}</div>'
+        return (f'<div data-testid="stMetric"><div data-testid="stMetricLabel">{html.escape(proto.label)}</div>'
+                f'<div data-testid="stMetricValue">{html.escape(proto.body)}</div>{delta}</div>')
+
+    def _plotly_chart(self, no):
+        self.graficos += 1
+        spec = json.loads(no.proto.spec)
+        id_grafico = f'grafico-{self.graficos}'
+        # '</' escapado para que nenhum texto dos dados feche o <script> antes da hora
+        argumentos = ', '.join(json.dumps(parte, separators=(',', ':'), ensure_ascii=False).replace('</', '<\\/')
+                               for parte in (spec.get('data', []), spec.get('layout', {}), CONFIG_PLOTLY))
+        return (f'<div class="grafico" id="{id_grafico}"></div>'
+                f'<script>Plotly.newPlot("{id_grafico}", {argumentos});</script>')
+
+
+def _script_plotly(modo):
+    import plotly.offline
+
+    if modo == 'cdn':
+        return f'<script src="https://cdn.plot.ly/plotly-{plotly.offline.get_plotlyjs_version()}.min.js"></script>'
+    return f'<script>{plotly.offline.get_plotlyjs()}</script>'
+
+
+def renderizar(script=SCRIPT, ano=None, plotlyjs='inline', titulo=TITULO_PADRAO, timeout=600):
+    """Executa o dashboard sem navegador e retorna a página estática completa"""
+    from streamlit.testing.v1 import AppTest
+
+    # A página estática precisa de todas as seções e abas construídas
+    os.environ['SANEAMENTO_LAZY'] = '0'
+    app = AppTest.from_file(script, default_timeout=timeout)
+    if ano is not None:
+        app.session_state['ano'] = ano
+    app.run()
+    if app.exception:
+        raise RuntimeError(f'O dashboard falhou: {app.exception[0].message}')
+
+    corpo = RenderizadorEstatico().no(app.main)
+    return (
+        '<!DOCTYPE html>\n<html lang="pt-BR">\n<head>\n<meta charset="utf-8">\n'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+        f'<title>{html.escape(titulo)}</title>\n<style>{CSS_BASE}</style>\n{_script_plotly(plotlyjs)}\n'
+        '</head>\n<body>\n<div class="stApp"><div class="main"><div class="block-container">\n'
+        f'{corpo}\n</div></div></div>\n<script>{JS_ABAS}</script>\n</body>\n</html>\n'
+    )
+
+
+def exportar(destino, **opcoes):
+    """Grava a página estática de forma atômica e retorna o tamanho em bytes"""
+    pagina = renderizar(**opcoes).encode('utf-8')
+    os.makedirs(os.path.dirname(os.path.abspath(destino)), exist_ok=True)
+    temporario = f'{destino}.tmp'
+    with open(temporario, 'wb') as arquivo:
+        arquivo.write(pagina)
+    os.replace(temporario, destino)
+    return len(pagina)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--saida', required=True, help='arquivo HTML gerado')
+    parser.add_argument('--ano', type=int, help='ano exportado (padrão: o mais recente)')
+    parser.add_argument('--dados', help='pasta de dados (padrão: SANEAMENTO_DADOS ou dados/)')
+    parser.add_argument('--plotlyjs', choices=['inline', 'cdn'], default='inline',
+                        help='embute o Plotly.js no HTML ou o referencia pela CDN')
+    args = parser.parse_args(argv)
+
+    if args.dados:
+        os.environ['SANEAMENTO_DADOS'] = os.path.abspath(args.dados)
+    logging.disable(logging.WARNING)
+    tamanho = exportar(args.saida, ano=args.ano, plotlyjs=args.plotlyjs)
+    print(f'{args.saida}: {tamanho / 1024:.1f} KB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Formatação numérica pt-BR (milhar com ponto, decimal com vírgula) para colunas inteiras.
+
+Cada função aceita um escalar (retorna str), uma pd.Series (retorna Series com o
+mesmo índice) ou qualquer sequência/array (retorna lista, pronta para o Plotly).
+Colunas formatam só os valores distintos (`np.unique` na própria chamada, sem
+cache que cresça entre sessões) e espalham o texto de volta pelos índices
+inversos; os separadores entram só no número, nunca no texto ao redor.
+
+Formatos feitos no navegador pelo Plotly (`hovertemplate` com `%{y:,.2f}`, eixos)
+usam `SEPARADORES_PLOTLY` no layout da figura.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Valor de `layout.separators` do Plotly: decimal ',' e milhar '.'
+SEPARADORES_PLOTLY = ',.'
+
+# Texto exibido para valores ausentes (NaN/None)
+TEXTO_AUSENTE = '–'
+
+_TROCA_SEPARADORES = str.maketrans(',.', '.,')
+
+
+def _formatar_valor(valor, casas, sinal):
+    """Um número no padrão pt-BR, sem prefixo/sufixo"""
+    if valor != valor:
+        return TEXTO_AUSENTE
+    texto = f"{valor:{'+' if sinal else ''},.{casas}f}"
+    return texto.translate(_TROCA_SEPARADORES)
+
+
+def formatar_numeros(valores, casas=0, prefixo='', sufixo='', sinal=False, escala=1):
+    """
+    Formata um escalar ou uma coluna de números no padrão pt-BR.
+
+    `escala` multiplica os valores antes da formatação (ex.: 100 para percentuais)
+    e `sinal=True` força o sinal também nos positivos. O resultado é o mesmo do
+    formato `,.{casas}f` do Python com os separadores trocados.
+    """
+    if np.ndim(valores) == 0:
+        if valores is None or pd.isna(valores):
+            return TEXTO_AUSENTE
+        return f'{prefixo}{_formatar_valor(float(valores) * escala, casas, sinal)}{sufixo}'
+
+    numeros = np.asarray(valores).ravel()
+    if numeros.dtype.kind not in 'iuf':
+        numeros = pd.to_numeric(numeros.astype(object), errors='coerce')
+    numeros = numeros.astype(np.float64) * escala
+    ausentes = np.isnan(numeros)
+    presentes = numeros[~ausentes] if ausentes.any() else numeros
+    # Distintos pelos bits do float64: 0.0 e -0.0 ('-0') continuam separados
+    bits, inversos = np.unique(presentes.view(np.int64), return_inverse=True)
+    distintos = presentes if len(bits) == len(presentes) else bits.view(np.float64)
+    # Milhar com '_' e troca dos separadores numa passada só sobre o texto unido, não valor a valor
+    especificacao = f"{'+' if sinal else ''}_.{casas}f"
+    unidos = '\n'.join([format(valor, especificacao) for valor in distintos.tolist()])
+    textos = unidos.replace('.', ',').replace('_', '.').split('\n') if len(distintos) else []
+    if prefixo or sufixo:
+        textos = [f'{prefixo}{texto}{sufixo}' for texto in textos]
+    textos = np.array(textos, dtype=object)
+    if len(distintos) != len(presentes):
+        textos = textos[inversos]
+
+    if ausentes.any():
+        formatados = np.full(len(numeros), TEXTO_AUSENTE, dtype=object)
+        formatados[~ausentes] = textos
+    else:
+        formatados = textos
+
+    if isinstance(valores, pd.Series):
+        return pd.Series(formatados, index=valores.index, name=valores.name)
+    return formatados.tolist()
+
+
+def inteiro(valores):
+    """1234567 -> '1.234.567'"""
+    return formatar_numeros(valores, casas=0)
+
+
+def decimal(valores, casas=2):
+    """1234.5 -> '1.234,50'"""
+    return formatar_numeros(valores, casas=casas)
+
+
+def moeda(valores, casas=2):
+    """1234.5 -> 'R$ 1.234,50'"""
+    return formatar_numeros(valores, casas=casas, prefixo='R$ ')
+
+
+def percentual(valores, casas=1, sinal=False):
+    """Fração para percentual: 0.123 -> '12,3%' (com `sinal=True`, '+12,3%')"""
+    return formatar_numeros(valores, casas=casas, sufixo='%', sinal=sinal, escala=100)
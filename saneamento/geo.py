@@ -0,0 +1,212 @@
+"""
+Geometria das Regiões Administrativas (RAs) do DF: simplificação e serialização.
+
+A geometria original (GeoJSON com uma feição por RA e a propriedade `ra`) é
+pré-simplificada uma única vez em algumas resoluções, gravadas ao lado dela:
+
+    python -m saneamento.geo dados/geo/regioes_administrativas.geojson
+
+Em tempo de execução o dashboard só lê o arquivo já simplificado da resolução
+desejada, em vez de carregar e processar a geometria completa a cada rerun.
+A simplificação é topológica: cada divisa entre RAs vizinhas é simplificada uma
+só vez e usada pelas duas, então o mapa não ganha frestas nem sobreposições.
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+# Tolerância de simplificação (graus) e casas decimais das coordenadas por resolução
+RESOLUCOES = {
+    'baixa': (0.004, 3),
+    'media': (0.001, 4),
+    'alta': (0.0002, 5),
+}
+
+RESOLUCAO_PADRAO = 'media'
+
+
+def simplificar_linha(pontos, tolerancia):
+    """Douglas-Peucker iterativo sobre um array (n, 2); mantém o primeiro e o último ponto"""
+    pontos = np.asarray(pontos, dtype=np.float64)
+    n = len(pontos)
+    if n <= 2:
+        return pontos
+
+    manter = np.zeros(n, dtype=bool)
+    manter[0] = manter[-1] = True
+    pilha = [(0, n - 1)]
+    while pilha:
+        inicio, fim = pilha.pop()
+        if fim - inicio < 2:
+            continue
+        a, b = pontos[inicio], pontos[fim]
+        trecho = pontos[inicio + 1:fim]
+        direcao = b - a
+        comprimento = np.hypot(*direcao)
+        if comprimento == 0:
+            distancias = np.hypot(*(trecho - a).T)
+        else:
+            distancias = np.abs(direcao[0] * (trecho[:, 1] - a[1]) - direcao[1] * (trecho[:, 0] - a[0])) / comprimento
+        indice = int(np.argmax(distancias))
+        if distancias[indice] > tolerancia:
+            meio = inicio + 1 + indice
+            manter[meio] = True
+            pilha.append((inicio, meio))
+            pilha.append((meio, fim))
+    return pontos[manter]
+
+
+def _anel_aberto(anel):
+    """Vértices (x, y) do anel, sem repetir o ponto de fechamento"""
+    pontos = [tuple(ponto[:2]) for ponto in anel]
+    if len(pontos) > 1 and pontos[0] == pontos[-1]:
+        pontos.pop()
+    return pontos
+
+
+def _juncoes(aneis):
+    """
+    Vértices em que a fronteira muda de vizinhança: onde o mesmo ponto aparece
+    com vizinhos diferentes (início/fim de uma divisa entre RAs, encontro de três RAs).
+    """
+    vizinhos = {}
+    for pontos in aneis:
+        n = len(pontos)
+        for i, ponto in enumerate(pontos):
+            vizinhos.setdefault(ponto, set()).add(frozenset((pontos[i - 1], pontos[(i + 1) % n])))
+    return {ponto for ponto, pares in vizinhos.items() if len(pares) > 1}
+
+
+def _arcos_anel(pontos, juncoes):
+    """
+    Divide o anel em arcos entre junções consecutivas. Cada arco volta na forma
+    canônica (a menor entre ele e o reverso) com a indicação de que foi invertido,
+    para que a divisa percorrida em sentidos opostos pelas duas RAs seja o mesmo arco.
+    """
+    indices = [i for i, ponto in enumerate(pontos) if ponto in juncoes]
+    if not indices:
+        # Anel sem junções (RA isolada ou anel repetido inteiro): um arco fechado que começa no menor ponto
+        indices = [min(range(len(pontos)), key=pontos.__getitem__)]
+    girado = pontos[indices[0]:] + pontos[:indices[0]]
+    fechado = girado + girado[:1]
+    posicoes = [i - indices[0] for i in indices] + [len(pontos)]
+
+    arcos = []
+    for inicio, fim in zip(posicoes, posicoes[1:]):
+        arco = tuple(fechado[inicio:fim + 1])
+        reverso = arco[::-1]
+        arcos.append((reverso, True) if reverso < arco else (arco, False))
+    return arcos
+
+
+def simplificar_geojson(geojson, tolerancia, casas):
+    """
+    Retorna uma cópia do FeatureCollection com polígonos simplificados e coordenadas arredondadas.
+
+    A simplificação preserva a topologia: os anéis são divididos em arcos entre
+    junções, cada arco (inclusive as divisas compartilhadas por duas RAs) é
+    simplificado uma única vez e os anéis são remontados a partir deles, então
+    RAs vizinhas continuam com a mesma divisa, sem frestas nem sobreposições.
+    """
+    estruturas = []
+    for feicao in geojson['features']:
+        geometria = feicao['geometry']
+        if geometria['type'] == 'Polygon':
+            estruturas.append([geometria['coordinates']])
+        elif geometria['type'] == 'MultiPolygon':
+            estruturas.append(geometria['coordinates'])
+        else:
+            raise ValueError(f"Geometria '{geometria['type']}' não suportada (esperado Polygon/MultiPolygon)")
+
+    aneis = [_anel_aberto(anel) for poligonos in estruturas for poligono in poligonos for anel in poligono]
+    juncoes = _juncoes(aneis)
+    arcos_aneis = [_arcos_anel(pontos, juncoes) for pontos in aneis]
+
+    simplificados = {}
+    preservados = set()
+
+    def montar(arcos):
+        anel = []
+        for chave, invertido in arcos:
+            if chave not in simplificados:
+                simplificados[chave] = simplificar_linha(chave, 0 if chave in preservados else tolerancia)
+            arco = simplificados[chave][::-1] if invertido else simplificados[chave]
+            anel.extend(arco if not anel else arco[1:])
+        return anel
+
+    # Anéis que colapsariam (menos de 3 vértices) mantêm os vértices dos seus arcos,
+    # o que vale também para o lado vizinho das divisas
+    for arcos in arcos_aneis:
+        if len(montar(arcos)) < 4:
+            preservados.update(chave for chave, _ in arcos)
+    for chave in preservados:
+        simplificados.pop(chave, None)
+    montados = iter([np.round(montar(arcos), casas).tolist() for arcos in arcos_aneis])
+
+    feicoes = []
+    for feicao, poligonos in zip(geojson['features'], estruturas):
+        coordenadas = [[next(montados) for _ in poligono] for poligono in poligonos]
+        tipo = feicao['geometry']['type']
+        feicoes.append({
+            'type': 'Feature',
+            'properties': feicao.get('properties', {}),
+            'geometry': {'type': tipo, 'coordinates': coordenadas[0] if tipo == 'Polygon' else coordenadas},
+        })
+    return {'type': 'FeatureCollection', 'features': feicoes}
+
+
+def caminho_resolucao(caminho, resolucao):
+    """Caminho do arquivo pré-simplificado de uma resolução"""
+    base, extensao = os.path.splitext(caminho)
+    return f'{base}.{resolucao}{extensao}'
+
+
+def serializar(geojson):
+    """JSON compacto (sem espaços), usado para gravar e medir o payload"""
+    return json.dumps(geojson, separators=(',', ':'), ensure_ascii=False)
+
+
+def gerar_resolucoes(caminho, resolucoes=RESOLUCOES):
+    """Grava uma versão simplificada do GeoJSON para cada resolução e retorna os tamanhos em bytes"""
+    with open(caminho, encoding='utf-8') as arquivo:
+        original = json.load(arquivo)
+
+    tamanhos = {}
+    for resolucao, (tolerancia, casas) in resolucoes.items():
+        texto = serializar(simplificar_geojson(original, tolerancia, casas))
+        destino = caminho_resolucao(caminho, resolucao)
+        temporario = f'{destino}.tmp'
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(texto)
+        os.replace(temporario, destino)
+        tamanhos[resolucao] = len(texto.encode('utf-8'))
+    return tamanhos
+
+
+def arquivo_resolucao(caminho, resolucao=RESOLUCAO_PADRAO):
+    """Arquivo lido para uma resolução: o pré-simplificado ou, se ainda não gerado, o original"""
+    simplificado = caminho_resolucao(caminho, resolucao)
+    return simplificado if os.path.exists(simplificado) else caminho
+
+
+def carregar_geojson(caminho, resolucao=RESOLUCAO_PADRAO):
+    """Lê a versão pré-simplificada da resolução pedida"""
+    with open(arquivo_resolucao(caminho, resolucao), encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('geojson', help='GeoJSON original das RAs (propriedade "ra" em cada feição)')
+    args = parser.parse_args(argv)
+
+    original = os.path.getsize(args.geojson)
+    for resolucao, tamanho in gerar_resolucoes(args.geojson).items():
+        print(f'{resolucao:>5}: {tamanho / 1024:8.1f} KB ({tamanho / original:.0%} do original)')
+
+
+if __name__ == '__main__':
+    main()
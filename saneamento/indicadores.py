@@ -0,0 +1,100 @@
+"""Registro indexado de indicadores e grafo de dependências dos campos derivados"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+class RegistroIndicadores:
+    """
+    Índice chave -> posição de cada tabela de indicadores, montado uma vez por carga.
+
+    `fontes` mapeia o nome da fonte para `(df, coluna_chave)`; fontes sem chave
+    (como a série mensal de saúde) usam `coluna_chave=None` e ficam de fora: os
+    totais saem do motor de consulta (`saneamento.consulta`).
+    Cada fonte guarda um `pd.Index` das chaves e um array NumPy por coluna, então
+    o número de objetos cresce com as colunas, não com as linhas.
+    """
+
+    def __init__(self, fontes):
+        self._indices = {}
+        for nome, (df, coluna_chave) in fontes.items():
+            if coluna_chave is not None:
+                # Mantém a primeira ocorrência de cada chave, como o antigo `.values[0]`
+                unicos = df.drop_duplicates(coluna_chave, keep='first')
+                chaves = pd.Index(unicos[coluna_chave].to_numpy())
+                colunas = {coluna: unicos[coluna].to_numpy() for coluna in unicos.columns if coluna != coluna_chave}
+                self._indices[nome] = (chaves, colunas)
+
+    @classmethod
+    def unir(cls, registros):
+        """Registro único a partir de registros montados por fonte (reaproveita os índices, sem copiá-los)"""
+        unido = cls({})
+        for registro in registros:
+            unido._indices.update(registro._indices)
+        return unido
+
+    def valor(self, fonte, chave, coluna):
+        """Retorna o valor de `coluna` na linha `chave` da fonte (busca no índice de hash)"""
+        try:
+            chaves, colunas = self._indices[fonte]
+            valor = colunas[coluna][chaves.get_loc(chave)]
+        except KeyError:
+            raise KeyError(f"Indicador '{chave}' / coluna '{coluna}' não encontrado na fonte '{fonte}'") from None
+        # Escalares NumPy como tipos nativos, como devolvia o antigo dicionário de linhas
+        return valor.item() if isinstance(valor, np.generic) else valor
+
+    def extrair(self, campos):
+        """Monta o dicionário de campos a partir das referências (fonte, chave, coluna)"""
+        return {campo: self.valor(*ref) for campo, ref in campos.items()}
+
+
+class GrafoDerivados:
+    """
+    Calcula campos derivados declarados como `campo: (funcao, dependencia, ...)`.
+
+    Cada campo só é recalculado quando o valor de alguma dependência muda desde
+    o último cálculo; derivados podem depender de outros derivados.
+    """
+
+    def __init__(self, derivados):
+        self._derivados = derivados
+        self._ordem = self._ordenar(derivados)
+        self._memoria = {}
+        self._trava = threading.Lock()
+
+    @staticmethod
+    def _ordenar(derivados):
+        """Ordena os derivados topologicamente (dependências antes dos dependentes)"""
+        ordem, visitando, visitados = [], set(), set()
+
+        def visitar(campo):
+            if campo in visitados or campo not in derivados:
+                return
+            if campo in visitando:
+                raise ValueError(f"Dependência circular no campo derivado '{campo}'")
+            visitando.add(campo)
+            for dependencia in derivados[campo][1:]:
+                visitar(dependencia)
+            visitando.discard(campo)
+            visitados.add(campo)
+            ordem.append(campo)
+
+        for campo in derivados:
+            visitar(campo)
+        return ordem
+
+    def calcular(self, valores):
+        """Retorna os campos derivados, reaproveitando os que não tiveram entradas alteradas"""
+        resultado = {}
+        with self._trava:
+            for campo in self._ordem:
+                funcao, *dependencias = self._derivados[campo]
+                entradas = tuple(resultado[d] if d in resultado else valores[d] for d in dependencias)
+                anterior = self._memoria.get(campo)
+                if anterior is None or anterior[0] != entradas:
+                    anterior = (entradas, funcao(*entradas))
+                    self._memoria[campo] = anterior
+                resultado[campo] = anterior[1]
+        return resultado
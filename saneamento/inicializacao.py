@@ -0,0 +1,130 @@
+"""
+Orçamento de cold start: perfil das importações de inicialização e das adiadas.
+
+O dashboard importa no topo apenas o necessário para o primeiro rerun (o Plotly
+já vem com o próprio Streamlit). Módulos usados só com um arquivo bruto, uma fonte
+opcional ou no cache frio de uma seção são importados dentro da função que os usa;
+o `import` comum é seguro entre as threads das sessões.
+
+O perfil executa, num processo novo com `python -X importtime`, as importações de
+topo do script e mostra o tempo acumulado de cada módulo contra um orçamento
+(sai com código 1 quando o total passa dele). Em seguida mede, com as de topo já
+carregadas, o custo a mais de cada importação adiada, pago só no primeiro uso:
+
+    python -m saneamento.inicializacao --orcamento-ms 1500
+"""
+
+import argparse
+import ast
+import os
+import re
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(RAIZ, 'dashboard-saneamento.py')
+
+# Orçamento padrão (ms) para as importações feitas antes da primeira renderização
+ORCAMENTO_PADRAO_MS = 1500
+
+_MARCADOR = '--saneamento-inicio--'
+_LINHA_IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$')
+
+
+
+def importacoes_iniciais(script=SCRIPT):
+    """Módulos importados no nível de topo do script, na ordem em que aparecem"""
+    with open(script, encoding='utf-8') as arquivo:
+        arvore = ast.parse(arquivo.read(), filename=script)
+
+    modulos = []
+    for no in arvore.body:
+        if isinstance(no, ast.Import):
+            modulos.extend(alias.name for alias in no.names)
+        elif isinstance(no, ast.ImportFrom) and no.level == 0:
+            modulos.append(no.module)
+    return list(dict.fromkeys(modulos))
+
+
+def importacoes_adiadas(script=SCRIPT):
+    """Módulos importados dentro de funções ou blocos do script (fora do nível de topo), na ordem em que aparecem"""
+    with open(script, encoding='utf-8') as arquivo:
+        arvore = ast.parse(arquivo.read(), filename=script)
+
+    topo = set(map(id, arvore.body))
+    modulos = []
+    for no in ast.walk(arvore):
+        if id(no) in topo:
+            continue
+        if isinstance(no, ast.Import):
+            modulos.extend(alias.name for alias in no.names)
+        elif isinstance(no, ast.ImportFrom) and no.level == 0:
+            modulos.append(no.module)
+    iniciais = set(importacoes_iniciais(script))
+    return [modulo for modulo in dict.fromkeys(modulos) if modulo not in iniciais]
+
+
+def perfil_importacoes(modulos, executavel=sys.executable, carregados=()):
+    """
+    Tempo de importação (ms) de cada módulo, na ordem dada, num interpretador novo.
+
+    Retorna uma lista de dicts `modulo`, `proprio_ms` e `acumulado_ms`, um por
+    importação de primeiro nível; módulos já carregados por um anterior não
+    aparecem, pois não custam nada a mais. Os módulos de `carregados` são
+    importados antes e ficam fora da medição.
+    """
+    codigo = ''.join(f'import {modulo}\n' for modulo in carregados)
+    codigo += f'import sys; sys.stderr.write({_MARCADOR!r} + "\\n")\n'
+    codigo += ''.join(f'import {modulo}\n' for modulo in modulos)
+    resultado = subprocess.run(
+        [executavel, '-X', 'importtime', '-c', codigo],
+        cwd=RAIZ, capture_output=True, text=True,
+    )
+    if resultado.returncode != 0:
+        raise RuntimeError(f'Falha ao importar os módulos de inicialização:\n{resultado.stderr[-2000:]}')
+
+    linhas = resultado.stderr.split(f'{_MARCADOR}\n', 1)[-1].splitlines()
+    perfil = []
+    for linha in linhas:
+        encontrado = _LINHA_IMPORTTIME.match(linha)
+        # Recuo zero: importação feita diretamente pelo script (as demais estão aninhadas nela)
+        if encontrado and not encontrado.group(3):
+            perfil.append({
+                'modulo': encontrado.group(4),
+                'proprio_ms': int(encontrado.group(1)) / 1000,
+                'acumulado_ms': int(encontrado.group(2)) / 1000,
+            })
+    return perfil
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--script', default=SCRIPT, help='script cujas importações de topo são medidas')
+    parser.add_argument('--orcamento-ms', type=float, default=ORCAMENTO_PADRAO_MS,
+                        help=f'orçamento total das importações (padrão: {ORCAMENTO_PADRAO_MS} ms)')
+    args = parser.parse_args(argv)
+
+    iniciais = importacoes_iniciais(args.script)
+    perfil = perfil_importacoes(iniciais)
+    total = sum(item['acumulado_ms'] for item in perfil)
+    for item in sorted(perfil, key=lambda item: item['acumulado_ms'], reverse=True):
+        fatia = item['acumulado_ms'] / args.orcamento_ms
+        print(f"{item['modulo']:<40} {item['acumulado_ms']:9.1f} ms  {fatia:6.1%} do orçamento")
+    print(f"{'total':<40} {total:9.1f} ms  de {args.orcamento_ms:.0f} ms")
+
+    adiadas = importacoes_adiadas(args.script)
+    if adiadas:
+        perfil_adiadas = perfil_importacoes(adiadas, carregados=iniciais)
+        print('\nimportações adiadas (pagas no primeiro uso, fora do orçamento):')
+        for item in perfil_adiadas:
+            print(f"{item['modulo']:<40} {item['acumulado_ms']:9.1f} ms")
+        print(f"{'total adiado':<40} {sum(item['acumulado_ms'] for item in perfil_adiadas):9.1f} ms")
+
+    if total > args.orcamento_ms:
+        print(f'ACIMA DO ORÇAMENTO em {total - args.orcamento_ms:.1f} ms')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
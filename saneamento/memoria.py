@@ -0,0 +1,71 @@
+"""
+Compactação de tipos dos DataFrames carregados e relatório de memória por fonte.
+
+`compactar` reduz cada coluna ao menor tipo que guarda os mesmos valores:
+inteiros vão para o menor inteiro com sinal que comporta a faixa, e textos
+repetidos (chaves, unidades, meses em séries longas) viram `category`. Colunas
+de texto livre (`descricao`) são descartadas, a menos que alguma visão as peça.
+Floats continuam em float64: valores monetários perdem centavos em float32.
+"""
+
+import pandas as pd
+
+from saneamento.formatacao import percentual
+
+# Colunas de texto livre, exibidas só em tooltips/descrições; descartadas por padrão
+COLUNAS_TEXTO_LIVRE = ('descricao',)
+
+# Chave de `DataFrame.attrs` com o uso de memória (bytes) antes da compactação
+ATRIBUTO_ORIGINAL = 'memoria_original'
+
+
+def memoria(df):
+    """Memória ocupada por `df` em bytes, contando o conteúdo das strings"""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def _compactar_coluna(serie):
+    """A coluna no menor tipo equivalente (ou ela mesma, se não houver ganho)"""
+    if pd.api.types.is_bool_dtype(serie.dtype):
+        return serie
+    if pd.api.types.is_integer_dtype(serie.dtype):
+        return pd.to_numeric(serie, downcast='integer')
+    if pd.api.types.is_string_dtype(serie.dtype) or pd.api.types.is_object_dtype(serie.dtype):
+        # Só vale a pena quando os valores se repetem: em tabelas curtas de chaves únicas
+        # os códigos e as categorias ocupam mais do que as próprias strings
+        candidata = serie.astype('category')
+        if candidata.memory_usage(index=False, deep=True) < serie.memory_usage(index=False, deep=True):
+            return candidata
+    return serie
+
+
+def compactar(df, manter=(), descartar=COLUNAS_TEXTO_LIVRE):
+    """
+    Cópia compacta de `df`; as colunas de `descartar` que não estão em `manter` são removidas.
+
+    O uso de memória original fica em `df.attrs['memoria_original']`, usado pelo relatório.
+    """
+    original = memoria(df)
+    removidas = [coluna for coluna in descartar if coluna in df.columns and coluna not in manter]
+    compacto = pd.DataFrame({coluna: _compactar_coluna(df[coluna]) for coluna in df.columns if coluna not in removidas},
+                            index=df.index)
+    compacto.attrs[ATRIBUTO_ORIGINAL] = original
+    return compacto
+
+
+def relatorio_memoria(frames):
+    """Linhas, colunas e memória (KB) antes e depois da compactação de cada fonte"""
+    relatorio = []
+    for fonte, df in frames.items():
+        atual = memoria(df)
+        original = df.attrs.get(ATRIBUTO_ORIGINAL, atual)
+        relatorio.append({
+            'fonte': fonte,
+            'linhas': len(df),
+            'colunas': df.shape[1],
+            'original_kb': round(original / 1024, 1),
+            'compacto_kb': round(atual / 1024, 1),
+            'economia': percentual(1 - atual / original, casas=0) if original else percentual(None),
+            'tipos': ', '.join(f'{coluna}:{tipo}' for coluna, tipo in df.dtypes.astype(str).items()),
+        })
+    return relatorio
@@ -0,0 +1,188 @@
+"""
+Agregação dos microdados da PNAD Contínua (visita anual) por condição de saneamento.
+
+Espera um CSV com os nomes das variáveis no cabeçalho (ex.: exportado do arquivo
+de largura fixa do IBGE). O domicílio tem saneamento adequado quando a água vem
+da rede geral (S01007 = 1) e o esgoto vai para a rede geral ou fossa ligada à
+rede (S01012A = 1 ou 2). As médias usam o peso amostral V1028.
+
+As curvas de escolaridade por idade têm intervalo de confiança pela aproximação
+de Kish: variância ponderada dividida pelo tamanho efetivo da amostra (Σw)²/Σw².
+Não usa os pesos replicados do IBGE, então tende a subestimar o erro do desenho.
+"""
+
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+# Colunas lidas do arquivo da PNAD e seus tipos (float: as variáveis têm ausentes)
+COLUNAS_PNAD = {
+    'UF': 'int8',
+    'V1028': 'float64',    # peso do domicílio e das pessoas
+    'V2009': 'float64',    # idade
+    'VD3005': 'float64',   # anos de estudo
+    'VD4020': 'float64',   # rendimento mensal efetivo de todos os trabalhos
+    'S01007': 'float64',   # principal forma de abastecimento de água
+    'S01012A': 'float64',  # destino do esgoto do banheiro
+}
+
+# Códigos de UF do IBGE, pela sigla
+CODIGOS_UF = {
+    'RO': 11, 'AC': 12, 'AM': 13, 'RR': 14, 'PA': 15, 'AP': 16, 'TO': 17,
+    'MA': 21, 'PI': 22, 'CE': 23, 'RN': 24, 'PB': 25, 'PE': 26, 'AL': 27, 'SE': 28, 'BA': 29,
+    'MG': 31, 'ES': 32, 'RJ': 33, 'SP': 35, 'PR': 41, 'SC': 42, 'RS': 43,
+    'MS': 50, 'MT': 51, 'GO': 52, 'DF': 53,
+}
+
+# Colunas usadas pelas curvas de escolaridade por idade
+COLUNAS_IDADES = {coluna: COLUNAS_PNAD[coluna] for coluna in ('UF', 'V1028', 'V2009', 'VD3005', 'S01007', 'S01012A')}
+
+# Idade mínima para a média de anos de estudo (escolaridade concluída)
+IDADE_MINIMA_ESTUDO = 25
+
+# Idades das curvas: 0 a IDADE_MAXIMA (idades maiores entram na última)
+IDADE_MAXIMA = 100
+
+NIVEL_CONFIANCA = 0.95
+
+# Linhas lidas por bloco no leitor em streaming; limita a memória independentemente do tamanho do arquivo
+TAMANHO_BLOCO = 500_000
+
+# Versão da lógica de agregação, na variante do snapshot do dashboard: incrementar a cada
+# mudança no resultado, senão os snapshots dos arquivos brutos seguem servindo o antigo
+VERSAO_AGREGACAO = '2'
+
+GRUPOS = ('com_saneamento', 'sem_saneamento')
+
+DESCRICOES_RENDA = {
+    'com_saneamento': 'Domicílios com acesso a água tratada e esgoto',
+    'sem_saneamento': 'Domicílios sem acesso adequado a saneamento',
+}
+
+
+def saneamento_adequado(bloco):
+    """Máscara dos moradores de domicílios com água da rede geral e esgoto em rede"""
+    return bloco['S01007'].eq(1).to_numpy() & bloco['S01012A'].isin((1, 2)).to_numpy()
+
+
+def _somas_por_grupo(grupo, pesos, valores):
+    """Soma ponderada e soma dos pesos por grupo (0 = com, 1 = sem saneamento), ignorando ausentes"""
+    validos = ~np.isnan(valores)
+    grupo, pesos, valores = grupo[validos], pesos[validos], valores[validos]
+    return (np.bincount(grupo, weights=pesos * valores, minlength=2),
+            np.bincount(grupo, weights=pesos, minlength=2))
+
+
+def _filtrar(bloco, uf):
+    """Só as pessoas com resposta sobre água e esgoto e, se `uf` (sigla) for dada, da UF"""
+    mascara = bloco['S01007'].notna() & bloco['S01012A'].notna()
+    if uf is not None:
+        mascara &= bloco['UF'] == CODIGOS_UF[uf]
+    return bloco if mascara.all() else bloco[mascara]
+
+
+def parcial_pnad(bloco, uf=None):
+    """Somas ponderadas de renda e anos de estudo por grupo de um bloco (somáveis entre blocos)"""
+    bloco = _filtrar(bloco, uf)
+    grupo = (~saneamento_adequado(bloco)).astype(np.intp)
+    pesos = bloco['V1028'].to_numpy(dtype=np.float64)
+    adultos = bloco['V2009'].to_numpy(dtype=np.float64) >= IDADE_MINIMA_ESTUDO
+
+    renda, peso_renda = _somas_por_grupo(grupo, pesos, bloco['VD4020'].to_numpy(dtype=np.float64))
+    estudo, peso_estudo = _somas_por_grupo(grupo[adultos], pesos[adultos],
+                                           bloco['VD3005'].to_numpy(dtype=np.float64)[adultos])
+    return {'renda': renda, 'peso_renda': peso_renda, 'estudo': estudo, 'peso_estudo': peso_estudo,
+            **parcial_idades(bloco)}
+
+
+def parcial_idades(bloco, uf=None):
+    """Somas ponderadas de anos de estudo por grupo × idade (matrizes 2 × idades) de um bloco"""
+    bloco = _filtrar(bloco, uf)
+    idade = bloco['V2009'].to_numpy(dtype=np.float64)
+    estudo = bloco['VD3005'].to_numpy(dtype=np.float64)
+    validos = ~(np.isnan(idade) | np.isnan(estudo))
+
+    grupo = (~saneamento_adequado(bloco))[validos].astype(np.intp)
+    celula = grupo * (IDADE_MAXIMA + 1) + np.clip(idade[validos], 0, IDADE_MAXIMA).astype(np.intp)
+    pesos = bloco['V1028'].to_numpy(dtype=np.float64)[validos]
+    estudo = estudo[validos]
+
+    def somar(valores):
+        return np.bincount(celula, weights=valores, minlength=2 * (IDADE_MAXIMA + 1)).reshape(2, -1)
+
+    return {
+        'idade_peso': somar(pesos),
+        'idade_peso2': somar(pesos ** 2),
+        'idade_estudo': somar(pesos * estudo),
+        'idade_estudo2': somar(pesos * estudo ** 2),
+    }
+
+
+def _media(soma, peso):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return soma / peso
+
+
+def resumo_renda(parcial):
+    """Renda média mensal por grupo, no formato de `renda_ibge_<ano>.csv`"""
+    media = _media(parcial['renda'], parcial['peso_renda'])
+    return pd.DataFrame({
+        'categoria': list(DESCRICOES_RENDA),
+        'renda_media_mensal': media.round(2),
+        'descricao': list(DESCRICOES_RENDA.values()),
+    })
+
+
+def linha_escolaridade(parcial):
+    """Linha `escolaridade` de `educacao_ibge_inep_<ano>.csv` (média ponderada de anos de estudo)"""
+    com, sem = _media(parcial['estudo'], parcial['peso_estudo']).round(2)
+    return {'indicador': 'escolaridade', 'com_saneamento': com, 'sem_saneamento': sem, 'unidade': 'anos de estudo'}
+
+
+def resumo_escolaridade_idade(parcial, nivel=NIVEL_CONFIANCA):
+    """
+    Anos de estudo médios por idade e grupo, com intervalo de confiança.
+
+    Formato longo de `escolaridade_idade_pnad_<ano>.csv`: idade, saneamento,
+    media, ic_inferior, ic_superior e n_efetivo; idades sem amostra ficam de fora.
+    """
+    peso, peso2 = parcial['idade_peso'], parcial['idade_peso2']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media = parcial['idade_estudo'] / peso
+        variancia = np.maximum(parcial['idade_estudo2'] / peso - media ** 2, 0)
+        n_efetivo = peso ** 2 / peso2
+        erro = NormalDist().inv_cdf(0.5 + nivel / 2) * np.sqrt(variancia / n_efetivo)
+
+    grupos, idades = np.indices(peso.shape)
+    resumo = pd.DataFrame({
+        'idade': idades.ravel(),
+        'saneamento': np.asarray(GRUPOS)[grupos.ravel()],
+        'media': media.ravel().round(3),
+        'ic_inferior': np.maximum(media - erro, 0).ravel().round(3),
+        'ic_superior': (media + erro).ravel().round(3),
+        'n_efetivo': n_efetivo.ravel().round(1),
+    })
+    return resumo[peso.ravel() > 0].reset_index(drop=True)
+
+
+def agregar_escolaridade_idade(caminho, tamanho_bloco=TAMANHO_BLOCO, uf=None, separador=','):
+    """
+    Lê o CSV da PNAD em blocos e monta as curvas de escolaridade por idade e grupo.
+
+    Só as colunas necessárias são lidas e cada bloco vira somas por célula
+    (grupo × idade), então a memória não depende do tamanho do arquivo.
+    """
+    total = None
+    blocos = pd.read_csv(caminho, usecols=list(COLUNAS_IDADES), dtype=COLUNAS_IDADES,
+                         sep=separador, chunksize=tamanho_bloco)
+    for bloco in blocos:
+        parcial = parcial_idades(bloco, uf)
+        if total is None:
+            total = parcial
+        else:
+            for nome, valores in parcial.items():
+                total[nome] += valores
+    if total is None:
+        raise ValueError(f"Arquivo da PNAD sem linhas: '{caminho}'")
+    return resumo_escolaridade_idade(total)
@@ -0,0 +1,221 @@
+"""
+Pré-agregação paralela dos microdados públicos nos resumos lidos pelo dashboard.
+
+Lê os arquivos brutos (SIH/SUS, PNAD Contínua, ENEM e SINISA), divide cada um
+em trechos de bytes alinhados em quebras de linha e agrega os trechos num pool
+de processos. Cada trecho produz somas parciais (arrays numpy) que são somadas
+no processo principal, então o resultado não depende do número de processos.
+Os resumos são validados pelo esquema e só então gravados, de forma atômica,
+em `<destino>/<fonte>_<origem>_<ano>.csv`. Exemplo:
+
+    python -m saneamento.preagregar --ano 2023 --destino dados --uf DF \\
+        --sih RDDF23*.csv --pnad pnadc_2023_visita1.csv \\
+        --enem MICRODADOS_ENEM_2023.csv --sinisa sinisa_municipios_2023.csv
+
+Os arquivos devem ser CSV com os nomes das colunas no cabeçalho e sem quebras
+de linha dentro de campos entre aspas (o caso dos arquivos do DATASUS, IBGE e INEP).
+"""
+
+import argparse
+import io
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from saneamento import enem, pnad, sinisa
+from saneamento.esquema import validar
+from saneamento.sih import COLUNAS_SIH, parcial_sih, resumo_sih
+
+# Tamanho (bytes) de cada trecho agregado por um processo
+TAMANHO_TRECHO = 64 << 20
+
+# Por fonte bruta: colunas e tipos lidos, formato do CSV e função de agregação parcial
+FONTES_BRUTAS = {
+    'sih': {'colunas': COLUNAS_SIH, 'separador': ',', 'codificacao': 'latin-1',
+            'parcial': lambda bloco, uf: parcial_sih(bloco)},
+    'pnad': {'colunas': pnad.COLUNAS_PNAD, 'separador': ',', 'codificacao': 'utf-8',
+             'parcial': pnad.parcial_pnad},
+    'enem': {'colunas': enem.COLUNAS_ENEM, 'separador': enem.SEPARADOR, 'codificacao': enem.CODIFICACAO,
+             'parcial': enem.parcial_enem},
+    'sinisa': {'colunas': sinisa.COLUNAS_SINISA, 'separador': sinisa.SEPARADOR,
+               'codificacao': sinisa.CODIFICACAO, 'parcial': sinisa.parcial_sinisa},
+}
+
+
+def dividir_arquivo(caminho, tamanho_trecho=TAMANHO_TRECHO):
+    """Linha de cabeçalho e trechos `(inicio, fim)` em bytes, cada um terminando numa quebra de linha"""
+    with open(caminho, 'rb') as arquivo:
+        cabecalho = arquivo.readline()
+        inicio = arquivo.tell()
+        total = os.fstat(arquivo.fileno()).st_size
+        trechos = []
+        while inicio < total:
+            fim = inicio + tamanho_trecho
+            if fim < total:
+                # Avança até o fim da linha em que o trecho caiu
+                arquivo.seek(fim - 1)
+                arquivo.readline()
+                fim = arquivo.tell()
+            trechos.append((inicio, min(fim, total)))
+            inicio = fim
+    return cabecalho, trechos
+
+
+def nomes_colunas(cabecalho, fonte):
+    """Nomes das colunas a partir da linha de cabeçalho em bytes"""
+    especificacao = FONTES_BRUTAS[fonte]
+    texto = cabecalho.decode(especificacao['codificacao']).lstrip('\ufeff').rstrip('\r\n')
+    return [nome.strip().strip('"') for nome in texto.split(especificacao['separador'])]
+
+
+def agregar_trecho(tarefa):
+    """Somas parciais de um trecho `(fonte, caminho, inicio, fim, nomes, uf)`; roda nos processos do pool"""
+    fonte, caminho, inicio, fim, nomes, uf = tarefa
+    especificacao = FONTES_BRUTAS[fonte]
+    with open(caminho, 'rb') as arquivo:
+        arquivo.seek(inicio)
+        dados = arquivo.read(fim - inicio)
+    bloco = pd.read_csv(
+        io.BytesIO(dados),
+        header=None,
+        names=nomes,
+        usecols=list(especificacao['colunas']),
+        dtype=especificacao['colunas'],
+        sep=especificacao['separador'],
+        encoding=especificacao['codificacao'],
+    )
+    return especificacao['parcial'](bloco, uf)
+
+
+def _somar(parciais):
+    """Soma, chave a chave, as somas parciais dos trechos"""
+    total = None
+    for parcial in parciais:
+        if total is None:
+            total = {nome: valores.copy() for nome, valores in parcial.items()}
+        else:
+            for nome, valores in parcial.items():
+                total[nome] += valores
+    return total
+
+
+def agregar_fontes(arquivos, processos=None, tamanho_trecho=TAMANHO_TRECHO, uf=None, contexto=None):
+    """
+    Somas de cada fonte bruta, agregando todos os trechos de todos os arquivos num pool de processos.
+
+    `arquivos` mapeia a fonte bruta ('sih', 'pnad', 'enem', 'sinisa') para a lista
+    de caminhos; `processos=1` (ou um único trecho) agrega no próprio processo.
+    `contexto` escolhe o método de início dos processos (ex.: 'spawn' dentro de
+    um servidor com threads). Retorna fonte -> somas.
+    """
+    tarefas = []
+    for fonte, caminhos in arquivos.items():
+        for caminho in caminhos:
+            cabecalho, trechos = dividir_arquivo(caminho, tamanho_trecho)
+            nomes = nomes_colunas(cabecalho, fonte)
+            tarefas.extend((fonte, caminho, inicio, fim, nomes, uf) for inicio, fim in trechos)
+
+    if processos == 1 or len(tarefas) <= 1:
+        parciais = list(map(agregar_trecho, tarefas))
+    else:
+        contexto_mp = multiprocessing.get_context(contexto) if contexto else None
+        with ProcessPoolExecutor(max_workers=processos, mp_context=contexto_mp) as pool:
+            # `map` devolve na ordem das tarefas: as somas não dependem de qual processo terminou antes
+            parciais = list(pool.map(agregar_trecho, tarefas))
+
+    return {fonte: _somar(parcial for tarefa, parcial in zip(tarefas, parciais) if tarefa[0] == fonte)
+            for fonte in arquivos}
+
+
+def agregar_notas_enem(caminho, processos=None, uf=None, tamanho_trecho=TAMANHO_TRECHO, contexto='spawn'):
+    """Distribuição das notas do ENEM por grupo (`enem.resumo_notas`) a partir dos microdados, em paralelo"""
+    somas = agregar_fontes({'enem': [caminho]}, processos, tamanho_trecho, uf, contexto)
+    return enem.resumo_notas(somas['enem'])
+
+
+def montar_resumos(somas):
+    """DataFrames por fonte do dashboard (saude, renda, educacao, cobertura e as opcionais) a partir das somas"""
+    resumos = {}
+    if 'sih' in somas:
+        resumos['saude'] = resumo_sih(somas['sih'])
+    if 'pnad' in somas:
+        resumos['renda'] = pnad.resumo_renda(somas['pnad'])
+        resumos['escolaridade_idade'] = pnad.resumo_escolaridade_idade(somas['pnad'])
+    if 'enem' in somas:
+        resumos['notas_enem'] = enem.resumo_notas(somas['enem'])
+    if 'pnad' in somas and 'enem' in somas:
+        resumos['educacao'] = pd.DataFrame([pnad.linha_escolaridade(somas['pnad']),
+                                            enem.linha_nota_enem(somas['enem'])])
+    if 'sinisa' in somas:
+        resumos['cobertura'] = sinisa.resumo_cobertura(somas['sinisa'])
+    return resumos
+
+
+# Nome do arquivo gravado para cada fonte do dashboard
+ARQUIVOS_SAIDA = {
+    'saude': 'saude_datasus_{ano}.csv',
+    'renda': 'renda_ibge_{ano}.csv',
+    'educacao': 'educacao_ibge_inep_{ano}.csv',
+    'cobertura': 'cobertura_sinisa_{ano}.csv',
+    'escolaridade_idade': 'escolaridade_idade_pnad_{ano}.csv',
+    'notas_enem': 'notas_enem_inep_{ano}.csv',
+}
+
+
+def gravar_resumos(resumos, destino, ano):
+    """Valida todos os resumos e grava cada um de forma atômica; retorna os caminhos gravados"""
+    for fonte, df in resumos.items():
+        validar(df, fonte, origem='pré-agregação')
+
+    os.makedirs(destino, exist_ok=True)
+    gravados = []
+    for fonte, df in resumos.items():
+        caminho = os.path.join(destino, ARQUIVOS_SAIDA[fonte].format(ano=ano))
+        temporario = f'{caminho}.{os.getpid()}.tmp'
+        try:
+            df.to_csv(temporario, index=False)
+            os.replace(temporario, caminho)
+        finally:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+        gravados.append(caminho)
+    return gravados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ano', type=int, required=True)
+    parser.add_argument('--destino', required=True, help='pasta onde os resumos serão gravados')
+    parser.add_argument('--sih', nargs='+', default=[], help='arquivos RD (AIH reduzida) do SIH/SUS em CSV')
+    parser.add_argument('--pnad', nargs='+', default=[], help='microdados da PNAD Contínua (visita anual) em CSV')
+    parser.add_argument('--enem', nargs='+', default=[], help='microdados do ENEM (MICRODADOS_ENEM_<ano>.csv)')
+    parser.add_argument('--sinisa', nargs='+', default=[], help='base municipal do SINISA em CSV')
+    parser.add_argument('--uf', help='sigla da UF para filtrar PNAD, ENEM e SINISA (ex.: DF)')
+    parser.add_argument('--processos', type=int, default=os.cpu_count(),
+                        help='processos do pool (padrão: todos os núcleos)')
+    parser.add_argument('--tamanho-trecho-mb', type=int, default=TAMANHO_TRECHO >> 20,
+                        help=f'tamanho de cada trecho agregado (padrão: {TAMANHO_TRECHO >> 20} MB)')
+    args = parser.parse_args(argv)
+
+    arquivos = {fonte: getattr(args, fonte) for fonte in FONTES_BRUTAS if getattr(args, fonte)}
+    if not arquivos:
+        parser.error('informe ao menos uma fonte bruta (--sih, --pnad, --enem ou --sinisa)')
+    if bool(args.pnad) != bool(args.enem):
+        parser.error('o resumo de educação usa PNAD (escolaridade) e ENEM (nota): informe --pnad e --enem')
+    if args.uf is not None and args.uf.upper() not in pnad.CODIGOS_UF:
+        parser.error(f"UF desconhecida: '{args.uf}'")
+
+    inicio = time.perf_counter()
+    somas = agregar_fontes(arquivos, args.processos, args.tamanho_trecho_mb << 20,
+                           args.uf.upper() if args.uf else None)
+    for caminho in gravar_resumos(montar_resumos(somas), args.destino, args.ano):
+        print(caminho)
+    print(f'{sum(map(len, arquivos.values()))} arquivo(s) agregado(s) em {time.perf_counter() - inicio:.1f} s '
+          f'com {args.processos} processo(s)')
+
+
+if __name__ == '__main__':
+    main()
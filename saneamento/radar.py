@@ -0,0 +1,81 @@
+"""
+Normalização vetorizada de matrizes indicadores × grupos para gráficos radar.
+
+Cada linha é um indicador e cada coluna um grupo (condição de saneamento,
+região, ano, faixa de renda...). Todos os indicadores são normalizados de uma
+vez, com operações por linha, então centenas de grupos custam o mesmo que dois.
+
+Métodos:
+- 'maximo': valor / maior valor do indicador × 100 (o radar original)
+- 'minmax': (valor - mínimo) / (máximo - mínimo) × 100
+- 'zscore': (valor - média) / desvio padrão, em desvios (não limitado a 0-100)
+- 'referencia': valor / valor do grupo de referência × 100
+
+Indicadores em que menor é melhor (ex.: internações) são invertidos antes
+(`sentido=-1`): recíproco nos métodos de razão, sinal trocado nos de diferença.
+"""
+
+import warnings
+
+import numpy as np
+
+METODOS = ('maximo', 'minmax', 'zscore', 'referencia')
+
+# Métodos cujo resultado fica entre 0 e 100 (os demais dependem dos dados)
+METODOS_PERCENTUAIS = ('maximo', 'minmax')
+
+
+def normalizar(valores, metodo='maximo', referencia=None, sentido=None):
+    """
+    Matriz normalizada (mesma forma de `valores`, indicadores × grupos).
+
+    `referencia` é o índice da coluna de referência (obrigatório no método
+    'referencia'); `sentido` tem +1 ou -1 por indicador (padrão: todos +1).
+    Indicadores constantes ficam em 100 (ou 0 no z-score); valores ausentes
+    continuam ausentes e não entram no máximo, mínimo, média ou desvio.
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"Método de normalização desconhecido: '{metodo}' (use {', '.join(METODOS)})")
+    valores = np.atleast_2d(np.asarray(valores, dtype=np.float64))
+
+    if sentido is not None:
+        invertidos = np.asarray(sentido) < 0
+        if invertidos.any():
+            valores = valores.copy()
+            if metodo in ('maximo', 'referencia'):
+                with np.errstate(divide='ignore'):
+                    valores[invertidos] = 1 / valores[invertidos]
+            else:
+                valores[invertidos] = -valores[invertidos]
+
+    # Reduções que ignoram ausentes: um grupo sem valor não anula o indicador inteiro
+    with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        if metodo == 'maximo':
+            resultado = valores / np.nanmax(valores, axis=1, keepdims=True) * 100
+        elif metodo == 'minmax':
+            minimo = np.nanmin(valores, axis=1, keepdims=True)
+            resultado = (valores - minimo) / (np.nanmax(valores, axis=1, keepdims=True) - minimo) * 100
+        elif metodo == 'zscore':
+            resultado = ((valores - np.nanmean(valores, axis=1, keepdims=True))
+                         / np.nanstd(valores, axis=1, keepdims=True))
+        else:
+            if referencia is None:
+                raise ValueError("O método 'referencia' exige o índice do grupo de referência")
+            resultado = valores / valores[:, [referencia]] * 100
+
+    # Divisão por zero: indicador constante (ou referência nula)
+    constante = np.isnan(resultado) & ~np.isnan(valores)
+    resultado[constante] = 0.0 if metodo == 'zscore' else 100.0
+    return resultado
+
+
+def faixa_radial(normalizados, metodo):
+    """Faixa do eixo radial: 0-100 nos métodos percentuais, senão ajustada aos valores"""
+    if metodo in METODOS_PERCENTUAIS:
+        return [0, 100]
+    if metodo == 'zscore':
+        # Simétrica, com folga para os pontos não ficarem na borda
+        limite = float(max(1.0, np.ceil(np.nanmax(np.abs(normalizados)) * 1.1)))
+        return [-limite, limite]
+    return [0, float(max(100.0, np.ceil(np.nanmax(normalizados) / 10) * 10))]
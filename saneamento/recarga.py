@@ -0,0 +1,125 @@
+"""
+Recarga incremental dos arquivos de dados: cada partição tem uma versão publicada.
+
+O `MonitorRecarga` observa por polling os arquivos registrados (sem dependências
+externas). Quando um arquivo muda e fica estável por uma varredura, a nova versão
+é preparada em segundo plano (ex.: leitura, validação e gravação do snapshot) e
+só então publicada; até lá as sessões continuam usando a versão anterior. Se a
+preparação falhar (ex.: esquema inválido), a versão anterior segue publicada.
+
+A versão publicada leva o que a preparação devolveu (ex.: o caminho do snapshot
+validado): quem carrega uma versão lê esse artefato, e não o arquivo em disco,
+que pode já ter mudado sem ter sido publicado. Por isso o registro de um arquivo
+também o prepara, na própria chamada.
+
+As versões publicadas entram nas chaves de cache do dashboard, então só a fonte
+alterada é recarregada e só os campos e figuras que dependem dela são refeitos.
+"""
+
+import logging
+import os
+import threading
+import weakref
+
+# Intervalo (s) entre as varreduras dos arquivos observados
+INTERVALO_PADRAO = 2.0
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def assinatura(caminho):
+    """Assinatura barata de um arquivo (mtime em ns e tamanho); None se não existir"""
+    try:
+        info = os.stat(caminho)
+    except FileNotFoundError:
+        return None
+    return (info.st_mtime_ns, info.st_size)
+
+
+class MonitorRecarga:
+    """
+    Versões publicadas de arquivos de dados, atualizadas por uma thread de polling.
+
+    `versao(chave, caminho, preparar)` registra o arquivo na primeira chamada e
+    retorna a versão publicada, `(assinatura, artefato)`, onde `artefato` é o
+    retorno de `preparar()`. No registro `preparar()` roda na thread de quem
+    chamou (uma falha vai para ela: não há versão anterior para servir); depois,
+    na thread do monitor, antes de publicar cada nova versão.
+    """
+
+    def __init__(self, intervalo=INTERVALO_PADRAO):
+        self.intervalo = intervalo
+        self._itens = {}
+        self._trava = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = None
+
+    def versao(self, chave, caminho, preparar):
+        """Versão publicada de `caminho`, `(assinatura, artefato)` (registrado sob `chave` na primeira chamada)"""
+        with self._trava:
+            item = self._itens.get(chave)
+            if item is not None and item['caminho'] == caminho:
+                return item['publicada']
+
+        # Registro (ou troca de arquivo da chave): prepara fora da trava, sem segurar as outras sessões
+        atual = assinatura(caminho)
+        publicada = (atual, preparar())
+        with self._trava:
+            item = self._itens.get(chave)
+            if item is None or item['caminho'] != caminho:
+                item = {'caminho': caminho, 'preparar': preparar, 'publicada': publicada,
+                        'vista': None, 'falha': None}
+                self._itens[chave] = item
+                self._iniciar()
+            return item['publicada']
+
+    def versoes(self):
+        """Cópia das versões publicadas, por chave"""
+        with self._trava:
+            return {chave: item['publicada'] for chave, item in self._itens.items()}
+
+    def varrer(self):
+        """Uma varredura: prepara e publica os arquivos alterados e já estáveis; retorna as chaves publicadas"""
+        with self._trava:
+            itens = list(self._itens.items())
+
+        publicadas = []
+        for chave, item in itens:
+            atual = assinatura(item['caminho'])
+            anterior, item['vista'] = item['vista'], atual
+            # Só prepara quando a assinatura se repete entre varreduras (arquivo terminou de ser gravado)
+            if atual is None or atual == item['publicada'][0] or atual != anterior or atual == item['falha']:
+                continue
+            try:
+                artefato = item['preparar']()
+            except Exception:
+                item['falha'] = atual
+                _LOGGER.exception("Nova versão de '%s' rejeitada; a anterior continua publicada", item['caminho'])
+                continue
+            with self._trava:
+                item['publicada'] = (atual, artefato)
+            publicadas.append(chave)
+            _LOGGER.info("Nova versão de '%s' publicada", item['caminho'])
+        return publicadas
+
+    def parar(self):
+        """Encerra a thread de polling"""
+        self._parar.set()
+
+    def _iniciar(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=_observar, args=(weakref.ref(self), self._parar, self.intervalo),
+                name='saneamento-recarga', daemon=True,
+            )
+            self._thread.start()
+
+
+def _observar(referencia, parar, intervalo):
+    """Laço da thread: varre até o monitor ser parado ou descartado (ex.: cache limpo)"""
+    while not parar.wait(intervalo):
+        monitor = referencia()
+        if monitor is None:
+            return
+        monitor.varrer()
+        del monitor
@@ -0,0 +1,64 @@
+"""Redução de séries temporais longas para gráficos (LTTB) preservando pontos marcados"""
+
+import numpy as np
+
+# Acima deste número de pontos os traços passam a usar WebGL (go.Scattergl)
+LIMITE_WEBGL = 1000
+
+# Número máximo de pontos enviados ao navegador por série
+PONTOS_MAXIMOS = 2000
+
+
+def lttb(y, n_saida, x=None):
+    """
+    Índices escolhidos pelo Largest-Triangle-Three-Buckets para representar `y` com `n_saida` pontos.
+
+    O primeiro e o último ponto são sempre mantidos; em cada balde intermediário
+    fica o ponto que forma o maior triângulo com o ponto anterior escolhido e a
+    média do balde seguinte. Séries menores que `n_saida` são devolvidas inteiras.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_saida >= n or n_saida < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+
+    # Limites dos n_saida - 2 baldes intermediários (o primeiro e o último ponto ficam fora)
+    limites = np.linspace(1, n - 1, n_saida - 1).astype(np.intp)
+    # Médias de cada balde, via somas acumuladas (uma passada)
+    soma_x = np.concatenate(([0.0], np.cumsum(x)))
+    soma_y = np.concatenate(([0.0], np.cumsum(y)))
+    contagem = np.maximum(limites[1:] - limites[:-1], 1)
+    media_x = (soma_x[limites[1:]] - soma_x[limites[:-1]]) / contagem
+    media_y = (soma_y[limites[1:]] - soma_y[limites[:-1]]) / contagem
+
+    escolhidos = np.empty(n_saida, dtype=np.intp)
+    escolhidos[0], escolhidos[-1] = 0, n - 1
+    anterior = 0
+    for balde in range(n_saida - 2):
+        inicio, fim = limites[balde], max(limites[balde + 1], limites[balde] + 1)
+        # Referência do balde seguinte: sua média, ou o último ponto no último balde
+        if balde + 1 < len(media_x):
+            ref_x, ref_y = media_x[balde + 1], media_y[balde + 1]
+        else:
+            ref_x, ref_y = x[-1], y[-1]
+        areas = np.abs(
+            (x[anterior] - ref_x) * (y[inicio:fim] - y[anterior])
+            - (x[anterior] - x[inicio:fim]) * (ref_y - y[anterior])
+        )
+        anterior = inicio + int(np.argmax(areas))
+        escolhidos[balde + 1] = anterior
+    return escolhidos
+
+
+def reduzir_serie(y, n_saida=PONTOS_MAXIMOS, preservar=()):
+    """Índices ordenados da série reduzida por LTTB, incluindo sempre os índices em `preservar`"""
+    indices = lttb(y, n_saida)
+    if len(preservar):
+        indices = np.union1d(indices, np.asarray(preservar, dtype=np.intp))
+    return indices
+
+
+def usar_webgl(n_pontos, limite=LIMITE_WEBGL):
+    """Indica se uma série com `n_pontos` deve ser desenhada com WebGL"""
+    return n_pontos > limite
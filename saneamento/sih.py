@@ -0,0 +1,77 @@
+"""Agregação em blocos dos microdados de internação do SIH/SUS (AIH reduzida - RD)"""
+
+import numpy as np
+import pandas as pd
+
+MESES = ['Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho',
+         'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro']
+
+# Apenas as colunas do RD usadas pelo dashboard, com tipos compactos
+COLUNAS_SIH = {
+    'MES_CMPT': 'int8',
+    'DIAG_PRINC': 'category',
+    'VAL_TOT': 'float64',
+    'MORTE': 'int8',
+}
+
+# Categorias CID-10 de doenças de veiculação hídrica (DRSAI)
+CID_HIDRICAS = (
+    'A00', 'A01', 'A02', 'A03', 'A04', 'A05', 'A06', 'A07', 'A08', 'A09',  # infecções intestinais
+    'A27',  # leptospirose
+    'A71',  # tracoma
+    'B15',  # hepatite A
+    'B65',  # esquistossomose
+    'B76', 'B77', 'B79',  # helmintíases
+)
+
+# Versão da lógica de agregação, na variante do snapshot do dashboard: incrementar a cada
+# mudança no resultado, senão os snapshots dos arquivos brutos seguem servindo o antigo
+VERSAO_AGREGACAO = '1'
+
+# Linhas lidas por bloco; limita a memória independentemente do tamanho do arquivo
+TAMANHO_BLOCO = 500_000
+
+
+def parcial_sih(bloco, cids=CID_HIDRICAS):
+    """Internações, óbitos e custo por mês de um bloco de AIHs (somáveis entre blocos)"""
+    validos = bloco['DIAG_PRINC'].str[:3].isin(cids) & bloco['MES_CMPT'].between(1, 12)
+    bloco = bloco[validos]
+    mes = bloco['MES_CMPT'].to_numpy(dtype=np.intp) - 1
+    return {
+        'internacoes': np.bincount(mes, minlength=12).astype(np.int64),
+        'obitos': np.bincount(mes, weights=bloco['MORTE'].to_numpy(), minlength=12).astype(np.int64),
+        'custo': np.bincount(mes, weights=bloco['VAL_TOT'].to_numpy(), minlength=12),
+    }
+
+
+def resumo_sih(parcial):
+    """Resumo mensal no formato de `saude_datasus_<ano>.csv` a partir das somas parciais"""
+    return pd.DataFrame({
+        'mes': MESES,
+        'internacoes': parcial['internacoes'],
+        'obitos': parcial['obitos'],
+        'custo_total': parcial['custo'].round(2),
+    })
+
+
+def agregar_sih(caminho, tamanho_bloco=TAMANHO_BLOCO, cids=CID_HIDRICAS):
+    """
+    Lê o arquivo bruto de AIHs em blocos e agrega internações, óbitos e custo por mês.
+
+    Retorna um DataFrame no mesmo formato de `saude_datasus_<ano>.csv`
+    (mes, internacoes, obitos, custo_total), pronto para os gráficos de saúde.
+    """
+    total = {'internacoes': np.zeros(12, dtype=np.int64), 'obitos': np.zeros(12, dtype=np.int64),
+             'custo': np.zeros(12, dtype=np.float64)}
+
+    blocos = pd.read_csv(
+        caminho,
+        usecols=list(COLUNAS_SIH),
+        dtype=COLUNAS_SIH,
+        chunksize=tamanho_bloco,
+    )
+    for bloco in blocos:
+        for nome, valores in parcial_sih(bloco, cids).items():
+            total[nome] += valores
+
+    return resumo_sih(total)
@@ -0,0 +1,65 @@
+"""
+Agregação da base municipal do SINISA (antigo SNIS): população e atendimento de água e esgoto.
+
+Espera uma linha por município, com a sigla da UF, a população total e a
+população atendida com abastecimento de água (AG001) e com esgotamento
+sanitário (ES001), nos códigos de informação do SNIS.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Colunas lidas da base municipal e seus tipos
+COLUNAS_SINISA = {
+    'UF': 'category',
+    'POP_TOT': 'float64',
+    'AG001': 'float64',
+    'ES001': 'float64',
+}
+
+SEPARADOR = ';'
+CODIFICACAO = 'latin-1'
+
+DESCRICOES_COBERTURA = {
+    'populacao_total': 'População total',
+    'sem_agua_tratada': 'População sem acesso à água tratada',
+    'sem_coleta_esgoto': 'População sem coleta de esgoto',
+    'com_agua_tratada': 'População com acesso à água tratada',
+    'com_coleta_esgoto': 'População com coleta de esgoto',
+}
+
+
+def parcial_sinisa(bloco, uf=None):
+    """População total e atendida com água e esgoto de um bloco de municípios (somáveis entre blocos)"""
+    if uf is not None:
+        bloco = bloco[bloco['UF'] == uf]
+    # Valores ausentes contam como zero; o atendimento nunca passa da população do município
+    populacao = np.nan_to_num(bloco['POP_TOT'].to_numpy(dtype=np.float64))
+    agua = np.minimum(np.nan_to_num(bloco['AG001'].to_numpy(dtype=np.float64)), populacao)
+    esgoto = np.minimum(np.nan_to_num(bloco['ES001'].to_numpy(dtype=np.float64)), populacao)
+    return {
+        'populacao': np.array([populacao.sum()]),
+        'agua': np.array([agua.sum()]),
+        'esgoto': np.array([esgoto.sum()]),
+    }
+
+
+def resumo_cobertura(parcial):
+    """Cobertura de água e esgoto no formato de `cobertura_sinisa_<ano>.csv`"""
+    populacao = round(float(parcial['populacao'][0]))
+    agua = round(float(parcial['agua'][0]))
+    esgoto = round(float(parcial['esgoto'][0]))
+    valores = {
+        'populacao_total': populacao,
+        'sem_agua_tratada': populacao - agua,
+        'sem_coleta_esgoto': populacao - esgoto,
+        'com_agua_tratada': agua,
+        'com_coleta_esgoto': esgoto,
+    }
+    valor = pd.Series(valores, dtype='int64')
+    return pd.DataFrame({
+        'indicador': list(valores),
+        'valor': valor.to_numpy(),
+        'percentual': (valor / populacao * 100).round(1).to_numpy() if populacao else 0.0,
+        'descricao': list(DESCRICOES_COBERTURA.values()),
+    })
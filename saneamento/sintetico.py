@@ -0,0 +1,233 @@
+"""
+Gerador de dados sintéticos compatíveis com os esquemas de `dados/`.
+
+Produz, para um ano, os quatro arquivos lidos pelo dashboard mais os microdados
+brutos de AIH (`sih_aih_<ano>.csv`). As linhas são geradas e gravadas em blocos,
+então arquivos de vários GB não precisam caber em memória. Exemplo:
+
+    python -m saneamento.sintetico --destino /tmp/dados --escala 1000 --semente 42
+    python -m saneamento.sintetico --destino /tmp/dados --linhas 50000000
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from saneamento.sih import MESES
+
+DADOS_ORIGINAIS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dados')
+
+# Linhas de cada fonte nos arquivos originais (escala 1)
+LINHAS_BASE = {'saude': 12, 'renda': 2, 'educacao': 2, 'cobertura': 5}
+
+# Linhas geradas e gravadas de cada vez
+TAMANHO_BLOCO = 200_000
+
+# CIDs gerados nas AIHs e seus pesos; inclui não hídricos, que o agregador descarta
+CIDS = np.array(['A09', 'A090', 'A059', 'A080', 'A00', 'A01', 'B15', 'A27', 'J180', 'I10'])
+PESOS_CIDS = np.array([0.30, 0.15, 0.10, 0.08, 0.02, 0.03, 0.05, 0.02, 0.15, 0.10])
+
+# Códigos de UF do IBGE, usados para montar códigos de município de residência
+UFS = np.array([11, 12, 13, 14, 15, 16, 17, 21, 22, 23, 24, 25, 26, 27, 28, 29,
+                31, 32, 33, 35, 41, 42, 43, 50, 51, 52, 53])
+
+INDICADORES_COBERTURA = ['populacao_total', 'sem_agua_tratada', 'sem_coleta_esgoto',
+                         'com_agua_tratada', 'com_coleta_esgoto']
+
+
+def _blocos(total, tamanho_bloco):
+    """Tamanhos dos blocos que somam `total` linhas"""
+    while total > 0:
+        atual = min(total, tamanho_bloco)
+        yield atual
+        total -= atual
+
+
+def _gravar_em_blocos(caminho, base, gerar_bloco, linhas, tamanho_bloco):
+    """Grava o DataFrame `base` e depois as linhas sintéticas, bloco a bloco"""
+    with open(caminho, 'w', encoding='utf-8', newline='') as arquivo:
+        base.to_csv(arquivo, index=False)
+        inicio = 0
+        for tamanho in _blocos(linhas - len(base), tamanho_bloco):
+            gerar_bloco(inicio, tamanho).to_csv(arquivo, index=False, header=False)
+            inicio += tamanho
+
+
+def gerar_sih(caminho, linhas, rng, ano=2023, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Grava `linhas` AIHs sintéticas (mês, município, CID, valor, óbito).
+
+    A sazonalidade mensal, a letalidade e o custo médio seguem o resumo original
+    de saúde. Retorna o resumo mensal das internações geradas.
+    """
+    original = pd.read_csv(os.path.join(DADOS_ORIGINAIS, 'saude_datasus_2023.csv'))
+    p_mes = (original['internacoes'] / original['internacoes'].sum()).to_numpy()
+    letalidade = original['obitos'].sum() / original['internacoes'].sum()
+    custo_medio = original['custo_total'].sum() / original['internacoes'].sum()
+
+    internacoes = np.zeros(12, dtype=np.int64)
+    obitos = np.zeros(12, dtype=np.int64)
+    custo = np.zeros(12)
+
+    with open(caminho, 'w', encoding='utf-8', newline='') as arquivo:
+        arquivo.write('ANO_CMPT,MES_CMPT,MUNIC_RES,DIAG_PRINC,VAL_TOT,MORTE\n')
+        for tamanho in _blocos(linhas, tamanho_bloco):
+            mes = rng.choice(12, size=tamanho, p=p_mes)
+            morte = (rng.random(tamanho) < letalidade).astype(np.int8)
+            valor = rng.gamma(4.0, custo_medio / 4.0, tamanho).round(2)
+            bloco = pd.DataFrame({
+                'ANO_CMPT': ano,
+                'MES_CMPT': mes + 1,
+                'MUNIC_RES': rng.choice(UFS, tamanho) * 10_000 + rng.integers(0, 10_000, tamanho),
+                'DIAG_PRINC': rng.choice(CIDS, tamanho, p=PESOS_CIDS),
+                'VAL_TOT': valor,
+                'MORTE': morte,
+            })
+            bloco.to_csv(arquivo, index=False, header=False)
+
+            internacoes += np.bincount(mes, minlength=12)
+            obitos += np.bincount(mes, weights=morte, minlength=12).astype(np.int64)
+            custo += np.bincount(mes, weights=valor, minlength=12)
+
+    return pd.DataFrame({'mes': MESES, 'internacoes': internacoes,
+                         'obitos': obitos, 'custo_total': custo.round(2)})
+
+
+def gerar_renda(caminho, linhas, rng, tamanho_bloco=TAMANHO_BLOCO):
+    """Renda média mensal por categoria de domicílio (condição de saneamento × faixa × RA)"""
+    base = pd.read_csv(os.path.join(DADOS_ORIGINAIS, 'renda_ibge_2023.csv'))
+
+    def bloco(inicio, tamanho):
+        indice = np.arange(inicio, inicio + tamanho)
+        com = indice % 2 == 0
+        return pd.DataFrame({
+            'categoria': _chaves(np.where(com, 'com_saneamento_', 'sem_saneamento_'), indice),
+            'renda_media_mensal': np.where(com, rng.lognormal(8.5, 0.6, tamanho),
+                                           rng.lognormal(8.2, 0.6, tamanho)).round(2),
+            'descricao': np.where(com, 'Domicílios sintéticos com saneamento',
+                                  'Domicílios sintéticos sem saneamento'),
+        })
+
+    _gravar_em_blocos(caminho, base, bloco, linhas, tamanho_bloco)
+
+
+def gerar_educacao(caminho, linhas, rng, tamanho_bloco=TAMANHO_BLOCO):
+    """Escolaridade e nota do ENEM por categoria de domicílio, com e sem saneamento"""
+    base = pd.read_csv(os.path.join(DADOS_ORIGINAIS, 'educacao_ibge_inep_2023.csv'))
+
+    def bloco(inicio, tamanho):
+        indice = np.arange(inicio, inicio + tamanho)
+        enem = indice % 2 == 1
+        com = np.where(enem, rng.normal(540, 40, tamanho), rng.normal(10.9, 1.2, tamanho))
+        sem = com - np.where(enem, rng.normal(80, 15, tamanho), rng.normal(1.9, 0.4, tamanho))
+        return pd.DataFrame({
+            'indicador': _chaves(np.where(enem, 'nota_enem_', 'escolaridade_'), indice),
+            'com_saneamento': com.round(2),
+            'sem_saneamento': sem.round(2),
+            'unidade': np.where(enem, 'pontos', 'anos de estudo'),
+        })
+
+    _gravar_em_blocos(caminho, base, bloco, linhas, tamanho_bloco)
+
+
+def gerar_cobertura(caminho, linhas, rng, tamanho_bloco=TAMANHO_BLOCO):
+    """Cobertura SINISA por município: população e atendimento de água e esgoto"""
+    base = pd.read_csv(os.path.join(DADOS_ORIGINAIS, 'cobertura_sinisa_2023.csv'))
+    n_indicadores = len(INDICADORES_COBERTURA)
+    sal = int(rng.integers(1 << 31))
+
+    def bloco(inicio, tamanho):
+        indice = np.arange(inicio, inicio + tamanho)
+        municipio = indice // n_indicadores
+        tipo = indice % n_indicadores
+        # Sorteios por município, estáveis entre blocos (a semente entra pelo `sal`)
+        populacao = np.exp(9.5 + 1.2 * _normal_por_chave(municipio, sal)).round()
+        perc_sem_agua = 30 * _uniforme_por_chave(municipio, sal + 2)
+        perc_sem_esgoto = np.minimum(100, perc_sem_agua + 60 * _uniforme_por_chave(municipio, sal + 3))
+        percentual = np.select(
+            [tipo == 0, tipo == 1, tipo == 2, tipo == 3],
+            [100.0, perc_sem_agua, perc_sem_esgoto, 100 - perc_sem_agua],
+            100 - perc_sem_esgoto,
+        ).round(1)
+        nomes = np.array(INDICADORES_COBERTURA)[tipo]
+        return pd.DataFrame({
+            'indicador': _chaves(np.char.add(nomes, '_'), municipio, 7),
+            'valor': (populacao * percentual / 100).round().astype(np.int64),
+            'percentual': percentual,
+            'descricao': 'Município sintético',
+        })
+
+    _gravar_em_blocos(caminho, base, bloco, linhas, tamanho_bloco)
+
+
+def _chaves(prefixos, numeros, digitos=9):
+    """Monta chaves `prefixo + número com zeros à esquerda` de forma vetorizada"""
+    return np.char.add(prefixos, np.char.zfill(numeros.astype(str), digitos))
+
+
+def _uniforme_por_chave(chaves, fluxo):
+    """Uniforme em [0, 1) determinística por chave (hash inteiro), sem estado entre blocos"""
+    x = chaves.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15) + np.uint64(fluxo)
+    x ^= x >> np.uint64(33)
+    x *= np.uint64(0xFF51AFD7ED558CCD)
+    x ^= x >> np.uint64(33)
+    return (x >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def _normal_por_chave(chaves, fluxo):
+    """Normal padrão determinística por chave (Box-Muller sobre duas uniformes)"""
+    u1 = np.maximum(_uniforme_por_chave(chaves, fluxo), 1e-12)
+    u2 = _uniforme_por_chave(chaves, fluxo + 1000)
+    return np.sqrt(-2 * np.log(u1)) * np.cos(2 * np.pi * u2)
+
+
+def gerar_dados(destino, linhas, semente=0, ano=2023, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Gera os arquivos de todas as fontes em `destino`.
+
+    `linhas` é um dicionário fonte -> número de linhas (saude conta AIHs brutas);
+    as tabelas de indicadores mantêm as linhas originais no início. A mesma
+    semente e o mesmo tamanho de bloco reproduzem exatamente os mesmos arquivos.
+    """
+    os.makedirs(destino, exist_ok=True)
+    # Um gerador independente por fonte: o tamanho de uma fonte não altera as outras
+    rng_saude, rng_renda, rng_educacao, rng_cobertura = (
+        np.random.default_rng(s) for s in np.random.SeedSequence(semente).spawn(4)
+    )
+
+    resumo = gerar_sih(os.path.join(destino, f'sih_aih_{ano}.csv'), linhas['saude'], rng_saude, ano, tamanho_bloco)
+    resumo.to_csv(os.path.join(destino, f'saude_datasus_{ano}.csv'), index=False)
+    gerar_renda(os.path.join(destino, f'renda_ibge_{ano}.csv'), linhas['renda'], rng_renda, tamanho_bloco)
+    gerar_educacao(os.path.join(destino, f'educacao_ibge_inep_{ano}.csv'), linhas['educacao'], rng_educacao,
+                   tamanho_bloco)
+    gerar_cobertura(os.path.join(destino, f'cobertura_sinisa_{ano}.csv'), linhas['cobertura'], rng_cobertura,
+                    tamanho_bloco)
+
+
+def linhas_por_escala(escala):
+    """Número de linhas de cada fonte para `escala` vezes o tamanho original"""
+    return {fonte: base * escala for fonte, base in LINHAS_BASE.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--destino', required=True, help='pasta onde os CSVs serão gravados')
+    tamanho = parser.add_mutually_exclusive_group(required=True)
+    tamanho.add_argument('--escala', type=int, help='multiplica o tamanho de cada fonte original')
+    tamanho.add_argument('--linhas', type=int, help='número de linhas de cada fonte')
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--ano', type=int, default=2023)
+    parser.add_argument('--tamanho-bloco', type=int, default=TAMANHO_BLOCO)
+    args = parser.parse_args(argv)
+
+    if args.escala is not None:
+        linhas = linhas_por_escala(args.escala)
+    else:
+        linhas = {fonte: max(args.linhas, base) for fonte, base in LINHAS_BASE.items()}
+    gerar_dados(args.destino, linhas, args.semente, args.ano, args.tamanho_bloco)
+
+
+if __name__ == '__main__':
+    main()
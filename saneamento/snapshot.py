@@ -0,0 +1,118 @@
+"""Snapshots colunares (Parquet) dos arquivos de dados, invalidados pelo hash do conteúdo"""
+
+import glob
+import hashlib
+import importlib.util
+import os
+import threading
+
+import pandas as pd
+
+# Pasta (dentro de dados/) onde os snapshots são gravados
+PASTA_SNAPSHOTS = '.snapshots'
+
+# Incrementar quando o formato do snapshot mudar, para invalidar os antigos
+VERSAO_SNAPSHOT = '1'
+
+# Snapshots mantidos por arquivo e leitor: o publicado e o recém-preparado (ver saneamento.recarga)
+SNAPSHOTS_MANTIDOS = 2
+
+# Parquet depende do pyarrow (instalado junto com o Streamlit); sem ele, lê o CSV direto
+PARQUET_DISPONIVEL = importlib.util.find_spec('pyarrow') is not None
+
+
+def hash_arquivo(caminho, tamanho_bloco=1 << 20):
+    """Calcula o hash do conteúdo do arquivo, lendo em blocos"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(caminho, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(tamanho_bloco), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def caminho_snapshot(caminho, chave, variante='csv'):
+    """Monta o caminho do snapshot de um arquivo para uma chave de conteúdo"""
+    pasta = os.path.join(os.path.dirname(caminho), PASTA_SNAPSHOTS)
+    nome = os.path.splitext(os.path.basename(caminho))[0]
+    return os.path.join(pasta, f'{nome}.{variante}.{chave}.parquet')
+
+
+def carregar_com_snapshot(caminho, leitor=pd.read_csv, variante='csv', validar=None, versao_validacao=''):
+    """
+    Lê um arquivo de dados pelo snapshot colunar quando o hash do conteúdo confere.
+
+    Na primeira leitura (ou quando o arquivo muda) usa `leitor` e grava o resultado
+    em Parquet; as próximas leituras carregam só o Parquet. `variante` separa
+    snapshots do mesmo arquivo gerados por leitores diferentes.
+
+    `validar(df)` roda só quando o snapshot é gerado, antes de gravá-lo; como
+    `versao_validacao` entra na chave, um snapshot existente já passou pelas
+    regras atuais e não é validado de novo.
+    """
+    destino, df = _snapshot(caminho, leitor, variante, validar, versao_validacao)
+    return pd.read_parquet(destino) if df is None else df
+
+
+def preparar_snapshot(caminho, leitor=pd.read_csv, variante='csv', validar=None, versao_validacao=''):
+    """
+    Caminho do snapshot validado do conteúdo atual de `caminho`, gerado se ainda não existir.
+
+    Mesmas opções de `carregar_com_snapshot`. Retorna None quando não há snapshot
+    (sem pyarrow ou pasta somente leitura); a validação roda do mesmo jeito.
+    """
+    return _snapshot(caminho, leitor, variante, validar, versao_validacao)[0]
+
+
+def _snapshot(caminho, leitor, variante, validar, versao_validacao):
+    """Caminho do snapshot (ou None) e o DataFrame, se foi preciso lê-lo do arquivo"""
+    if not PARQUET_DISPONIVEL:
+        df = leitor(caminho)
+        if validar is not None:
+            validar(df)
+        return None, df
+
+    chave = hash_arquivo(caminho)
+    versao = f'v{VERSAO_SNAPSHOT}' + (f'e{versao_validacao}' if versao_validacao else '')
+    destino = caminho_snapshot(caminho, f'{versao}-{chave}', variante)
+
+    if os.path.exists(destino):
+        return destino, None
+
+    df = leitor(caminho)
+    if validar is not None:
+        validar(df)
+    return (destino if _gravar_snapshot(df, destino) else None), df
+
+
+def _gravar_snapshot(df, destino):
+    """Grava o snapshot de forma atômica e remove as versões antigas do mesmo arquivo; False se não gravou"""
+    pasta = os.path.dirname(destino)
+    prefixo = os.path.basename(destino).rsplit('.', 2)[0]
+    # pid e thread no nome: sessões e o monitor de recarga podem gravar ao mesmo tempo
+    temporario = f'{destino}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+    try:
+        os.makedirs(pasta, exist_ok=True)
+        df.to_parquet(temporario, index=False)
+        os.replace(temporario, destino)
+    except OSError:
+        # Pasta somente leitura (ex.: imagem de deploy): segue sem snapshot
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        return False
+
+    # Mantém os mais recentes: o anterior ainda pode ser a versão publicada até esta ser publicada
+    def recencia(snapshot):
+        try:
+            return os.stat(snapshot).st_mtime_ns
+        except OSError:
+            return 0
+
+    anteriores = [antigo for antigo in glob.glob(os.path.join(pasta, f'{glob.escape(prefixo)}.*.parquet'))
+                  if antigo != destino]
+    for antigo in sorted(anteriores, key=recencia, reverse=True)[SNAPSHOTS_MANTIDOS - 1:]:
+        try:
+            os.remove(antigo)
+        except OSError:
+            pass
+    return True
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from saneamento.consulta import DUCKDB_DISPONIVEL, MOTOR_PADRAO, Faixa, MotorConsulta
+
+MOTORES_TESTADOS = [
+    pytest.param('duckdb', marks=pytest.mark.skipif(not DUCKDB_DISPONIVEL, reason='duckdb não instalado')),
+    'sqlite',
+    'pandas',
+]
+
+CONSULTAS = [
+    ({'internacoes': ('soma', 'internacoes'), 'custo': ('media', 'custo'), 'linhas': ('contagem', None)}, (), None),
+    ({'internacoes': ('soma', 'internacoes'), 'maior': ('maximo', 'custo')}, ('mes',), {'uf': 'DF'}),
+    ({'internacoes': ('soma', 'internacoes'), 'menor': ('minimo', 'custo'), 'linhas': ('contagem', None)},
+     ('uf', 'mes'), {'mes': ['Jan', 'Mar'], 'internacoes': Faixa(10, None)}),
+    ({'internacoes': ('soma', 'internacoes')}, (), {'custo': Faixa(None, 50), 'mes': ('Fev',)}),
+]
+
+
+@pytest.fixture(scope='module')
+def saude():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'mes': pd.Categorical(rng.choice(['Jan', 'Fev', 'Mar'], 2000)),
+        'uf': rng.choice(['DF', 'GO'], 2000),
+        'internacoes': rng.integers(0, 100, 2000),
+        'custo': rng.random(2000) * 100,
+    })
+
+
+def _esperado(df, medidas, por, filtros):
+    """A mesma agregação feita à mão no pandas"""
+    mascara = np.ones(len(df), dtype=bool)
+    for coluna, valor in (filtros or {}).items():
+        if isinstance(valor, Faixa):
+            if valor.minimo is not None:
+                mascara &= df[coluna] >= valor.minimo
+            if valor.maximo is not None:
+                mascara &= df[coluna] <= valor.maximo
+        elif isinstance(valor, (list, tuple)):
+            mascara &= df[coluna].isin(valor)
+        else:
+            mascara &= df[coluna] == valor
+    linhas = df[mascara].assign(**{por_coluna: df[por_coluna].astype(str) for por_coluna in por})
+    funcoes = {'soma': 'sum', 'media': 'mean', 'minimo': 'min', 'maximo': 'max'}
+
+    def agregar(grupo):
+        return pd.Series({nome: len(grupo) if coluna is None else grupo[coluna].agg(funcoes[funcao])
+                          for nome, (funcao, coluna) in medidas.items()})
+
+    if not por:
+        return agregar(linhas).to_frame().T
+    return linhas.groupby(list(por)).apply(agregar, include_groups=False).reset_index()
+
+
+@pytest.mark.parametrize('motor', MOTORES_TESTADOS)
+@pytest.mark.parametrize('medidas, por, filtros', CONSULTAS)
+def test_agregacoes_iguais_a_referencia(saude, motor, medidas, por, filtros):
+    consulta = MotorConsulta(motor)
+    consulta.registrar('saude', saude, indices=['mes'])
+    resultado = consulta.agregar('saude', medidas, por, filtros)
+    esperado = _esperado(saude, medidas, por, filtros)
+
+    assert list(resultado.columns) == [*por, *medidas]
+    for coluna in por:
+        assert resultado[coluna].astype(str).tolist() == esperado[coluna].tolist()
+    np.testing.assert_allclose(resultado[list(medidas)].to_numpy(dtype=float),
+                               esperado[list(medidas)].to_numpy(dtype=float))
+    consulta.fechar()
+
+
+def test_motor_padrao_e_o_duckdb_ou_o_sqlite_indexado():
+    assert MOTOR_PADRAO == ('duckdb' if DUCKDB_DISPONIVEL else 'sqlite')
+    assert MotorConsulta().motor == MOTOR_PADRAO
+
+
+def test_motor_pandas_nao_copia_a_tabela(saude):
+    consulta = MotorConsulta('pandas')
+    consulta.registrar('saude', saude)
+    assert consulta._tabelas['saude'] is saude
+    assert consulta.tabelas() == ['saude']
+
+
+@pytest.mark.parametrize('motor', MOTORES_TESTADOS)
+def test_erros(saude, motor):
+    consulta = MotorConsulta(motor)
+    consulta.registrar('saude', saude)
+    with pytest.raises(KeyError, match='não registrada'):
+        consulta.agregar('renda', {'n': ('contagem', None)})
+    with pytest.raises(KeyError, match='Colunas inexistentes'):
+        consulta.agregar('saude', {'n': ('soma', 'obitos')})
+    with pytest.raises(ValueError, match='desconhecida'):
+        consulta.agregar('saude', {'n': ('mediana', 'custo')})
+    # Lista vazia de valores não seleciona nenhuma linha
+    vazio = consulta.agregar('saude', {'n': ('contagem', None), 'soma': ('soma', 'custo')}, filtros={'mes': []})
+    assert vazio['n'].iloc[0] == 0 and pd.isna(vazio['soma'].iloc[0])
+    with pytest.raises(ValueError, match='Motor de consulta desconhecido'):
+        MotorConsulta('oracle')
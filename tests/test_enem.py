@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from saneamento.enem import (COLUNAS_NOTAS, GRUPOS, LARGURA_CLASSE, QUANTIS, estatisticas_notas, parcial_enem,
+                             resumo_notas)
+
+
+def _microdados(n, semente=0):
+    rng = np.random.default_rng(semente)
+    dados = pd.DataFrame({coluna: rng.normal(520, 80, n).clip(0, 999) for coluna in COLUNAS_NOTAS})
+    dados['SG_UF_PROVA'] = pd.Categorical(rng.choice(['DF', 'SP'], n))
+    dados['Q008'] = pd.Categorical(rng.choice(['A', 'B', 'C'], n, p=[0.1, 0.6, 0.3]))
+    return dados
+
+
+def test_media_e_quantis_conferem_com_o_pandas():
+    dados = _microdados(20_000)
+    estatisticas = estatisticas_notas(resumo_notas(parcial_enem(dados)))
+    media = dados[COLUNAS_NOTAS].mean(axis=1)
+    sem_banheiro = dados['Q008'] == 'A'
+    for grupo, mascara in zip(GRUPOS, (~sem_banheiro, sem_banheiro)):
+        notas = media[mascara]
+        assert estatisticas[grupo]['participantes'] == len(notas)
+        assert estatisticas[grupo]['media'] == pytest.approx(notas.mean(), abs=0.01)
+        # Interpolação dentro da classe: erro menor que a largura da classe
+        esperados = notas.quantile(list(QUANTIS))
+        for q in QUANTIS:
+            assert abs(estatisticas[grupo]['quantis'][q] - esperados[q]) < LARGURA_CLASSE
+        assert sum(estatisticas[grupo]['histograma']['fracao']) == pytest.approx(1)
+
+
+def test_notas_incompletas_ficam_de_fora():
+    dados = _microdados(100)
+    dados.loc[:9, 'NU_NOTA_REDACAO'] = np.nan
+    dados.loc[10:14, 'Q008'] = np.nan
+    parcial = parcial_enem(dados)
+    assert parcial['participantes'].sum() == 85
+
+
+def test_grupo_vazio_tem_entrada_explicita():
+    dados = _microdados(500)
+    dados['Q008'] = pd.Categorical(['B'] * len(dados))
+    estatisticas = estatisticas_notas(resumo_notas(parcial_enem(dados)))
+    assert set(estatisticas) == set(GRUPOS)
+    vazio = estatisticas['sem_saneamento']
+    assert vazio['participantes'] == 0
+    assert np.isnan(vazio['media'])
+    assert list(vazio['quantis']) == list(QUANTIS) and np.isnan(list(vazio['quantis'].values())).all()
+    assert vazio['histograma']['inicio'] == estatisticas['com_saneamento']['histograma']['inicio']
+    assert not any(vazio['histograma']['fracao'])
+    assert estatisticas['com_saneamento']['participantes'] == len(dados)
+
+
+def test_resumo_vazio():
+    vazio = resumo_notas(parcial_enem(_microdados(50), uf='RJ'))
+    estatisticas = estatisticas_notas(vazio)
+    assert all(estatisticas[grupo]['participantes'] == 0 for grupo in GRUPOS)
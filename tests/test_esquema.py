@@ -0,0 +1,64 @@
+import os
+
+import pandas as pd
+import pytest
+
+from saneamento.esquema import ErroEsquema, validar, verificar
+
+DADOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dados')
+
+
+def _cobertura(**substituicoes):
+    df = pd.DataFrame({
+        'indicador': ['populacao_total', 'sem_agua_tratada', 'sem_coleta_esgoto', 'com_agua_tratada'],
+        'valor': [1000, 30, 100, 970],
+        'percentual': [100.0, 3.0, 10.0, 97.0],
+    })
+    for coluna, valores in substituicoes.items():
+        df[coluna] = valores
+    return df
+
+
+def test_particao_valida_passa_e_volta_o_proprio_df():
+    df = _cobertura()
+    assert validar(df, 'cobertura') is df
+    assert verificar(df, 'cobertura') == []
+
+
+def test_linhas_desagregadas_com_sufixo_numerico_sao_permitidas():
+    extras = pd.DataFrame({'indicador': ['populacao_total_0000001', 'sem_agua_tratada_0000001'],
+                           'valor': [10, 1], 'percentual': [100.0, 10.0]})
+    assert verificar(pd.concat([_cobertura(), extras], ignore_index=True), 'cobertura') == []
+
+
+@pytest.mark.parametrize('df, trecho', [
+    (pd.DataFrame(columns=['indicador', 'valor', 'percentual']), 'nenhuma linha'),
+    (_cobertura().drop(columns='percentual'), 'colunas ausentes: percentual'),
+    (_cobertura(valor=['1', '2', '3', '4']), "coluna 'valor' com tipo"),
+    (_cobertura(percentual=[100.0, None, 10.0, 97.0]), "coluna 'percentual' com 1 valor(es) ausente(s)"),
+    (_cobertura(percentual=[100.0, 3.0, 110.0, 97.0]), 'fora de [0, 100]'),
+    (_cobertura(valor=[1000, -1, 100, 970]), 'fora de [0, ]'),
+    (_cobertura(indicador=['populacao_total', 'sem_agua_tratada', 'sem_coleta', 'com_agua_tratada']),
+     'chaves obrigatórias ausentes'),
+    (_cobertura(indicador=['populacao_total', 'sem_agua_tratada', 'sem_coleta_esgoto', 'com_agua_tratda']),
+     "chave(s) não permitida(s) em 'indicador', ex.: com_agua_tratda"),
+])
+def test_rejeita_particao_fora_do_esquema(df, trecho):
+    with pytest.raises(ErroEsquema) as erro:
+        validar(df, 'cobertura', origem='cobertura_sinisa_2023.csv')
+    assert trecho in str(erro.value)
+    assert erro.value.fonte == 'cobertura'
+    assert 'cobertura_sinisa_2023.csv' in str(erro.value)
+
+
+def test_chave_com_sufixo_nao_numerico_e_rejeitada():
+    df = pd.DataFrame({'categoria': ['com_saneamento', 'sem_saneamento', 'sem_saneamento_rural'],
+                       'renda_media_mensal': [5000.0, 4000.0, 3000.0]})
+    with pytest.raises(ErroEsquema, match='sem_saneamento_rural'):
+        validar(df, 'renda')
+
+
+def test_arquivos_do_repositorio_seguem_o_esquema():
+    for fonte, arquivo in [('saude', 'saude_datasus_2023.csv'), ('renda', 'renda_ibge_2023.csv'),
+                           ('educacao', 'educacao_ibge_inep_2023.csv'), ('cobertura', 'cobertura_sinisa_2023.csv')]:
+        assert verificar(pd.read_csv(os.path.join(DADOS, arquivo)), fonte) == []
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from saneamento.formatacao import TEXTO_AUSENTE, formatar_numeros, inteiro, moeda, percentual
+
+
+@pytest.mark.parametrize('casas', [0, 1, 2, 3])
+@pytest.mark.parametrize('sinal', [False, True])
+def test_coluna_igual_ao_formato_escalar(casas, sinal):
+    rng = np.random.default_rng(casas)
+    valores = np.concatenate([
+        rng.normal(0, 1e7, 2000), rng.normal(0, 10, 2000),
+        [0.0, -0.0, -0.001, 0.125, 2.675, 1.115, 1e15, -999.5, 999.5, 999_999.999, np.inf, -np.inf],
+    ])
+    coluna = formatar_numeros(valores, casas=casas, prefixo='R$ ', sinal=sinal)
+    assert coluna == [formatar_numeros(valor, casas=casas, prefixo='R$ ', sinal=sinal) for valor in valores]
+
+
+def test_exemplos():
+    assert inteiro([1234567, 12, -1000]) == ['1.234.567', '12', '-1.000']
+    assert moeda(1234.5) == 'R$ 1.234,50'
+    assert percentual(0.123) == '12,3%'
+    assert percentual([0.05], sinal=True) == ['+5,0%']
+
+
+def test_ausentes_series_e_vazios():
+    serie = pd.Series([1.5, None, 3000], index=[5, 6, 7], name='valor')
+    formatada = moeda(serie)
+    assert formatada.tolist() == ['R$ 1,50', TEXTO_AUSENTE, 'R$ 3.000,00']
+    assert formatada.index.tolist() == [5, 6, 7] and formatada.name == 'valor'
+    assert inteiro([]) == []
+    assert inteiro([np.nan, np.nan]) == [TEXTO_AUSENTE, TEXTO_AUSENTE]
+    assert inteiro(['10', 'x']) == ['10', TEXTO_AUSENTE]
+    assert inteiro(None) == TEXTO_AUSENTE
+
+
+def test_valores_repetidos_voltam_as_suas_posicoes():
+    rng = np.random.default_rng(7)
+    distintos = np.array([0.0, -0.0, 1234.5, -1234.5, np.nan, 1e9])
+    valores = distintos[rng.integers(0, len(distintos), 5000)]
+    assert moeda(valores) == [moeda(valor) for valor in valores]
@@ -0,0 +1,101 @@
+import collections
+
+import numpy as np
+import pytest
+
+from saneamento.geo import RESOLUCOES, simplificar_geojson, simplificar_linha
+
+LADO = 4
+PASSO = 0.05
+
+
+def _malha():
+    """Malha LADO × LADO de RAs com divisas internas sinuosas e contorno externo reto"""
+    rng = np.random.default_rng(1)
+    limite = LADO * PASSO
+    nos = {}
+    for i in range(LADO + 1):
+        for j in range(LADO + 1):
+            x = i * PASSO + (rng.normal(0, 0.003) if 0 < i < LADO else 0)
+            y = j * PASSO + (rng.normal(0, 0.003) if 0 < j < LADO else 0)
+            nos[i, j] = (x, y)
+
+    divisas = {}
+
+    def divisa(a, b):
+        if (b, a) in divisas:
+            return divisas[b, a][::-1]
+        p, q = np.array(nos[a]), np.array(nos[b])
+        t = np.linspace(0, 1, 30)[1:-1, None]
+        pontos = p + (q - p) * t
+        externa = all(c in (0, limite) for c in (p[0], q[0])) and p[0] == q[0] or \
+            all(c in (0, limite) for c in (p[1], q[1])) and p[1] == q[1]
+        if not externa:
+            normal = np.array([p[1] - q[1], q[0] - p[0]]) / np.hypot(*(q - p))
+            pontos = pontos + normal * rng.normal(0, 0.002, (len(t), 1))
+        divisas[a, b] = [tuple(ponto) for ponto in pontos]
+        return divisas[a, b]
+
+    feicoes = []
+    for i in range(LADO):
+        for j in range(LADO):
+            cantos = [(i, j), (i + 1, j), (i + 1, j + 1), (i, j + 1)]
+            anel = []
+            for a, b in zip(cantos, cantos[1:] + cantos[:1]):
+                anel += [nos[a]] + divisa(a, b)
+            anel.append(anel[0])
+            feicoes.append({'type': 'Feature', 'properties': {'ra': f'{i}{j}'},
+                            'geometry': {'type': 'Polygon', 'coordinates': [[list(p) for p in anel]]}})
+    return {'type': 'FeatureCollection', 'features': feicoes}, limite
+
+
+@pytest.mark.parametrize('resolucao', list(RESOLUCOES))
+def test_divisas_compartilhadas_sem_frestas(resolucao):
+    geojson, limite = _malha()
+    tolerancia, casas = RESOLUCOES[resolucao]
+    simplificado = simplificar_geojson(geojson, tolerancia, casas)
+
+    arestas = collections.Counter()
+    for feicao in simplificado['features']:
+        anel = [tuple(p) for p in feicao['geometry']['coordinates'][0]]
+        assert anel[0] == anel[-1] and len(anel) >= 4
+        for a, b in zip(anel, anel[1:]):
+            arestas[frozenset((a, b))] += 1
+
+    def no_contorno(aresta):
+        return any(all(p[eixo] == valor for p in aresta) for eixo in (0, 1) for valor in (0, limite))
+
+    # Toda aresta interna é usada pelas duas RAs vizinhas, e só por elas
+    assert all(n == 2 for aresta, n in arestas.items() if not no_contorno(aresta))
+    assert all(n == 1 for aresta, n in arestas.items() if no_contorno(aresta))
+
+
+def test_simplificacao_reduz_vertices_e_mantem_propriedades():
+    geojson, _ = _malha()
+    simplificado = simplificar_geojson(geojson, *RESOLUCOES['baixa'])
+    antes = sum(len(f['geometry']['coordinates'][0]) for f in geojson['features'])
+    depois = sum(len(f['geometry']['coordinates'][0]) for f in simplificado['features'])
+    assert depois < antes / 2
+    assert [f['properties'] for f in simplificado['features']] == [f['properties'] for f in geojson['features']]
+
+
+def test_simplificar_linha_mantem_extremos():
+    pontos = np.column_stack([np.linspace(0, 1, 50), np.zeros(50)])
+    pontos[25, 1] = 0.5
+    resultado = simplificar_linha(pontos, 0.01)
+    # O pico e a sua base ficam; os pontos colineares somem
+    assert resultado.tolist() == [pontos[i].tolist() for i in (0, 24, 25, 26, 49)]
+
+
+def test_multipolygon_e_geometria_invalida():
+    quadrado = [[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]
+    multi = {'type': 'FeatureCollection', 'features': [
+        {'type': 'Feature', 'properties': {'ra': 'X'},
+         'geometry': {'type': 'MultiPolygon', 'coordinates': [[quadrado], [[[2, 2], [3, 2], [3, 3], [2, 2]]]]}},
+    ]}
+    resultado = simplificar_geojson(multi, 0.1, 3)
+    assert resultado['features'][0]['geometry']['type'] == 'MultiPolygon'
+    assert resultado['features'][0]['geometry']['coordinates'][0][0] == quadrado
+
+    with pytest.raises(ValueError):
+        simplificar_geojson({'features': [{'geometry': {'type': 'Point', 'coordinates': [0, 0]}}]}, 0.1, 3)
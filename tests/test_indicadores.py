@@ -0,0 +1,73 @@
+import os
+
+import pandas as pd
+import pytest
+
+from saneamento.indicadores import GrafoDerivados, RegistroIndicadores
+
+DADOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dados')
+
+
+def _registro():
+    educacao = pd.read_csv(os.path.join(DADOS, 'educacao_ibge_inep_2023.csv'))
+    renda = pd.read_csv(os.path.join(DADOS, 'renda_ibge_2023.csv'))
+    saude = pd.read_csv(os.path.join(DADOS, 'saude_datasus_2023.csv'))
+    return educacao, renda, RegistroIndicadores({'educacao': (educacao, 'indicador'), 'renda': (renda, 'categoria'),
+                                                 'saude': (saude, None)})
+
+
+def test_valores_iguais_a_busca_no_dataframe():
+    educacao, renda, registro = _registro()
+    for _, linha in educacao.iterrows():
+        for coluna in educacao.columns.drop('indicador'):
+            assert registro.valor('educacao', linha['indicador'], coluna) == linha[coluna]
+    valor = registro.valor('renda', 'com_saneamento', 'renda_media_mensal')
+    assert type(valor) is float
+    assert valor == renda.loc[renda['categoria'] == 'com_saneamento', 'renda_media_mensal'].iloc[0]
+
+
+def test_chave_repetida_usa_a_primeira_linha():
+    df = pd.DataFrame({'chave': ['a', 'b', 'a'], 'valor': [1, 2, 3]})
+    registro = RegistroIndicadores({'fonte': (df, 'chave')})
+    assert registro.valor('fonte', 'a', 'valor') == 1
+    assert type(registro.valor('fonte', 'a', 'valor')) is int
+
+
+def test_referencias_inexistentes():
+    _, _, registro = _registro()
+    for fonte, chave, coluna in (('renda', 'inexistente', 'renda_media_mensal'),
+                                 ('renda', 'com_saneamento', 'inexistente'), ('saude', 'Janeiro', 'obitos')):
+        with pytest.raises(KeyError, match='não encontrado'):
+            registro.valor(fonte, chave, coluna)
+
+
+def test_unir_e_extrair():
+    _, _, completo = _registro()
+    educacao = pd.read_csv(os.path.join(DADOS, 'educacao_ibge_inep_2023.csv'))
+    renda = pd.read_csv(os.path.join(DADOS, 'renda_ibge_2023.csv'))
+    unido = RegistroIndicadores.unir([RegistroIndicadores({'educacao': (educacao, 'indicador')}),
+                                      RegistroIndicadores({'renda': (renda, 'categoria')})])
+    campos = {'renda_com': ('renda', 'com_saneamento', 'renda_media_mensal'),
+              'escolaridade_sem': ('educacao', 'escolaridade', 'sem_saneamento')}
+    assert unido.extrair(campos) == completo.extrair(campos)
+
+
+def test_derivados_em_ordem_e_so_quando_mudam():
+    chamadas = []
+
+    def diferenca(a, b):
+        chamadas.append('diferenca')
+        return a - b
+
+    grafo = GrafoDerivados({'percentual': (lambda d, b: d / b * 100, 'diferenca', 'b'),
+                            'diferenca': (diferenca, 'a', 'b')})
+    assert grafo.calcular({'a': 30, 'b': 20}) == {'diferenca': 10, 'percentual': 50}
+    grafo.calcular({'a': 30, 'b': 20})
+    assert chamadas == ['diferenca']
+    assert grafo.calcular({'a': 40, 'b': 20})['percentual'] == 100
+    assert chamadas == ['diferenca', 'diferenca']
+
+
+def test_dependencia_circular():
+    with pytest.raises(ValueError, match='circular'):
+        GrafoDerivados({'x': (abs, 'y'), 'y': (abs, 'x')})
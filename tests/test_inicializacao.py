@@ -0,0 +1,20 @@
+from saneamento.inicializacao import importacoes_adiadas, importacoes_iniciais
+
+# Módulos usados só com arquivos brutos, fontes opcionais ou no cache frio de uma seção
+ADIADOS = {'saneamento.sih', 'saneamento.pnad', 'saneamento.preagregar', 'saneamento.enem', 'saneamento.geo',
+           'saneamento.montecarlo'}
+
+
+def test_modulos_opcionais_fora_das_importacoes_de_topo():
+    iniciais = set(importacoes_iniciais())
+    assert {'streamlit', 'plotly.graph_objects', 'saneamento.consulta'} <= iniciais
+    assert not iniciais & ADIADOS
+    assert ADIADOS <= set(importacoes_adiadas())
+
+
+def test_adiadas_de_um_script(tmp_path):
+    script = tmp_path / 'app.py'
+    script.write_text('import os\n\ndef f():\n    import json\n    from os import path\n    from . import x\n',
+                      encoding='utf-8')
+    assert importacoes_iniciais(script) == ['os']
+    assert importacoes_adiadas(script) == ['json']
@@ -0,0 +1,74 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from saneamento.montecarlo import (PERCENTIS, ParametrosRenda, carregar_parametros, estimar_parametros,
+                                   simular_renda)
+
+DADOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dados')
+PEQUENO = ParametrosRenda(anos=10, caminhos=5000)
+
+
+def test_mesma_semente_reproduz_o_resultado():
+    a, b = simular_renda(5000, 4000, PEQUENO), simular_renda(5000, 4000, PEQUENO)
+    for chave in ('com', 'sem', 'diferenca', 'media_com'):
+        np.testing.assert_array_equal(a[chave], b[chave])
+    assert not np.array_equal(a['com'], simular_renda(5000, 4000, PEQUENO._replace(semente=1))['com'])
+
+
+def test_sem_variancia_e_a_projecao_linear():
+    parametros = PEQUENO._replace(reajuste_medio=0.0, reajuste_desvio=0.0, inflacao_media=0.0,
+                                  inflacao_desvio=0.0, desvio_log_renda=0.0)
+    resultado = simular_renda(5000, 4000, parametros)
+    linear = 12 * np.arange(parametros.anos + 1)
+    for p in range(len(PERCENTIS)):
+        np.testing.assert_allclose(resultado['com'][p], 5000 * linear)
+        np.testing.assert_allclose(resultado['diferenca'][p], 1000 * linear)
+
+
+def test_numeros_aleatorios_comuns_entre_os_grupos():
+    resultado = simular_renda(5000, 4000, PEQUENO)
+    # Percentis ordenados e, com renda maior no grupo com saneamento, diferença sempre positiva
+    assert np.all(np.diff(resultado['diferenca'], axis=0) >= 0)
+    assert np.all(resultado['diferenca'][:, 1:] > 0)
+    # Cada grupo é o mesmo caminho escalado pela renda média
+    np.testing.assert_allclose(resultado['com'] / 5000, resultado['sem'] / 4000)
+    np.testing.assert_allclose(resultado['diferenca'], resultado['com'] - resultado['sem'])
+    np.testing.assert_allclose(resultado['media_com'][-1] / resultado['media_sem'][-1], 5000 / 4000)
+
+
+def test_diferenca_negativa_mantem_percentis_ordenados():
+    resultado = simular_renda(4000, 5000, PEQUENO)
+    assert np.all(np.diff(resultado['diferenca'], axis=0) >= 0)
+    assert np.all(resultado['diferenca'][:, 1:] < 0)
+
+
+def test_parametros_do_arquivo_do_repositorio():
+    parametros = carregar_parametros(os.path.join(DADOS, 'parametros_renda.csv'))
+    assert isinstance(parametros.caminhos, int) and isinstance(parametros.semente, int)
+    assert 0 < parametros.inflacao_media < parametros.reajuste_medio
+
+
+def test_parametro_desconhecido_no_arquivo(tmp_path):
+    arquivo = tmp_path / 'parametros.csv'
+    arquivo.write_text('parametro,valor\nanos,5\ninflacao,0.04\n', encoding='utf-8')
+    with pytest.raises(ValueError, match='inflacao'):
+        carregar_parametros(arquivo)
+    arquivo.write_text('parametro,valor\nanos,5\n', encoding='utf-8')
+    assert carregar_parametros(arquivo) == ParametrosRenda(anos=5)
+
+
+def test_dispersao_estimada_da_renda_desagregada():
+    rng = np.random.default_rng(0)
+    n = 20_000
+    com = np.arange(n) % 2 == 0
+    df = pd.DataFrame({
+        'categoria': [f"{'com' if c else 'sem'}_saneamento_{i:09d}" for i, c in enumerate(com)],
+        'renda_media_mensal': np.where(com, rng.lognormal(8.5, 0.6, n), rng.lognormal(8.2, 0.6, n)),
+    })
+    assert estimar_parametros(df).desvio_log_renda == pytest.approx(0.6, abs=0.01)
+    # Tabela resumida (uma linha por grupo): mantém o parâmetro de base
+    resumida = pd.read_csv(os.path.join(DADOS, 'renda_ibge_2023.csv'))
+    assert estimar_parametros(resumida, PEQUENO) == PEQUENO
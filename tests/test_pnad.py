@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from saneamento.pnad import (COLUNAS_PNAD, agregar_escolaridade_idade, parcial_idades, parcial_pnad,
+                             resumo_escolaridade_idade)
+
+
+def _bloco(linhas):
+    return pd.DataFrame(linhas, columns=list(COLUNAS_PNAD)).astype({'UF': 'int8'})
+
+
+# UF, peso, idade, anos de estudo, renda, água, esgoto
+BLOCO = _bloco([
+    (53, 1.0, 30, 12, 3000, 1, 1),
+    (53, 2.0, 40, 10, 2000, 1, 2),
+    (53, 1.0, 30, 6, 1000, 2, 1),
+    (53, 1.0, 30, 4, 800, 1, 4),
+    (35, 1.0, 30, 20, 9000, 1, 1),
+])
+
+
+def test_grupos_e_medias_ponderadas():
+    parcial = parcial_pnad(BLOCO, 'DF')
+    np.testing.assert_allclose(parcial['renda'] / parcial['peso_renda'], [7000 / 3, 900])
+    np.testing.assert_allclose(parcial['estudo'] / parcial['peso_estudo'], [32 / 3, 5])
+
+
+def test_sem_resposta_fica_fora_dos_dois_grupos():
+    sem_resposta = _bloco([(53, 5.0, 30, 0, 0, np.nan, 1), (53, 5.0, 30, 0, 0, 1, np.nan)])
+    com_ausentes = pd.concat([BLOCO, sem_resposta], ignore_index=True)
+    for nome, valores in parcial_pnad(com_ausentes).items():
+        np.testing.assert_array_equal(valores, parcial_pnad(BLOCO)[nome], err_msg=nome)
+    for nome, valores in parcial_idades(com_ausentes, 'DF').items():
+        np.testing.assert_array_equal(valores, parcial_idades(BLOCO, 'DF')[nome], err_msg=nome)
+
+
+def test_leitura_em_blocos_igual_ao_arquivo_inteiro(tmp_path):
+    rng = np.random.default_rng(1)
+    n = 2_000
+    dados = pd.DataFrame({
+        'UF': rng.choice([35, 53], n), 'V1028': rng.uniform(50, 500, n), 'V2009': rng.integers(0, 90, n),
+        'VD3005': rng.integers(0, 16, n), 'VD4020': rng.uniform(0, 1e4, n),
+        'S01007': rng.choice([1, 2, np.nan], n), 'S01012A': rng.choice([1, 2, 4], n),
+    })
+    caminho = tmp_path / 'pnad.csv'
+    dados.to_csv(caminho, index=False)
+    inteiro = agregar_escolaridade_idade(caminho, tamanho_bloco=n)
+    pd.testing.assert_frame_equal(agregar_escolaridade_idade(caminho, tamanho_bloco=137), inteiro)
+    assert set(inteiro['saneamento']) == {'com_saneamento', 'sem_saneamento'}
+    assert (inteiro['ic_inferior'] <= inteiro['media']).all() and (inteiro['media'] <= inteiro['ic_superior']).all()
+
+
+def test_idades_sem_amostra_ficam_de_fora():
+    resumo = resumo_escolaridade_idade(parcial_idades(BLOCO))
+    assert set(zip(resumo['idade'], resumo['saneamento'])) == {
+        (30, 'com_saneamento'), (40, 'com_saneamento'), (30, 'sem_saneamento')}
+    com_30 = resumo[(resumo['idade'] == 30) & (resumo['saneamento'] == 'com_saneamento')].iloc[0]
+    assert com_30['media'] == pytest.approx(16)
+    assert com_30['n_efetivo'] == pytest.approx(2)
+
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from saneamento.preagregar import agregar_fontes, dividir_arquivo, montar_resumos
+
+
+def _arquivos(pasta, n=3_000, semente=0):
+    rng = np.random.default_rng(semente)
+    sih = pasta / 'RDDF23.csv'
+    pd.DataFrame({
+        'MES_CMPT': rng.integers(1, 13, n), 'DIAG_PRINC': rng.choice(['A09', 'B15', 'J18'], n),
+        'VAL_TOT': rng.uniform(100, 5000, n).round(2), 'MORTE': rng.integers(0, 2, n),
+    }).to_csv(sih, index=False)
+    pnad = pasta / 'pnad.csv'
+    pd.DataFrame({
+        'UF': rng.choice([35, 53], n), 'V1028': rng.uniform(50, 500, n).round(3), 'V2009': rng.integers(0, 90, n),
+        'VD3005': rng.integers(0, 16, n), 'VD4020': rng.uniform(0, 1e4, n).round(2),
+        'S01007': rng.choice([1, 2], n), 'S01012A': rng.choice([1, 2, 4], n),
+    }).to_csv(pnad, index=False)
+    enem = pasta / 'enem.csv'
+    notas = {coluna: rng.uniform(300, 800, n).round(1)
+             for coluna in ('NU_NOTA_CN', 'NU_NOTA_CH', 'NU_NOTA_LC', 'NU_NOTA_MT', 'NU_NOTA_REDACAO')}
+    pd.DataFrame({'SG_UF_PROVA': rng.choice(['DF', 'SP'], n), **notas, 'Q008': rng.choice(['A', 'B'], n)}).to_csv(
+        enem, index=False, sep=';', encoding='latin-1')
+    return {'sih': [sih, sih], 'pnad': [pnad], 'enem': [enem]}
+
+
+def test_trechos_cobrem_o_arquivo_em_linhas_inteiras(tmp_path):
+    caminho = _arquivos(tmp_path)['sih'][0]
+    conteudo = caminho.read_bytes()
+    cabecalho, trechos = dividir_arquivo(caminho, tamanho_trecho=4096)
+    assert len(trechos) > 1
+    assert trechos[0][0] == len(cabecalho) and trechos[-1][1] == len(conteudo)
+    for (_, fim), (inicio, _) in zip(trechos, trechos[1:]):
+        assert fim == inicio and conteudo[fim - 1:fim] == b'\n'
+
+
+def test_pool_igual_a_um_processo(tmp_path):
+    arquivos = _arquivos(tmp_path)
+    sequencial = agregar_fontes(arquivos, processos=1, tamanho_trecho=8192, uf='DF')
+    paralelo = agregar_fontes(arquivos, processos=2, tamanho_trecho=8192, uf='DF', contexto='spawn')
+    assert sequencial.keys() == paralelo.keys()
+    for fonte, somas in sequencial.items():
+        for nome, valores in somas.items():
+            np.testing.assert_array_equal(paralelo[fonte][nome], valores, err_msg=f'{fonte}.{nome}')
+
+    # O tamanho do trecho não muda as contagens (as somas em ponto flutuante só na ordem da soma)
+    inteiro = agregar_fontes(arquivos, processos=1, tamanho_trecho=1 << 30, uf='DF')
+    resumos, resumos_inteiro = montar_resumos(sequencial), montar_resumos(inteiro)
+    assert set(resumos) == {'saude', 'renda', 'escolaridade_idade', 'notas_enem', 'educacao'}
+    for fonte, resumo in resumos.items():
+        pd.testing.assert_frame_equal(resumo, resumos_inteiro[fonte], check_exact=False, rtol=1e-9)
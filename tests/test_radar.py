@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from saneamento.radar import METODOS, faixa_radial, normalizar
+
+# Indicadores × grupos
+VALORES = np.array([
+    [10.0, 5.0, 20.0],
+    [2.0, 4.0, 8.0],
+    [3.0, 3.0, 3.0],
+])
+
+
+def test_maximo():
+    np.testing.assert_allclose(normalizar(VALORES, 'maximo'), [[50, 25, 100], [25, 50, 100], [100, 100, 100]])
+
+
+def test_minmax():
+    np.testing.assert_allclose(normalizar(VALORES, 'minmax'),
+                               [[100 / 3, 0, 100], [0, 100 / 3, 100], [100, 100, 100]])
+
+
+def test_zscore():
+    resultado = normalizar(VALORES, 'zscore')
+    np.testing.assert_allclose(resultado[:2].mean(axis=1), 0, atol=1e-12)
+    np.testing.assert_allclose(resultado[:2].std(axis=1), 1)
+    np.testing.assert_array_equal(resultado[2], 0)
+
+
+def test_referencia():
+    np.testing.assert_allclose(normalizar(VALORES, 'referencia', referencia=1),
+                               [[200, 100, 400], [50, 100, 200], [100, 100, 100]])
+    with pytest.raises(ValueError, match='referência'):
+        normalizar(VALORES, 'referencia')
+
+
+def test_sentido_inverte_indicadores():
+    sentido = [1, -1, 1]
+    # Razão: recíproco (menor vira melhor)
+    np.testing.assert_allclose(normalizar(VALORES, 'maximo', sentido=sentido)[1], [100, 50, 25])
+    # Diferença: sinal trocado
+    np.testing.assert_allclose(normalizar(VALORES, 'minmax', sentido=sentido)[1], [100, 200 / 3, 0])
+    np.testing.assert_allclose(normalizar(VALORES, 'zscore', sentido=sentido)[1],
+                               -normalizar(VALORES, 'zscore')[1])
+    # A matriz de entrada não é alterada
+    assert VALORES[1].tolist() == [2.0, 4.0, 8.0]
+
+
+def test_ausentes_continuam_ausentes():
+    valores = VALORES.copy()
+    valores[0, 1] = np.nan
+    for metodo in METODOS:
+        resultado = normalizar(valores, metodo, referencia=0)
+        assert np.isnan(resultado[0, 1]) and not np.isnan(np.delete(resultado.ravel(), 1)).any()
+        # Os demais grupos do indicador são normalizados sem o ausente
+        np.testing.assert_allclose(resultado[0, [0, 2]], normalizar(VALORES[0, [0, 2]], metodo, referencia=0)[0])
+        np.testing.assert_array_equal(resultado[1:], normalizar(VALORES, metodo, referencia=0)[1:])
+
+
+def test_vetor_vira_uma_linha():
+    assert normalizar([1.0, 2.0, 4.0]).shape == (1, 3)
+
+
+def test_metodo_desconhecido():
+    with pytest.raises(ValueError, match='desconhecido'):
+        normalizar(VALORES, 'media')
+
+
+def test_faixa_radial():
+    assert faixa_radial(normalizar(VALORES, 'maximo'), 'maximo') == [0, 100]
+    assert faixa_radial(normalizar(VALORES, 'minmax'), 'minmax') == [0, 100]
+    assert faixa_radial(np.array([[-1.2, 0.3, 0.9]]), 'zscore') == [-2.0, 2.0]
+    assert faixa_radial(np.array([[0.2, 0.5]]), 'zscore') == [-1.0, 1.0]
+    assert faixa_radial(np.array([[50, 100, 400]]), 'referencia') == [0, 400.0]
+    assert faixa_radial(np.array([[50, 80]]), 'referencia') == [0, 100.0]
@@ -0,0 +1,112 @@
+import os
+
+import pandas as pd
+import pytest
+
+from saneamento.recarga import MonitorRecarga, assinatura
+from saneamento.snapshot import carregar_com_snapshot, preparar_snapshot
+
+
+@pytest.fixture
+def monitor():
+    # Intervalo longo: as varreduras são feitas pelo teste, não pela thread
+    monitor = MonitorRecarga(intervalo=3600)
+    yield monitor
+    monitor.parar()
+
+
+def _gravar(caminho, valores, mtime):
+    pd.DataFrame({'valor': valores}).to_csv(caminho, index=False)
+    os.utime(caminho, ns=(mtime, mtime))
+
+
+def _validar(df):
+    if (df['valor'] < 0).any():
+        raise ValueError('valor negativo')
+
+
+def _preparar(caminho):
+    return lambda: preparar_snapshot(caminho, validar=_validar)
+
+
+def test_registro_prepara_e_publica(tmp_path, monitor):
+    caminho = tmp_path / 'dados.csv'
+    _gravar(caminho, [1, 2], 10**18)
+    chamadas = []
+
+    def preparar():
+        chamadas.append(1)
+        return 'artefato'
+
+    assert monitor.versao('fonte', caminho, preparar) == (assinatura(caminho), 'artefato')
+    assert monitor.versao('fonte', caminho, preparar) == (assinatura(caminho), 'artefato')
+    assert len(chamadas) == 1
+    assert monitor.varrer() == []
+
+
+def test_publica_so_depois_de_estavel(tmp_path, monitor):
+    caminho = tmp_path / 'dados.csv'
+    _gravar(caminho, [1, 2], 10**18)
+    antiga = monitor.versao('fonte', caminho, _preparar(caminho))
+
+    _gravar(caminho, [3, 4, 5], 10**18 + 1)
+    # Primeira varredura só vê a mudança; a versão publicada não muda e o snapshot antigo continua lá
+    assert monitor.varrer() == []
+    assert monitor.versao('fonte', caminho, _preparar(caminho)) == antiga
+    assert pd.read_parquet(antiga[1])['valor'].tolist() == [1, 2]
+
+    assert monitor.varrer() == ['fonte']
+    nova = monitor.versao('fonte', caminho, _preparar(caminho))
+    assert nova[0] == assinatura(caminho) and nova[1] != antiga[1]
+    assert pd.read_parquet(nova[1])['valor'].tolist() == [3, 4, 5]
+    assert monitor.varrer() == []
+
+
+def test_versao_rejeitada_mantem_a_anterior(tmp_path, monitor):
+    caminho = tmp_path / 'dados.csv'
+    _gravar(caminho, [1, 2], 10**18)
+    antiga = monitor.versao('fonte', caminho, _preparar(caminho))
+
+    _gravar(caminho, [-1], 10**18 + 1)
+    monitor.varrer()
+    assert monitor.varrer() == []
+    assert monitor.versoes() == {'fonte': antiga}
+    # Uma carga fria da versão publicada lê o snapshot validado, não o arquivo rejeitado
+    assert pd.read_parquet(antiga[1])['valor'].tolist() == [1, 2]
+    # A versão rejeitada não é preparada de novo a cada varredura
+    assert monitor.varrer() == []
+
+    _gravar(caminho, [7], 10**18 + 2)
+    monitor.varrer()
+    assert monitor.varrer() == ['fonte']
+    assert pd.read_parquet(monitor.versoes()['fonte'][1])['valor'].tolist() == [7]
+
+
+def test_novo_arquivo_para_a_mesma_chave(tmp_path, monitor):
+    primeiro, segundo = tmp_path / 'resumo.csv', tmp_path / 'bruto.csv'
+    _gravar(primeiro, [1], 10**18)
+    _gravar(segundo, [2], 10**18)
+    assert pd.read_parquet(monitor.versao('fonte', primeiro, _preparar(primeiro))[1])['valor'].tolist() == [1]
+    # A chave passa a apontar para outro arquivo: registra e prepara de novo
+    assert pd.read_parquet(monitor.versao('fonte', segundo, _preparar(segundo))[1])['valor'].tolist() == [2]
+    assert monitor.versoes()['fonte'][0] == assinatura(segundo)
+
+
+def test_falha_no_registro_vai_para_quem_chamou(tmp_path, monitor):
+    caminho = tmp_path / 'dados.csv'
+    _gravar(caminho, [-1], 10**18)
+    with pytest.raises(ValueError, match='negativo'):
+        monitor.versao('fonte', caminho, _preparar(caminho))
+    assert monitor.versoes() == {}
+
+
+def test_snapshots_mantidos(tmp_path):
+    caminho = tmp_path / 'dados.csv'
+    snapshots = []
+    for i in range(4):
+        _gravar(caminho, [i], 10**18 + i)
+        snapshots.append(preparar_snapshot(caminho))
+        os.utime(snapshots[-1], ns=(10**18 + i, 10**18 + i))
+    # Só o atual e o anterior (que pode ainda ser o publicado) ficam em disco
+    assert [os.path.exists(snapshot) for snapshot in snapshots] == [False, False, True, True]
+    assert carregar_com_snapshot(caminho)['valor'].tolist() == [3]
@@ -0,0 +1,43 @@
+import numpy as np
+
+from saneamento.series import LIMITE_WEBGL, lttb, reduzir_serie, usar_webgl
+
+
+def test_extremidades_e_tamanho():
+    y = np.random.default_rng(0).normal(size=10_000).cumsum()
+    indices = lttb(y, 500)
+    assert len(indices) == 500
+    assert indices[0] == 0 and indices[-1] == len(y) - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_picos_sao_mantidos():
+    y = np.random.default_rng(1).normal(0, 0.1, 10_000)
+    y[1234], y[7777] = 50.0, -50.0
+    indices = lttb(y, 200)
+    assert 1234 in indices and 7777 in indices
+    assert y[indices].max() == y.max() and y[indices].min() == y.min()
+
+
+def test_eixo_x_irregular():
+    x = np.sort(np.random.default_rng(2).uniform(0, 100, 3_000))
+    y = np.sin(x)
+    y[1500] = 10.0
+    indices = lttb(y, 100, x=x)
+    assert indices[0] == 0 and indices[-1] == len(y) - 1 and 1500 in indices
+
+
+def test_series_curtas_ficam_inteiras():
+    np.testing.assert_array_equal(lttb(np.arange(50.0), 100), np.arange(50))
+    np.testing.assert_array_equal(lttb(np.arange(50.0), 2), np.arange(50))
+
+
+def test_reduzir_preserva_indices_marcados():
+    y = np.random.default_rng(3).normal(size=5_000)
+    indices = reduzir_serie(y, 100, preservar=[10, 2500, 4321])
+    assert {10, 2500, 4321} <= set(indices.tolist())
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_limite_webgl():
+    assert not usar_webgl(LIMITE_WEBGL) and usar_webgl(LIMITE_WEBGL + 1)
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from saneamento.sih import CID_HIDRICAS, MESES, agregar_sih, parcial_sih, resumo_sih
+
+
+def _rd(n, semente=0):
+    rng = np.random.default_rng(semente)
+    return pd.DataFrame({
+        'MES_CMPT': rng.integers(0, 14, n),
+        'DIAG_PRINC': rng.choice(['A09', 'A090', 'A270', 'B15', 'J18', 'I21', 'A10'], n),
+        'VAL_TOT': rng.uniform(100, 5000, n).round(2),
+        'MORTE': rng.integers(0, 2, n),
+        'N_AIH': np.arange(n),
+    })
+
+
+def test_blocos_igual_ao_arquivo_inteiro(tmp_path):
+    rd = _rd(2_000)
+    caminho = tmp_path / 'RDDF2301.csv'
+    rd.to_csv(caminho, index=False)
+    inteiro = agregar_sih(caminho, tamanho_bloco=len(rd))
+    for tamanho in (7, 333, 1_999):
+        pd.testing.assert_frame_equal(agregar_sih(caminho, tamanho_bloco=tamanho), inteiro)
+
+
+def test_resumo_confere_com_groupby():
+    rd = _rd(5_000, semente=1)
+    resumo = resumo_sih(parcial_sih(rd.astype({'DIAG_PRINC': 'category'})))
+    validos = rd[rd['DIAG_PRINC'].str[:3].isin(CID_HIDRICAS) & rd['MES_CMPT'].between(1, 12)]
+    esperado = validos.groupby('MES_CMPT').agg(internacoes=('N_AIH', 'size'), obitos=('MORTE', 'sum'),
+                                                custo_total=('VAL_TOT', 'sum')).reindex(range(1, 13), fill_value=0)
+    assert resumo['mes'].tolist() == MESES
+    np.testing.assert_array_equal(resumo['internacoes'], esperado['internacoes'])
+    np.testing.assert_array_equal(resumo['obitos'], esperado['obitos'])
+    np.testing.assert_allclose(resumo['custo_total'], esperado['custo_total'].round(2))
+
+
+def test_so_cids_de_veiculacao_hidrica():
+    rd = pd.DataFrame({'MES_CMPT': [1, 1, 2, 13], 'DIAG_PRINC': pd.Categorical(['A090', 'J189', 'B15', 'A09']),
+                       'VAL_TOT': [10.0, 20.0, 30.0, 40.0], 'MORTE': [0, 1, 1, 0]})
+    parcial = parcial_sih(rd)
+    assert parcial['internacoes'][:3].tolist() == [1, 1, 0] and parcial['internacoes'].sum() == 2
+    assert parcial['obitos'].sum() == 1
+    assert parcial['custo'].sum() == 40.0